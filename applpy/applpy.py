@@ -30,12 +30,15 @@ def Menu():
     print ""
 
     print 'RV Class Procedures'
-    print 'X.variate(n,x),X.verifyPDF()'
+    print 'X.variate(n,x),X.sample(n,{sort},{method}),X.verifyPDF()'
+    print 'X.sample_parallel(n,{processes}),X.quantile_table({tol})'
+    print 'X.alias_table(),X.stream({chunk},{n})'
     print ""
 
     print 'Functional Form Conversion'
     print 'CDF(X,{x}),CHF(X,{x}),HF(X,{x}),IDF(X,{x})'
-    print 'PDF(X,{x}),SF(X,{x}),BootstrapRV([data])'
+    print 'PDF(X,{x}),SF(X,{x}),BootstrapRV([data],{compact})'
+    print 'Compact(X,{exact}),Uncompact(X)'
     print 'Convert(X,{x})'
     print ""    
 
@@ -51,9 +54,17 @@ def Menu():
     print 'Convolution(X,Y),Maximum(X,Y),Minimum(X,Y)'
     print 'Mixture([p1,p2],[X,Y]),Product(X,Y)'
     print ""
+    print 'Bootstrap Procedures'
+    print 'BootstrapReplicates([data],{stat},{B},{seed},{processes})'
+    print 'BootstrapCI([data],{stat},{B},{level},{method})'
+    print ""
 
     print 'Utilities'
     print 'PlotDist(X,{[x1,x2]}),PlotDisplay([plotlist],{[x1,x2]})'
+    print 'CacheInfo(),ClearCache(),SetCacheSize(n)'
+    print 'OpenStore({path}),CloseStore(),ClearStore()'
+    print 'SpawnStreams(n,{seed}),UniformPoints(n,{dim},{kind},{scramble})'
+    print 'PairedComparison([X1,X2,...],n,{seed})'
     print ""
 
     print 'Continuous Distributions'
@@ -0,0 +1,222 @@
+######################################################################
+# ApplPy Software 2012 Matthew Robinson, Matthew Jackiewicz          #
+# Version 0.5, last updated 18 October 2026                          #
+######################################################################
+
+"""
+Compiled Evaluation Module
+
+Defines numeric evaluators for the functional forms of random
+    variables. Each segment of a piecewise function is compiled once
+    with lambdify, and the segment that applies to each point is found
+    with a binary search over the support, so that whole NumPy arrays
+    can be evaluated at once.
+
+"""
+
+from __future__ import division
+from sympy import *
+import math
+try:
+    import numpy as np
+except ImportError:
+    np=None
+    print 'WARNING: Compiled evaluation not currently enabled'
+    print 'Download numpy to enable compiled evaluation.'
+    print ''
+x=Symbol('x')
+
+def vectorize_math(proc):
+    # Not intended for use by end user
+    """
+    Procedure Name: vectorize_math
+    Purpose: Vectorize a function from the math module, returning nan
+                outside of its domain
+    Arguments:  1. proc: A function of one number
+    Output:     1. A function of a NumPy array
+    """
+    def evaluate(v):
+        try:
+            return proc(v)
+        except (ValueError,OverflowError):
+            return float('nan')
+    return np.vectorize(evaluate,otypes=[float])
+
+# Special functions that numpy lacks are evaluated element by element
+#   with the math module, which is much faster than mpmath
+if np!=None:
+    special_functions={'erf':vectorize_math(math.erf),
+                       'erfc':vectorize_math(math.erfc),
+                       'gamma':vectorize_math(math.gamma),
+                       'loggamma':vectorize_math(math.lgamma)}
+
+# The values taken below and above the support by each functional form
+fill_values={'pdf':(0.0,0.0),
+             'cdf':(0.0,1.0),
+             'sf':(1.0,0.0),
+             'hf':(0.0,0.0),
+             'chf':(0.0,float('inf')),
+             'idf':(float('nan'),float('nan'))}
+
+def compile_function(func,var):
+    # Not intended for use by end user
+    """
+    Procedure Name: compile_function
+    Purpose: Compile a SymPy expression into a function that accepts
+                and returns NumPy arrays
+    Arguments:  1. func: A SymPy expression in var
+                2. var: The variable of the expression
+    Output:     1. A vectorized function
+    """
+    func=sympify(func)
+    # Constant segments are broadcast to the shape of the input
+    if var not in func.free_symbols:
+        const=complex(func.evalf())
+        if const.imag==0:
+            const=const.real
+        return lambda v: np.zeros(np.shape(v))+const
+    # Use the numpy translation where it can handle the expression,
+    #   then the math module for erf, gamma, ..., and fall back to
+    #   element-by-element evaluation with mpmath for anything else
+    for modules in ['numpy',[special_functions,'numpy']]:
+        f=lambdify(var,func,modules)
+        try:
+            with np.errstate(all='ignore'):
+                f(np.linspace(0.25,0.75,3))
+            return f
+        except Exception:
+            pass
+    g=lambdify(var,func,'mpmath')
+    def evaluate(v):
+        try:
+            return float(g(v))
+        except Exception:
+            return float('nan')
+    return np.vectorize(evaluate,otypes=[float])
+
+class CompiledForm:
+    """
+    CompiledForm Class
+    Defines a numeric evaluator for one functional form of a random
+        variable
+    """
+
+    def __init__(self,funclist,support,ftype,var=x):
+        """
+        Compiles each segment of a functional form
+            funclist, support and ftype follow the conventions of the
+            RV class, and every parameter must have a numeric value
+        """
+        if np==None:
+            raise ImportError('Compiled evaluation requires numpy')
+        self.ftype=list(ftype)
+        self.support=np.array([float(s) for s in support])
+        self.below,self.above=fill_values[ftype[1]]
+        if ftype[0] in ['continuous','Discrete']:
+            self.segments=[compile_function(f,var) for f in funclist]
+        else:
+            # Numeric probabilities (such as the arrays held by compact
+            #   random variables) are converted in one step
+            try:
+                self.values=np.asarray(funclist,dtype=float)
+            except (TypeError,ValueError):
+                self.values=np.array([complex(sympify(f).evalf()).real
+                                      for f in funclist])
+
+    def __call__(self,values):
+        """
+        Evaluates the functional form at a value or array of values
+        """
+        vals=np.asarray(values,dtype=float)
+        shape=vals.shape
+        vals=vals.reshape(-1)
+        if self.ftype[0]=='continuous':
+            result=self.eval_continuous(vals)
+        elif self.ftype[0]=='Discrete':
+            result=self.eval_functional(vals)
+        else:
+            result=self.eval_discrete(vals)
+        if len(shape)==0:
+            return float(result[0])
+        return result.reshape(shape)
+
+    def eval_continuous(self,vals):
+        """
+        Evaluates a piecewise continuous form
+        """
+        supp=self.support
+        nseg=len(self.segments)
+        # A single segment needs no search for the segment of each point
+        if nseg==1:
+            with np.errstate(all='ignore'):
+                result=np.asarray(self.segments[0](vals),dtype=float)
+            result=np.where(vals<supp[0],self.below,
+                            np.where(vals>supp[-1],self.above,result))
+            result[np.isnan(vals)]=np.nan
+            return result
+        result=np.empty(vals.shape)
+        # Fill in the values outside of the support
+        result[vals<supp[0]]=self.below
+        result[vals>supp[-1]]=self.above
+        result[np.isnan(vals)]=np.nan
+        inside=(vals>=supp[0])&(vals<=supp[-1])
+        # Find the segment that contains each point; points on the
+        #   boundary between two segments use the segment to the right
+        idx=np.searchsorted(supp,vals,side='right')-1
+        idx=np.clip(idx,0,nseg-1)
+        with np.errstate(all='ignore'):
+            for i in range(nseg):
+                mask=inside&(idx==i)
+                if mask.any():
+                    result[mask]=self.segments[i](vals[mask])
+        return result
+
+    def eval_functional(self,vals):
+        """
+        Evaluates a discrete form given by a single formula over the
+            integers in its support
+        """
+        supp=self.support
+        result=np.zeros(vals.shape)
+        on_lattice=((vals>=supp[0])&(vals<=supp[-1])&
+                    (vals==np.floor(vals)))
+        if on_lattice.any():
+            with np.errstate(all='ignore'):
+                result[on_lattice]=self.segments[0](vals[on_lattice])
+        result[np.isnan(vals)]=np.nan
+        return result
+
+    def eval_discrete(self,vals):
+        """
+        Evaluates a discrete form given by a list of support points
+        """
+        supp=self.support
+        values=self.values
+        n=len(supp)
+        ftype=self.ftype[1]
+        # The idf is a step function of the cdf values held in its
+        #   support
+        if ftype=='idf':
+            idx=np.searchsorted(supp,vals,side='left')
+            result=values[np.clip(idx,0,n-1)]
+            result[(vals<0)|(vals>1)|np.isnan(vals)]=np.nan
+            return result
+        # The cdf is right-continuous, and holds its value until the
+        #   next support point
+        if ftype=='cdf':
+            idx=np.searchsorted(supp,vals,side='right')-1
+            result=values[np.clip(idx,0,n-1)]
+            result[vals<supp[0]]=0.0
+        # The sf and chf (P(X>=x) form) hold the value of the next
+        #   support point
+        elif ftype in ['sf','chf']:
+            idx=np.searchsorted(supp,vals,side='left')
+            result=values[np.clip(idx,0,n-1)]
+            result[vals>supp[-1]]=self.above
+        # The pdf and hf are zero away from the support points
+        else:
+            idx=np.clip(np.searchsorted(supp,vals,side='left'),0,n-1)
+            result=np.where(supp[idx]==vals,values[idx],0.0)
+        result=np.asarray(result,dtype=float)
+        result[np.isnan(vals)]=np.nan
+        return result
@@ -7,18 +7,69 @@
 Distribution Subclass Module
 
 Defines commonly used distributions as subclasses of the
-    RV class
+    RV class. Each subclass keeps its parameters in a slot, which
+    cannot be reassigned once the random variable is created.
 
 """
 
+from __future__ import division
 from rv import *
+from sampling import normal_cdf,normal_idf
+from sampling import incomplete_beta,incomplete_gamma
+try:
+    import numpy as np
+except ImportError:
+    np=None
 
 def param_check(param):
+    # Not intended for use by end user
+    """
+    Procedure Name: param_check
+    Purpose: Check that every parameter of a distribution is numeric
+    Arguments:  1. param: A list of parameters
+    Output:     1. True if every parameter is numeric
+                2. False otherwise
+    """
     for i in range(len(param)):
-        if type(param[i])!=int and type(param[i])!=float:
+        if len(sympify(param[i]).free_symbols)!=0:
             return False
-        else:
-            return True
+    return True
+
+def native_params(RVar):
+    # Not intended for use by end user
+    """
+    Procedure Name: native_params
+    Purpose: Return the parameters of a distribution as floating point
+                numbers for its NumPy sampler
+    Arguments:  1. RVar: A random variable from this module
+    Output:     1. A list of floating point numbers
+    """
+    if np==None:
+        raise ImportError('Vectorized sampling requires numpy')
+    if param_check(RVar.parameter)==False:
+        raise RVError('Not all parameters specified')
+    return [float(param) for param in RVar.parameter]
+
+def native_inverse(RVar,u):
+    # Not intended for use by end user
+    """
+    Procedure Name: native_inverse
+    Purpose: Invert the NumPy cdf of a distribution whose idf has no
+                closed form
+    Arguments:  1. RVar: A random variable from this module with a
+                    native_cdf method
+                2. u: An array of values in [0,1]
+    Output:     1. An array of variates
+    """
+    native_params(RVar)
+    # The tabulated cdf that starts Newton's method is computed once
+    cache=form_cache(RVar)
+    if ('sampler','native grid') not in cache:
+        cache[('sampler','native grid')]=cdf_grid(
+            RVar.native_cdf,float(RVar.support[0]),float(RVar.support[-1]))
+    u=np.asarray(u,dtype=float)
+    return invert_cdf(RVar.native_cdf,compiled_form(RVar,'pdf'),
+                      cache[('sampler','native grid')],u).reshape(u.shape)
 
 """
 Continuous Distributions
@@ -26,400 +77,570 @@ Continuous Distributions
 """
 
 class BetaRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,alpha=Symbol('alpha',positive=True),
                  beta=Symbol('beta'),positive=True):
-        X_dummy=RV((gamma(alpha+beta)*(x**(alpha-1))*(1-x)**(beta-1))/
-               (gamma(alpha)*gamma(beta)),[0,1])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,(gamma(alpha+beta)*(x**(alpha-1))*
+                          (1-x)**(beta-1))/(gamma(alpha)*gamma(beta)),[0,1])
+        self.parameter=(alpha,beta)
+
+    def native_sample(self,rng,n):
+        """
+        Generates n beta variates with a NumPy generator
+        """
+        alpha,beta=native_params(self)
+        return rng.beta(alpha,beta,n)
+
+    def native_cdf(self,values):
+        """
+        Evaluates the cdf of the beta distribution with NumPy
+        """
+        alpha,beta=native_params(self)
+        v=np.clip(np.asarray(values,dtype=float),0,1)
+        return incomplete_beta(alpha,beta,v,1-v)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the beta distribution by inverting its
+            NumPy cdf
+        """
+        return native_inverse(self,u)
 
 class CauchyRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,a=Symbol('a'),
                  alpha=Symbol('alpha'),positive=True):
-        X_dummy=RV((1)/(alpha*pi*(1+((x-a)**2/alpha**2))),[-oo,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-        self.parameter=[a,alpha]
-
-    def variate(self,n=1,s='sim'):
-        # If no parameter is specified, return an error
-        if param_check(self.parameter)==False:
-            raise RVError('Not all parameters specified')
-
-        # Generate exponential variates
-        idf_func=self.parameter[0]-cot(pi*t)*self.parameter[1]
-        varlist=[]
-        for i in range(n):
-            if s=='sim':
-                val=random()
-            else:
-                val=s
-            var=idf_func.subs(t,val).evalf()
-            varlist.append(var)
-        varlist.sort()
-        return varlist
+        RV.__init__(self,(1)/(alpha*pi*(1+((x-a)**2/alpha**2))),[-oo,oo])
+        self.parameter=(a,alpha)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the Cauchy distribution with NumPy
+        """
+        a,alpha=native_params(self)
+        return a+alpha*np.tan(np.pi*(np.asarray(u)-0.5))
 
 class ChiRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,N=Symbol('N',positive=True)):
-        X_dummy=RV(((x**(N-1))*exp(-x**2/2))/
-                   (2**((N/2)-1)*gamma(N/2)),[0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,((x**(N-1))*exp(-x**2/2))/
+                    (2**(N*Rational(1,2)-1)*gamma(N*Rational(1,2))),[0,oo])
+        self.parameter=(N,)
+
+    def native_sample(self,rng,n):
+        """
+        Generates n chi variates with a NumPy generator
+        """
+        N=native_params(self)[0]
+        return np.sqrt(rng.chisquare(N,n))
+
+    def native_cdf(self,values):
+        """
+        Evaluates the cdf of the chi distribution with NumPy
+        """
+        N=native_params(self)[0]
+        v=np.maximum(np.asarray(values,dtype=float),0)
+        return incomplete_gamma(N/2,v*v/2)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the chi distribution by inverting its
+            NumPy cdf
+        """
+        return native_inverse(self,u)
 
 class ChiSquareRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,N=Symbol('N',positive=True)):
-        X_dummy=RV((x**((N/2)-1)*exp(-x/2))/
-                   (2**(N/2)*gamma(N/2)),[0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,(x**(N*Rational(1,2)-1)*exp(-x/2))/
+                    (2**(N*Rational(1,2))*gamma(N*Rational(1,2))),[0,oo])
+        self.parameter=(N,)
+
+    def native_sample(self,rng,n):
+        """
+        Generates n chi-square variates with a NumPy generator
+        """
+        N=native_params(self)[0]
+        return rng.chisquare(N,n)
+
+    def native_cdf(self,values):
+        """
+        Evaluates the cdf of the chi-square distribution with NumPy
+        """
+        N=native_params(self)[0]
+        v=np.maximum(np.asarray(values,dtype=float),0)
+        return incomplete_gamma(N/2,v/2)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the chi-square distribution by inverting its
+            NumPy cdf
+        """
+        return native_inverse(self,u)
 
 class ErlangRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,theta=Symbol('theta',positive=True),
                  N=Symbol('N',positive=True)):
-        X_dummy=RV((theta*(theta*x)**(N-1)*exp(-theta*x))/
-                   (factorial(N-1)),[0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,(theta*(theta*x)**(N-1)*exp(-theta*x))/
+                    (factorial(N-1)),[0,oo])
+        self.parameter=(theta,N)
+
+    def native_sample(self,rng,n):
+        """
+        Generates n Erlang variates with a NumPy generator
+        """
+        theta,N=native_params(self)
+        return rng.gamma(N,1/theta,n)
+
+    def native_cdf(self,values):
+        """
+        Evaluates the cdf of the Erlang distribution with NumPy
+        """
+        theta,N=native_params(self)
+        v=np.maximum(np.asarray(values,dtype=float),0)
+        return incomplete_gamma(N,theta*v)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the Erlang distribution by inverting its
+            NumPy cdf
+        """
+        return native_inverse(self,u)
 
 class ExponentialRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,theta=Symbol('theta',positive=True)):
-        X_dummy=RV([theta*exp(-theta*x)],[0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-        self.parameter=[theta]
-
-    def variate(self,n=1,s='sim'):
-        # If no parameter is specified, return an error
-        if param_check(self.parameter)==False:
-            raise RVError('Not all parameters specified')
-
-        # Generate exponential variates
-        idf_func=(-ln(1-t))/(self.parameter[0])
-        varlist=[]
-        for i in range(n):
-            if s=='sim':
-                val=random()
-            else:
-                val=s
-            var=idf_func.subs(t,val)
-            varlist.append(var)
-        varlist.sort()
-        return varlist
+        RV.__init__(self,[theta*exp(-theta*x)],[0,oo])
+        self.parameter=(theta,)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the exponential distribution with NumPy
+        """
+        theta=native_params(self)[0]
+        return -np.log1p(-np.asarray(u))/theta
 
 class ExponentialPowerRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,theta=Symbol('theta',positive=True),
                  kappa=Symbol('kappa',positive=True)):
-        X_dummy=RV(exp(1-exp(theta*x**(kappa)))*exp(theta*x**(kappa))*
-                   theta*kappa*x**(kappa-1),[0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-        self.parameter=[theta,kappa]
-
-    def variate(self,n=1,s='sim'):
-        # If no parameter is specified, return an error
-        if param_check(self.parameter)==False:
-            raise RVError('Not all parameters specified')
-
-        # Generate exponential power variates
-        idf_func=exp((-ln(self.parameter[0])+ln(ln(1-ln(1-s))))/
-                     self.parameter[1])
-        varlist=[]
-        for i in range(n):
-            if s=='sim':
-                val=random()
-            else:
-                val=s
-            var=idf_func.subs(t,val)
-            varlist.append(var)
-            varlist.sort()
-        return varlist
+        RV.__init__(self,exp(1-exp(theta*x**(kappa)))*exp(theta*x**(kappa))*
+                    theta*kappa*x**(kappa-1),[0,oo])
+        self.parameter=(theta,kappa)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the exponential power distribution with NumPy
+        """
+        theta,kappa=native_params(self)
+        return (np.log1p(-np.log1p(-np.asarray(u)))/theta)**(1/kappa)
 
 class ExtremeValueRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,alpha=Symbol('alpha'),beta=Symbol('beta')):
-        X_dummy=RV((beta*exp((x*beta)-((exp(x*beta))/alpha)))/
-                   alpha,[-oo,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-        self.parameter=[alpha,beta]
-
-    def variate(self,n=1,s='sim'):
-        if param_check(self.parameter)==False:
-            raise RVError('Not all parameters specified')
-
-        idf_func=(ln(self.parameter[0])+ln(ln(-1/(t-1))))/self.parameter[1]
-        varlist=[]
-        for i in range(n):
-            if s=='sim':
-                val=random()
-            else:
-                val=s
-            var=idf_func.subs(t,val)
-            varlist.append(var)
-        return varlist
+        RV.__init__(self,(beta*exp((x*beta)-((exp(x*beta))/alpha)))/
+                    alpha,[-oo,oo])
+        self.parameter=(alpha,beta)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the extreme value distribution with NumPy
+        """
+        alpha,beta=native_params(self)
+        return np.log(-alpha*np.log1p(-np.asarray(u)))/beta
 
 class GammaRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,theta=Symbol('theta'),kappa=Symbol('kappa')):
-        X_dummy=RV((theta*(theta*x)**(kappa-1)*exp(-theta*x))/(gamma(kappa)),
-                   [0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-        self.parameter=[theta,kappa]
+        RV.__init__(self,(theta*(theta*x)**(kappa-1)*exp(-theta*x))/
+                    (gamma(kappa)),[0,oo])
+        self.parameter=(theta,kappa)
+
+    def native_sample(self,rng,n):
+        """
+        Generates n gamma variates with a NumPy generator
+        """
+        theta,kappa=native_params(self)
+        return rng.gamma(kappa,1/theta,n)
+
+    def native_cdf(self,values):
+        """
+        Evaluates the cdf of the gamma distribution with NumPy
+        """
+        theta,kappa=native_params(self)
+        v=np.maximum(np.asarray(values,dtype=float),0)
+        return incomplete_gamma(kappa,theta*v)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the gamma distribution by inverting its
+            NumPy cdf
+        """
+        return native_inverse(self,u)
 
 class GompertzRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,theta=Symbol('theta',positive=True),
                  kappa=Symbol('kappa')):
-        X_dummy=RV([theta*kappa**(x)*exp(-(theta*(kappa**(x)-1))/ln(kappa))],
-                   [0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-        self.parameter=[theta,kappa]
-
-    def variate(self,n=1,s='sim'):
-        if param_check(self.parameter)==False:
-            raise RVError('Not all parameters specified')
-
-        idf_func=-((ln(self.parameter[0])-
-                   ln(self.parameter[0]-ln(1-t)*ln(self.parameter[1])))
-                   /ln(self.parameter[1]))
-        varlist=[]
-        for i in range(n):
-            if s=='sim':
-                val=random()
-            else:
-                val=s
-            var=idf_func.subs(t,val)
-            varlist.append(var)
-        return varlist
+        RV.__init__(self,[theta*kappa**(x)*
+                          exp(-(theta*(kappa**(x)-1))/ln(kappa))],[0,oo])
+        self.parameter=(theta,kappa)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the Gompertz distribution with NumPy
+        """
+        theta,kappa=native_params(self)
+        return (np.log1p(-np.log1p(-np.asarray(u))*np.log(kappa)/theta)/
+                np.log(kappa))
 
 class InverseGaussianRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,theta=Symbol('theta',positive=True),
                  mu=Symbol('mu',positive=True)):
-        X_dummy=RV([(1/2)*sqrt(2)*sqrt(theta/(pi*x**3))*
-                    exp(-(1/2)*(theta*(x-mu)**2)/(mu**(2)*x))],
-                   [0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-
+        RV.__init__(self,[Rational(1,2)*sqrt(2)*sqrt(theta/(pi*x**3))*
+                     exp(-Rational(1,2)*(theta*(x-mu)**2)/(mu**(2)*x))],
+                    [0,oo])
+        self.parameter=(theta,mu)
+
+    def native_sample(self,rng,n):
+        """
+        Generates n inverse Gaussian variates with a NumPy generator
+        """
+        theta,mu=native_params(self)
+        return rng.wald(mu,theta,n)
+
+    def native_cdf(self,values):
+        """
+        Evaluates the cdf of the inverse Gaussian distribution with NumPy
+        """
+        theta,mu=native_params(self)
+        v=np.asarray(values,dtype=float)
+        with np.errstate(all='ignore'):
+            r=np.sqrt(theta/v)
+            # The second term is found through its logarithm, since
+            #   exp(2*theta/mu) overflows where the normal cdf underflows
+            F=(normal_cdf(r*(v/mu-1))+
+               np.exp(2*theta/mu+np.log(normal_cdf(-r*(v/mu+1)))))
+        return np.where(v>0,np.where(np.isinf(v),1.0,F),0.0)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the inverse Gaussian distribution by
+            inverting its NumPy cdf
+        """
+        return native_inverse(self,u)
 
 class InverseGammaRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,alpha=Symbol('alpha',positive=True),
                  beta=Symbol('beta',positive=True)):
-        X_dummy=RV([(x**(1-alpha)*exp(-1/(x*beta)))/
-                    (gamma(alpha)*beta**(alpha))],
-                   [0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,[(x**(-alpha-1)*exp(-1/(x*beta)))/
+                     (gamma(alpha)*beta**(alpha))],
+                    [0,oo])
+        self.parameter=(alpha,beta)
+
+    def native_sample(self,rng,n):
+        """
+        Generates n inverse gamma variates with a NumPy generator
+        """
+        alpha,beta=native_params(self)
+        return 1/rng.gamma(alpha,beta,n)
+
+    def native_cdf(self,values):
+        """
+        Evaluates the cdf of the inverse gamma distribution with NumPy
+        """
+        alpha,beta=native_params(self)
+        v=np.asarray(values,dtype=float)
+        # P(X<=v)=P(Y>=1/v) for the gamma variate Y=1/X
+        with np.errstate(all='ignore'):
+            F=incomplete_gamma(alpha,1/(beta*v),upper=True)
+        return np.where(v>0,F,0.0)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the inverse gamma distribution by inverting its
+            NumPy cdf
+        """
+        return native_inverse(self,u)
 
 class LogGammaRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,alpha=Symbol('alpha',positive=True),
                  beta=Symbol('beta',positive=True)):
-        X_dummy=RV([(exp(x*beta)*exp(-exp(x)/alpha))/
-                    (alpha**(beta)*gamma(beta))],[-oo,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,[(exp(x*beta)*exp(-exp(x)/alpha))/
+                     (alpha**(beta)*gamma(beta))],[-oo,oo])
+        self.parameter=(alpha,beta)
+
+    def native_sample(self,rng,n):
+        """
+        Generates n log gamma variates with a NumPy generator
+        """
+        alpha,beta=native_params(self)
+        return np.log(rng.gamma(beta,alpha,n))
+
+    def native_cdf(self,values):
+        """
+        Evaluates the cdf of the log gamma distribution with NumPy
+        """
+        alpha,beta=native_params(self)
+        v=np.asarray(values,dtype=float)
+        return incomplete_gamma(beta,np.exp(v)/alpha)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the log gamma distribution by inverting its
+            NumPy cdf
+        """
+        return native_inverse(self,u)
 
 class LogisticRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,kappa=Symbol('kappa',positive=True),
                  theta=Symbol('theta',positive=True)):
-        X_dummy=RV([(theta**(kappa)*kappa*exp(kappa*x))/
-                    (1+(theta*exp(x))**kappa)**2],[-oo,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-        self.parameter=[kappa,theta]
-
-    def variate(self,n=1,s='sim'):
-        if param_check(self.parameter)==False:
-            raise RVError('Not all parameters specified')
-
-        idf_func=-((ln(-t/(t-1))+self.parameter[0]*ln(self.parameter[1]))/
-                   self.parameter[1])
-        varlist=[]
-        for i in range(n):
-            if s=='sim':
-                val=random()
-            else:
-                val=s
-            var=idf_func.subs(t,val)
-            varlist.append(var)
-        return varlist
+        RV.__init__(self,[(theta**(kappa)*kappa*exp(kappa*x))/
+                     (1+(theta*exp(x))**kappa)**2],[-oo,oo])
+        self.parameter=(kappa,theta)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the logistic distribution with NumPy
+        """
+        kappa,theta=native_params(self)
+        u=np.asarray(u)
+        return (np.log(u)-np.log1p(-u))/kappa-np.log(theta)
 
 class LogLogisticRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,theta=Symbol('theta',positive=True),
                  kappa=Symbol('kappa',positive=True)):
-        X_dummy=RV([(theta*kappa*(theta*x)**(kappa-1))/
-                    (1+(theta*x)**(kappa))**2],[0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-        self.parameter=[theta,kappa]
-
-    def variate(self,n=1,s='sim'):
-        if param_check(self.parameter)==False:
-            raise RVError('Not all parameters specified')
-
-        idf_func=exp((ln(-t/(t-1))-self.parameter[1]*ln(self.parameter[0]))/
-                     self.parameter[1])
-        varlist=[]
-        for i in range(n):
-            if s=='sim':
-                val=random()
-            else:
-                val=s
-            var=idf_func.subs(t,val)
-            varlist.append(var)
-        return varlist
-    
+        RV.__init__(self,[(theta*kappa*(theta*x)**(kappa-1))/
+                     (1+(theta*x)**(kappa))**2],[0,oo])
+        self.parameter=(theta,kappa)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the log logistic distribution with NumPy
+        """
+        theta,kappa=native_params(self)
+        u=np.asarray(u)
+        return (u/(1-u))**(1/kappa)/theta
+
 class LogNormalRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,mu=Symbol('mu'),
                  sigma=Symbol('sigma',positive=True)):
-        X_dummy=([(1/2)*(sqrt(2)*exp((-1/2)*((ln(x)-mu)**2)/(sigma**2)))/
-                  (sqrt(pi)*x*sigma)],[0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,[Rational(1,2)*(sqrt(2)*
+                           exp(-Rational(1,2)*((ln(x)-mu)**2)/(sigma**2)))/
+                          (sqrt(pi)*x*sigma)],[0,oo])
+        self.parameter=(mu,sigma)
+
+    def native_sample(self,rng,n):
+        """
+        Generates n log normal variates with a NumPy generator
+        """
+        mu,sigma=native_params(self)
+        return rng.lognormal(mu,sigma,n)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the log normal distribution with NumPy
+        """
+        mu,sigma=native_params(self)
+        return np.exp(mu+sigma*normal_idf(u))
 
 class LomaxRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,kappa=Symbol('kappa',positive=True),
                  theta=Symbol('theta',positive=True)):
-        X_dummy=([theta*kappa*(1+theta*x)**(-kappa-1)],[0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-        self.parameters=[kappa,theta]
-
-    def variate(self,n=1,s='sim'):
-        if param_check(self.parameter)==False:
-            raise RVError('Not all parameters specified')
-
-        idf_func=((1-t)**(1/self.parameter[0])-1)/self.parameter[1]
-        varlist=[]
-        for i in range(n):
-            if s=='sim':
-                val=random()
-            else:
-                val=s
-            var=idf_func.subs(t,val)
-            varlist.append(var)
-        return varlist
+        RV.__init__(self,[theta*kappa*(1+theta*x)**(-kappa-1)],[0,oo])
+        self.parameter=(kappa,theta)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the Lomax distribution with NumPy
+        """
+        kappa,theta=native_params(self)
+        return np.expm1(-np.log1p(-np.asarray(u))/kappa)/theta
 
 class MuthRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,kappa=Symbol('kappa',positive=True)):
-        X_dummy=RV([(exp(kappa*x)-kappa)*exp((-exp(kappa*x)/kappa)+
-                                             kappa*x+(1/kappa))]
-                   [0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,[(exp(kappa*x)-kappa)*exp((-exp(kappa*x)/kappa)+
+                                              kappa*x+(1/sympify(kappa)))],
+                    [0,oo])
+        self.parameter=(kappa,)
+
+    def native_cdf(self,values):
+        """
+        Evaluates the cdf of the Muth distribution with NumPy
+        """
+        kappa=native_params(self)[0]
+        v=np.maximum(np.asarray(values,dtype=float),0)
+        with np.errstate(over='ignore'):
+            return -np.expm1(kappa*v-np.expm1(kappa*v)/kappa)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the Muth distribution by inverting its
+            NumPy cdf, since the idf involves the Lambert W function
+        """
+        return native_inverse(self,u)
 
 class NormalRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,mu=Symbol('mu'),
                  sigma=Symbol('sigma',positive=True)):
-        X_dummy=RV((exp((-(x-mu)**2)/(2*sigma**2))*sqrt(2))/(2*sigma*sqrt(pi))
-                   ,[-oo,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-        self.parameter=[mu,sigma]
+        RV.__init__(self,(exp((-(x-mu)**2)/(2*sigma**2))*sqrt(2))/
+                    (2*sigma*sqrt(pi)),[-oo,oo])
+        self.parameter=(mu,sigma)
+
+    def native_sample(self,rng,n):
+        """
+        Generates n normal variates with a NumPy generator
+        """
+        mu,sigma=native_params(self)
+        return rng.normal(mu,sigma,n)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the normal distribution with NumPy
+        """
+        mu,sigma=native_params(self)
+        return mu+sigma*normal_idf(u)
 
 class ParetoRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,theta=Symbol('theta',positive=True),
                  kappa=Symbol('kappa',positive=True)):
-        X_dummy=RV([(kappa*theta**(kappa))/(x**(kappa+1))],[theta,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,[(kappa*theta**(kappa))/(x**(kappa+1))],[theta,oo])
+        self.parameter=(theta,kappa)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the Pareto distribution with NumPy
+        """
+        theta,kappa=native_params(self)
+        return theta*np.exp(-np.log1p(-np.asarray(u))/kappa)
 
 class Rayleigh(RV):
+    __slots__=('parameter',)
+
     def __init__(self,theta=Symbol('theta',positive=True)):
-        X_dummy=RV([2*theta**(2)*x*exp(-theta**(2)*x**2)],[0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,[2*theta**(2)*x*exp(-theta**(2)*x**2)],[0,oo])
+        self.parameter=(theta,)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the Rayleigh distribution with NumPy
+        """
+        theta=native_params(self)[0]
+        return np.sqrt(-np.log1p(-np.asarray(u)))/theta
 
 class TriangularRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,a=Symbol('a'),b=Symbol('b'),c=Symbol('c')):
-        X_dummy=RV([(2*(x-a))/((c-a)*(b-a)),(2*(c-x))/((c-a)*(c-b))],[a,b,c])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-        self.parameter=[a,b,c]
+        RV.__init__(self,[(2*(x-a))/((c-a)*(b-a)),
+                          (2*(c-x))/((c-a)*(c-b))],[a,b,c])
+        self.parameter=(a,b,c)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the triangular distribution with NumPy
+        """
+        a,b,c=native_params(self)
+        u=np.asarray(u)
+        # b is the mode, where the cdf takes the value (b-a)/(c-a)
+        return np.where(u<(b-a)/(c-a),a+np.sqrt(u*(c-a)*(b-a)),
+                        c-np.sqrt((1-u)*(c-a)*(c-b)))
 
 class TRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,N=Symbol('N'),positive=True):
-        X_dummy=RV([(gamma(N/2+1/2)*(1+((x**2)/N))**(-(N/2)-1/2))/
-                    (sqrt(N*pi)*gamma(N/2))],[-oo,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        half=N*Rational(1,2)
+        RV.__init__(self,[(gamma(half+Rational(1,2))*
+                           (1+((x**2)/N))**(-half-Rational(1,2)))/
+                          (sqrt(N*pi)*gamma(half))],[-oo,oo])
+        self.parameter=(N,)
+
+    def native_sample(self,rng,n):
+        """
+        Generates n t variates with a NumPy generator
+        """
+        N=native_params(self)[0]
+        return rng.standard_t(N,n)
+
+    def native_cdf(self,values):
+        """
+        Evaluates the cdf of the t distribution with NumPy
+        """
+        N=native_params(self)[0]
+        v=np.asarray(values,dtype=float)
+        # P(T<=-|v|) is half of the incomplete beta function at
+        #   N/(N+v**2), whose complement is passed without cancellation
+        with np.errstate(all='ignore'):
+            tail=incomplete_beta(N/2,0.5,N/(N+v*v),1/(1+N/(v*v)))/2
+        return np.where(v<0,tail,1-tail)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the t distribution by inverting its NumPy
+            cdf
+        """
+        return native_inverse(self,u)
 
 class UniformRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,a=Symbol('a'),b=Symbol('b')):
-        X_dummy=RV((b-a)**(-1),[a,b])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-        self.parameter=[a,b]
-
-    def variate(self,n=1,sim='sim'):
-        # If no parameter is specified, return an error
-        if param_check(self.parameter)==False:
-            raise RVError('Not all parameters specified')
-
-        # Generate uniform variates
-        idf_func=-t*self.parameter[0]+t*self.parameter[1]+self.parameter[0]
-        varlist=[]
-        for i in range(n):
-            if s=='sim':
-                val=random()
-            else:
-                val=s
-            var=idf_func.subs(t,val)
-            varlist.append(var)
-        varlist.sort()
-        return varlist
+        RV.__init__(self,1/sympify(b-a),[a,b])
+        self.parameter=(a,b)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the uniform distribution with NumPy
+        """
+        a,b=native_params(self)
+        return a+(b-a)*np.asarray(u)
 
 class WeibullRV(RV):   
+    __slots__=('parameter',)
+
     def __init__(self,theta=Symbol('theta'),kappa=Symbol('kappa')):
-        X_dummy=RV(kappa*theta**(kappa)*x**(kappa-1)*exp(-(theta*x)**kappa),
-                   [0,oo])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
-        self.parameter=[theta,kappa]
-
-
-    def variate(self,n=1,s='sim'):
-        # If no parameter is specified, return an error
-        if param_check(self.parameter)==False:
-            raise RVError('Not all parameters specified')
-
-        # Generate weibull variates
-        idf_func=exp(-(-ln(-ln(1-t))+self.parameter[1]*ln(self.parameter[0]))/
-                     self.parameter[1])
-        varlist=[]
-        for i in range(n):
-            if s=='sim':
-                val=random()
-            else:
-                val=s
-            var=idf_func.subs(t,val)
-            varlist.append(var)
-        varlist.sort()
-        return varlist
+        RV.__init__(self,kappa*theta**(kappa)*x**(kappa-1)*
+                    exp(-(theta*x)**kappa),[0,oo])
+        self.parameter=(theta,kappa)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the Weibull distribution with NumPy
+        """
+        theta,kappa=native_params(self)
+        return (-np.log1p(-np.asarray(u)))**(1/kappa)/theta
 
 """
 Discrete Distributions
@@ -427,34 +648,65 @@ Discrete Distributions
 """
 
 class BenfordRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self):
-        X_dummy=RV([(ln((1/x)+1))/(ln(10))],[1,9],['Discrete','pdf'])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,[(ln((1/x)+1))/(ln(10))],[1,9],['Discrete','pdf'])
+        self.parameter=()
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the Benford distribution with NumPy
+        """
+        native_params(self)
+        # P(floor(10**U)=d)=log10(1+1/d) for d=1,...,9
+        return np.clip(np.floor(10**np.asarray(u,dtype=float)),1,9)
 
 class BinomialRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,N=Symbol('N',positive=True),
                  p=Symbol('p',positive=True)):
-        X_dummy=RV([(factorial(N)*p**(x)*(1-p)**(N-x))/
-                    (factorial(N-x)*factorial(x))],[0,N],
-                   ['Discrete','pdf'])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,[(factorial(N)*p**(x)*(1-p)**(N-x))/
+                     (factorial(N-x)*factorial(x))],[0,N],
+                    ['Discrete','pdf'])
+        self.parameter=(N,p)
+
+    def native_sample(self,rng,n):
+        """
+        Generates n binomial variates with a NumPy generator
+        """
+        N,p=native_params(self)
+        return rng.binomial(int(N),p,n).astype(float)
 
 class GeometricRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,p=Symbol('p',positive=True)):
-        X_dummy=RV([p*(1-p)**(x-1)],[1,oo],['Discrete','pdf'])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,[p*(1-p)**(x-1)],[1,oo],['Discrete','pdf'])
+        self.parameter=(p,)
+
+    def native_idf(self,u):
+        """
+        Evaluates the idf of the geometric distribution with NumPy
+        """
+        p=native_params(self)[0]
+        # P(X>k)=(1-p)**k for k=1,2,...
+        return np.maximum(np.ceil(np.log1p(-np.asarray(u))/
+                                  np.log1p(-p)),1)
 
 class PoissonRV(RV):
+    __slots__=('parameter',)
+
     def __init__(self,theta=Symbol('theta',positive=True)):
-        X_dummy=RV([(theta**(x)*exp(-theta))/factorial(x)],
-                   [0,oo],['Discrete','pdf'])
-        self.func=X_dummy.func
-        self.support=X_dummy.support
-        self.ftype=X_dummy.ftype
+        RV.__init__(self,[(theta**(x)*exp(-theta))/factorial(x)],
+                    [0,oo],['Discrete','pdf'])
+        self.parameter=(theta,)
+
+    def native_sample(self,rng,n):
+        """
+        Generates n Poisson variates with a NumPy generator
+        """
+        theta=native_params(self)[0]
+        return rng.poisson(theta,n).astype(float)
 
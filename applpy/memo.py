@@ -0,0 +1,195 @@
+######################################################################
+# ApplPy Software 2012 Matthew Robinson, Matthew Jackiewicz          #
+# Version 0.5, last updated 18 October 2026                          #
+######################################################################
+
+"""
+Memoization Module
+
+Defines a process-wide, size-bounded (least recently used) cache for
+    the SymPy procedures integrate, solve and simplify
+
+"""
+
+from __future__ import division
+from collections import OrderedDict
+from copy import copy
+from threading import Lock
+import sympy
+
+class LRUCache:
+    """
+    LRUCache Class
+    Defines a dictionary that holds at most maxsize entries, discarding
+        the least recently used entry when it is full
+    """
+
+    def __init__(self,maxsize=1024):
+        """
+        Creates an empty cache that holds at most maxsize entries
+        """
+        self.maxsize=maxsize
+        self.data=OrderedDict()
+        self.hits={}
+        self.misses={}
+        self.lock=Lock()
+
+    def lookup(self,name,key):
+        """
+        Returns (True,value) if the key is in the cache, and
+            (False,None) otherwise
+        """
+        with self.lock:
+            if key in self.data:
+                # Move the entry to the most recently used position
+                value=self.data.pop(key)
+                self.data[key]=value
+                self.hits[name]=self.hits.get(name,0)+1
+                return True,value
+            self.misses[name]=self.misses.get(name,0)+1
+            return False,None
+
+    def store(self,key,value):
+        """
+        Places a value in the cache, evicting the least recently used
+            entries if the cache is full
+        """
+        with self.lock:
+            if self.maxsize<=0:
+                return
+            self.data[key]=value
+            while len(self.data)>self.maxsize:
+                self.data.popitem(last=False)
+
+    def resize(self,maxsize):
+        """
+        Changes the capacity of the cache
+        """
+        with self.lock:
+            self.maxsize=maxsize
+            while len(self.data)>max(maxsize,0):
+                self.data.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes every entry and resets the hit and miss counts
+        """
+        with self.lock:
+            self.data.clear()
+            self.hits={}
+            self.misses={}
+
+# The cache shared by every ApplPy procedure in the process
+sympy_cache=LRUCache()
+
+"""
+Cache Utilities
+
+Procedures:
+    1. CacheInfo()
+    2. ClearCache()
+    3. SetCacheSize(maxsize)
+"""
+
+def CacheInfo():
+    """
+    Procedure Name: CacheInfo
+    Purpose: Report the state of the integrate/solve/simplify cache
+    Arguments:  None
+    Output:     1. A dictionary with the capacity and current size of
+                    the cache, and the hits and misses recorded for
+                    each cached procedure
+    """
+    info={'maxsize':sympy_cache.maxsize,'size':len(sympy_cache.data)}
+    for name in ['integrate','solve','simplify']:
+        info[name]={'hits':sympy_cache.hits.get(name,0),
+                    'misses':sympy_cache.misses.get(name,0)}
+    return info
+
+def ClearCache():
+    """
+    Procedure Name: ClearCache
+    Purpose: Empty the integrate/solve/simplify cache
+    Arguments:  None
+    Output:     None
+    """
+    sympy_cache.clear()
+
+def SetCacheSize(maxsize):
+    """
+    Procedure Name: SetCacheSize
+    Purpose: Set the number of results held by the integrate/solve/
+                simplify cache
+    Arguments:  1. maxsize: A non-negative integer (0 disables caching)
+    Output:     None
+    """
+    if type(maxsize)!=int or maxsize<0:
+        raise ValueError('The cache size must be a non-negative integer')
+    sympy_cache.resize(maxsize)
+
+def cache_key(name,args,kwargs):
+    # Not intended for use by end user
+    """
+    Procedure Name: cache_key
+    Purpose: Build a canonical key for a call to a SymPy procedure
+    Arguments:  1. name: The name of the procedure
+                2. args: The positional arguments of the call
+                3. kwargs: The keyword arguments of the call
+    Output:     1. A string key, or None if the arguments cannot be
+                    represented canonically
+    """
+    try:
+        key=[name]
+        for arg in args:
+            key.append(sympy.srepr(arg))
+        for kw in sorted(kwargs):
+            key.append('%s=%s'%(kw,sympy.srepr(kwargs[kw])))
+        return '|'.join(key)
+    except Exception:
+        return None
+
+def cached_call(name,proc,args,kwargs):
+    # Not intended for use by end user
+    """
+    Procedure Name: cached_call
+    Purpose: Call a SymPy procedure, reusing the result of any
+                earlier call with structurally identical arguments
+    Arguments:  1. name: The name of the procedure
+                2. proc: The SymPy procedure
+                3. args: The positional arguments of the call
+                4. kwargs: The keyword arguments of the call
+    Output:     1. The result of proc(*args,**kwargs)
+    """
+    key=cache_key(name,args,kwargs)
+    if key==None or sympy_cache.maxsize<=0:
+        return proc(*args,**kwargs)
+    found,value=sympy_cache.lookup(name,key)
+    if found!=True:
+        value=proc(*args,**kwargs)
+        sympy_cache.store(key,value)
+    # solve returns lists and dictionaries, so give each caller a copy
+    #   that it is free to modify
+    if isinstance(value,(list,dict)):
+        return copy(value)
+    return value
+
+def integrate(*args,**kwargs):
+    """
+    Procedure Name: integrate
+    Purpose: Cached version of sympy.integrate
+    """
+    return cached_call('integrate',sympy.integrate,args,kwargs)
+
+def solve(*args,**kwargs):
+    """
+    Procedure Name: solve
+    Purpose: Cached version of sympy.solve
+    """
+    return cached_call('solve',sympy.solve,args,kwargs)
+
+def simplify(*args,**kwargs):
+    """
+    Procedure Name: simplify
+    Purpose: Cached version of sympy.simplify
+    """
+    return cached_call('simplify',sympy.simplify,args,kwargs)
@@ -15,8 +15,26 @@ Defines procudures on two random variables
 
 from __future__ import division
 from sympy import *
+from memo import integrate,simplify,solve
+from memo import CacheInfo,ClearCache,SetCacheSize
+from store import stored,store_lookup,store_save
+from store import OpenStore,CloseStore,ClearStore
+from compiled import CompiledForm
+from sampling import cdf_grid,invert_cdf,invert_discrete
+from sampling import QuantileTable,AliasTable
+from sampling import SpawnStreams,make_rng,draw_uniforms
+from sampling import parallel_sample,UniformSource,UniformPoints
+try:
+    import numpy as np
+except ImportError:
+    np=None
 import plot as plt
-from random import random
+from random import Random
+import heapq
+import operator
+from itertools import groupby
+from fractions import Fraction
+from bisect import bisect_left,bisect_right
 x,y,z,t=symbols('x y z t')
 
 class RVError(Exception):
@@ -30,13 +48,23 @@ class RVError(Exception):
     def __str__(self):
         return repr(self.value)
 
-class RV:
+class RV(object):
     """
     RV Class
     Defines the data structure of ApplPy random variables
     Defines procedures relating to ApplPy random variables
+        Random variables are immutable: the function list, support
+        and type are held in tuples, and an attribute cannot be
+        reassigned once it is set, so random variables can be shared
+        between caches and threads without copying
     """
 
+    # The attributes are kept in slots to reduce the memory used by
+    #   each random variable. The cache of derived forms is the only
+    #   attribute that may change after construction, and the hash is
+    #   stored the first time it is computed.
+    __slots__=('func','support','ftype','cache','hashvalue')
+
     def __init__(self,func,support,ftype=['continuous','pdf']):
         """
         Creates an instance of the random variable class
@@ -48,14 +76,14 @@ class RV:
         #   variable
 
         # Check to make sure that the given function is in the
-        #   form of a list
+        #   form of a list or tuple
         # If it is not in the form of a list, place it in a list
-        if isinstance(func,list)!=True:
+        if isinstance(func,(list,tuple))!=True:
             func1=func
             func=[func1]
         # Check to make sure that the given support is in the form of
-        #   a list
-        if isinstance(support,list)!=True:
+        #   a list or tuple
+        if isinstance(support,(list,tuple))!=True:
             raise RVError('Support must be a list')
         # Check to make sure that the random variable is either
         #   discrete or continuous
@@ -82,9 +110,10 @@ class RV:
             if support[i]>support[i+1]:
                 raise RVError('Support is not in ascending order')
         # Initialize the random variable
-        self.func=func
-        self.support=support
-        self.ftype=ftype
+        self.func=tuple(func)
+        self.support=tuple(support)
+        self.ftype=tuple(ftype)
+        self.cache=None
 
     """
     Special Class Methods
@@ -93,7 +122,11 @@ class RV:
         1. display(self)
         2. __repr__(self)
         3. __len__(self)
-        4. __add__(self,other)
+        4. __eq__(self,other)
+        5. __hash__(self)
+        6. __add__(self,other)
+        7. __setattr__(self,name,value)
+        8. __getstate__(self), __setstate__(self,state)
     """
 
     def display(self,opt=None):
@@ -123,16 +156,16 @@ class RV:
                 p=eval(piece3)
                 print '%s %s with support %s:'%(self.ftype[0],
                                                 self.ftype[1],
-                                                self.support)
+                                                list(self.support))
                 if opt=='repr':
-                    return self.func
+                    return list(self.func)
                 else:
                     return p
             except:
                 print '%s %s with support %s:'%(self.ftype[0],
                                                 self.ftype[1],
-                                                self.support)
-                return self.func
+                                                list(self.support))
+                return list(self.func)
             
         if self.ftype[0]=='discrete':
             print '%s %s where {x->f(x)}:'%(self.ftype[0],
@@ -159,6 +192,98 @@ class RV:
         """
         return len(self.func)
 
+    def canonical(self):
+        """
+        Returns the canonical form of the random variable: a tuple of
+            the function list, the support and the type, with every
+            function and support value converted to a SymPy object
+        """
+        funclist=[]
+        for i in range(len(self.func)):
+            try:
+                funclist.append(sympify(self.func[i]))
+            except SympifyError:
+                funclist.append(self.func[i])
+        supplist=[]
+        for i in range(len(self.support)):
+            try:
+                supplist.append(sympify(self.support[i]))
+            except SympifyError:
+                supplist.append(self.support[i])
+        return (tuple(funclist),tuple(supplist),tuple(self.ftype))
+
+    def __eq__(self,other):
+        """
+        Sets the behavior of the '==' operator
+            Two random variables are equal if they have the same
+            functional form, support and type, regardless of the
+            subclass that created them
+        """
+        if not isinstance(other,RV):
+            return False
+        # SymPy considers a Float equal to a Rational with the same
+        #   value, but hashes them differently, so compare the hashes
+        #   as well to keep equality structural
+        if hash(self)!=hash(other):
+            return False
+        return self.canonical()==other.canonical()
+
+    def __ne__(self,other):
+        """
+        Sets the behavior of the '!=' operator
+        """
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        """
+        Sets the behavior for the hash() procedure, so that random
+            variables can be used as dictionary keys
+            The hash is computed from the canonical form once, and
+            stored, since random variables are immutable
+        """
+        value=getattr(self,'hashvalue',None)
+        if value==None:
+            value=hash(self.canonical())
+            self.hashvalue=value
+        return value
+
+    def __setattr__(self,name,value):
+        """
+        Prevents an attribute of a random variable from being
+            reassigned once it is set
+        """
+        if name!='cache' and hasattr(self,name):
+            raise RVError('Random variables are immutable')
+        object.__setattr__(self,name,value)
+
+    def __delattr__(self,name):
+        """
+        Prevents the attributes of a random variable from being
+            deleted
+        """
+        raise RVError('Random variables are immutable')
+
+    def __getstate__(self):
+        """
+        Returns the attributes used by pickle and copy, leaving out
+            the cache of derived forms and the stored hash
+        """
+        state=dict(getattr(self,'__dict__',{}))
+        for cls in type(self).__mro__:
+            for name in getattr(cls,'__slots__',()):
+                if name not in ['cache','hashvalue'] and \
+                   hasattr(self,name):
+                    state[name]=getattr(self,name)
+        return state
+
+    def __setstate__(self,state):
+        """
+        Restores the attributes written by __getstate__
+        """
+        for name in state:
+            object.__setattr__(self,name,state[name])
+        object.__setattr__(self,'cache',None)
+
     # Set the behavior for the operators '+,-,*,/'
 
     def __add__(self,other):
@@ -194,7 +319,15 @@ class RV:
 
     Procedures:
         1. verifyPDF(self)
-        2. variate(self,n)
+        2. variate(self,n,s,sensitivity,seed,uniforms,scramble,
+                   antithetic)
+        3. sample(self,n,sort,method,seed,uniforms,scramble,antithetic)
+        4. sample_parallel(self,n,processes,sort,method,seed)
+        5. stream(self,chunk,n,method,seed,uniforms,scramble,antithetic)
+        6. quantile_table(self,tol)
+        7. alias_table(self)
+        8. pdf(self,values), cdf(self,values), sf(self,values),
+           hf(self,values), chf(self,values), idf(self,values)
     """
     def verifyPDF(self):
         """
@@ -223,8 +356,8 @@ class RV:
                 if val_list[i]<0:
                     abs_flag=False
             print 'The pdf of the random variable:'
-            print '%s'%(X_dummy.func)
-            print 'continuous pdf with support %s'%(X_dummy.support)
+            print '%s'%(list(X_dummy.func))
+            print 'continuous pdf with support %s'%(list(X_dummy.support))
             if area>.9999 and area<1.00001 and abs_flag==True:
                 print 'is valid'
             else:
@@ -250,22 +383,49 @@ class RV:
             else:
                 print 'is not valid'
 
-    def variate(self,n=1,s='sim',sensitivity=.00001):
+    def variate(self,n=1,s='sim',sensitivity=.00001,seed=None,
+                uniforms='pseudo',scramble=False,antithetic=False):
         """
         Generates a list of n random variates from the random variable
             using the Newton-Raphson Method
+            seed may be an integer, a NumPy RandomState or Generator,
+            or a stream from SpawnStreams. uniforms, scramble and
+            antithetic choose the uniform random numbers as in sample.
         """   
+        # Use the vectorized sampler when every parameter is numeric
+        if np!=None:
+            try:
+                if s=='sim':
+                    varlist=self.sample(n,sort=True,seed=seed,
+                                        uniforms=uniforms,
+                                        scramble=scramble,
+                                        antithetic=antithetic)
+                else:
+                    varlist=inverse_transform(self,np.zeros(n)+float(s))
+                return varlist.tolist()
+            except RVError as err:
+                if err.value!='Not all parameters specified':
+                    raise
         # Find the cdf and pdf functions (to avoid integrating for
             # each variate
         cdf=CDF(self)
         pdf=PDF(self)
         mean=Mean(self)
+        # Draw the uniform random numbers from the requested stream
+        if s=='sim':
+            if np!=None:
+                source=UniformSource(uniforms,make_rng(seed),1,scramble,
+                                     antithetic)
+                ulist=source.draw(n).tolist()
+            else:
+                stream=Random(seed)
+                ulist=[stream.random() for i in range(n)]
         # Create a list of variates
         varlist=[]
         for i in range(n):
             guess=mean
             if s=='sim':
-                val=random()
+                val=ulist[i]
             else:
                 val=s
             for i in range(10):
@@ -291,6 +451,481 @@ class RV:
         varlist.sort()
         return varlist
 
+    def sample(self,n=1,sort=False,method=None,seed=None,
+               uniforms='pseudo',scramble=False,antithetic=False):
+        """
+        Generates a NumPy array of n random variates from the random
+            variable, inverting its compiled cdf for all of the
+            variates at once
+            method='newton' solves cdf(x)=u for each variate,
+            method='table' interpolates a quantile table instead, and
+            method='alias' uses an alias table (discrete only). The
+            default is 'newton' for continuous random variables and
+            'alias' for discrete random variables.
+            seed may be an integer, a NumPy RandomState or Generator,
+            or a stream from SpawnStreams
+            uniforms='sobol' or 'halton' inverts quasi-random points
+            (randomly scrambled if scramble=True) and uniforms='lhs'
+            inverts a Latin hypercube sample, instead of the default
+            pseudo-random numbers. uniforms may also be an array of
+            at least n uniform random numbers chosen by the caller,
+            which are inverted in order. If antithetic=True, every
+            variate drawn from u is followed by the variate drawn from
+            1-u. Named distributions then invert their cdf rather than
+            using their NumPy generator.
+        """
+        source=UniformSource(uniforms,make_rng(seed),1,scramble,
+                             antithetic)
+        varlist=draw_variates(self,source,n,
+                              sampling_method(self,method,source))
+        if sort==True:
+            varlist.sort()
+        return varlist
+
+    def sample_parallel(self,n,processes=None,sort=False,method=None,
+                        seed=None):
+        """
+        Generates a NumPy array of n random variates from the random
+            variable with a pool of worker processes
+            Each worker compiles the random variable once, draws from
+            its own random number streams and writes into shared
+            memory. The variates depend only on the seed, and not on
+            the number of processes. The method is chosen as in
+            sample.
+        """
+        spec=sampler_spec(self,sampling_method(self,method))
+        # The streams of the workers are spawned from an integer seed,
+        #   which is drawn from the generator if one is given
+        if not isinstance(seed,(int,long)):
+            seed=int(draw_uniforms(make_rng(seed),1)[0]*2**53)
+        varlist=parallel_sample(spec,n,processes,seed)
+        if sort==True:
+            varlist.sort()
+        return varlist
+
+    def stream(self,chunk=65536,n=None,method=None,seed=None,
+               uniforms='pseudo',scramble=False,antithetic=False):
+        """
+        Returns an iterator over NumPy arrays of at most chunk random
+            variates, which runs until n variates have been produced,
+            or forever if n is not specified
+            Only one chunk is held in memory at a time. The method and
+            the uniforms are chosen as in sample, and successive
+            chunks continue the same quasi-random sequence.
+        """
+        if type(chunk)!=int or chunk<1:
+            raise RVError('The chunk size must be a positive integer')
+        source=UniformSource(uniforms,make_rng(seed),1,scramble,
+                             antithetic)
+        return stream_variates(self,source,
+                               sampling_method(self,method,source),
+                               chunk,n)
+
+    def quantile_table(self,tol=1e-10):
+        """
+        Returns a table of the idf of a continuous random variable,
+            interpolated so that |cdf(idf(u))-u|<=tol. The table is
+            built once, and is kept in the result store when it is
+            open.
+        """
+        if self.ftype[0]!='continuous':
+            string='Quantile tables require a continuous random variable'
+            raise RVError(string)
+        cache=form_cache(self)
+        key=('sampler','table',tol)
+        if key not in cache:
+            table=store_lookup('QuantileTable',[self,tol])
+            if table==None:
+                cdf=compiled_form(self,'cdf')
+                table=QuantileTable(cdf,compiled_form(self,'pdf'),
+                                    sampler_grid(self),tol)
+                store_save('QuantileTable',[self,tol],table)
+            cache[key]=table
+        return cache[key]
+
+    def alias_table(self):
+        """
+        Returns an alias table for a discrete random variable, built
+            once and kept with the random variable
+        """
+        if self.ftype[0] not in ['discrete','Discrete']:
+            string='Alias tables require a discrete random variable'
+            raise RVError(string)
+        cache=form_cache(self)
+        if ('sampler','alias') not in cache:
+            if self.ftype[0]=='discrete':
+                pdf=compiled_form(self,'pdf')
+                points=pdf.support
+                probs=pdf.values
+            else:
+                cumprob,points=discrete_lattice(self,1)
+                probs=np.diff(np.concatenate([[0],cumprob]))
+            cache[('sampler','alias')]=AliasTable(points,probs)
+        return cache[('sampler','alias')]
+
+    """
+    Compiled Evaluators
+
+    Each evaluator compiles its functional form the first time it is
+        called, and accepts a number or a NumPy array of numbers. All of
+        the parameters of the random variable must be numeric.
+    """
+
+    def pdf(self,values):
+        """
+        Evaluates the pdf of the random variable
+        """
+        return compiled_form(self,'pdf')(values)
+
+    def cdf(self,values):
+        """
+        Evaluates the cdf of the random variable
+        """
+        return compiled_form(self,'cdf')(values)
+
+    def sf(self,values):
+        """
+        Evaluates the sf of the random variable
+        """
+        return compiled_form(self,'sf')(values)
+
+    def hf(self,values):
+        """
+        Evaluates the hf of the random variable
+        """
+        return compiled_form(self,'hf')(values)
+
+    def chf(self,values):
+        """
+        Evaluates the chf of the random variable
+        """
+        return compiled_form(self,'chf')(values)
+
+    def idf(self,values):
+        """
+        Evaluates the idf of the random variable
+        """
+        return compiled_form(self,'idf')(values)
+
+
+class CompactRV(RV):
+    """
+    CompactRV Class
+    Defines a discrete random variable whose support and function
+        values are held in NumPy arrays, either as float64 values or
+        as exact SymPy objects
+    """
+
+    # Marks the random variable for the array-based procedures
+    compact=True
+
+    __slots__=('exact',)
+
+    def __init__(self,func,support,ftype=['discrete','pdf'],exact=None):
+        """
+        Creates an instance of the compact random variable class
+            If exact is None, the values are stored as float64 when
+            every value is a number that float64 represents exactly,
+            and as SymPy objects otherwise
+        """
+        # RV.__init__ requires lists, so the checks are made here
+        if np==None:
+            raise ImportError('Compact random variables require numpy')
+        if ftype[0]!='discrete':
+            raise RVError('Compact random variables must be discrete')
+        if ftype[1] not in ['pdf','cdf','sf']:
+            string='Compact random variables must be in pdf, cdf or sf'
+            string+=' form'
+            raise RVError(string)
+        if len(func)!=len(support):
+            raise RVError('Support has incorrect number of elements')
+        if exact==None:
+            exact=not (float_values(func) and float_values(support))
+        if exact==True:
+            func=object_array(func)
+            support=object_array(support)
+        else:
+            func=np.array(func,dtype=float)
+            support=np.array(support,dtype=float)
+        # The arrays are read-only, as the lists of the RV class are
+        #   held in tuples
+        func.flags.writeable=False
+        support.flags.writeable=False
+        self.func=func
+        self.support=support
+        # Check to make sure that the support is numeric and in
+        #   ascending order
+        try:
+            keys=self.support.astype(float)
+        except (TypeError,ValueError):
+            raise RVError('Compact random variables require a numeric '+
+                          'support')
+        if (np.diff(keys)<0).any():
+            raise RVError('Support is not in ascending order')
+        self.ftype=tuple(ftype)
+        self.exact=exact
+        self.cache=None
+
+    def __setstate__(self,state):
+        """
+        Restores the attributes written by __getstate__, keeping the
+            arrays read-only
+        """
+        RV.__setstate__(self,state)
+        self.func.flags.writeable=False
+        self.support.flags.writeable=False
+
+    def keys(self):
+        """
+        Returns the support as an array of floats
+        """
+        return self.support.astype(float)
+
+def float_values(values):
+    # Not intended for use by end user
+    """
+    Procedure Name: float_values
+    Purpose: Check whether a list of values can be held in a float64
+                array without loss
+    Arguments:  1. values: A list or array of values
+    Output:     1. True if every value is a float, or an integer that
+                    float64 represents exactly
+    """
+    if isinstance(values,np.ndarray) and values.dtype!=object:
+        return True
+    for v in values:
+        if isinstance(v,(float,np.floating)):
+            continue
+        if isinstance(v,(int,long,np.integer)) and abs(v)<2**53:
+            continue
+        v=sympify(v)
+        if v.is_Float or (v.is_Integer and abs(v)<2**53):
+            continue
+        return False
+    return True
+
+def object_array(values):
+    # Not intended for use by end user
+    """
+    Procedure Name: object_array
+    Purpose: Create a one-dimensional array of SymPy objects
+    Arguments:  1. values: A list or array of values
+    Output:     1. An array with dtype object
+    """
+    result=np.empty(len(values),dtype=object)
+    result[:]=[sympify(v) for v in values]
+    return result
+
+def is_compact(RVar):
+    # Not intended for use by end user
+    """
+    Procedure Name: is_compact
+    Purpose: Check whether a random variable is array-backed
+    Arguments:  1. RVar: A random variable
+    Output:     1. True for instances of CompactRV
+    """
+    return getattr(RVar,'compact',False)==True
+
+"""
+Compact Random Variables
+
+Procedures:
+    1. Compact(RVar,exact)
+    2. Uncompact(RVar)
+"""
+
+def Compact(RVar,exact=None):
+    """
+    Procedure Name: Compact
+    Purpose: Convert a discrete random variable to its array-backed
+                form
+    Arguments:  1. RVar: A discrete random variable
+                2. exact: True to keep exact SymPy values, False to
+                    store float64 values, or None to keep exact values
+                    only when float64 would lose them (optional)
+    Output:     1. A CompactRV
+    """
+    if is_compact(RVar) and (exact==None or exact==RVar.exact):
+        return RVar
+    # Functional discrete random variables with a finite support are
+    #   converted to explicit form first
+    if RVar.ftype[0]=='Discrete' and -oo not in RVar.support and \
+       oo not in RVar.support:
+        RVar=Convert(RVar)
+    if RVar.ftype[0]!='discrete':
+        raise RVError('Only discrete random variables with a finite '+
+                      'support can be compacted')
+    X_dummy=RVar
+    if X_dummy.ftype[1] not in ['pdf','cdf','sf']:
+        X_dummy=PDF(RVar)
+    return CompactRV(X_dummy.func,X_dummy.support,X_dummy.ftype,exact)
+
+def Uncompact(RVar):
+    """
+    Procedure Name: Uncompact
+    Purpose: Convert an array-backed random variable to the list form
+                of the RV class
+    Arguments:  1. RVar: A random variable
+    Output:     1. An RV with SymPy function and support values
+    """
+    if not is_compact(RVar):
+        return RVar
+    if RVar.exact==True:
+        return RV(list(RVar.func),list(RVar.support),list(RVar.ftype))
+    return RV([Float(v) for v in RVar.func],
+              [Float(v) for v in RVar.support],list(RVar.ftype))
+
+def compact_form(RVar,ftype):
+    # Not intended for use by end user
+    """
+    Procedure Name: compact_form
+    Purpose: Convert a compact random variable between its pdf, cdf and
+                sf forms with array operations
+    Arguments:  1. RVar: A CompactRV
+                2. ftype: 'pdf', 'cdf' or 'sf'
+    Output:     1. The CompactRV in the requested form
+    """
+    if ftype not in ['pdf','cdf','sf']:
+        raise RVError('Compact random variables have pdf, cdf and sf '+
+                      'forms only')
+    Form=find_form(RVar,ftype)
+    if Form!=None:
+        return Form
+    # Every form is derived through the pdf, where the sf gives
+    #   P(X>=x) as for other discrete random variables
+    if RVar.ftype[1]=='pdf':
+        pdf=RVar.func
+    elif RVar.ftype[1]=='cdf':
+        previous=np.concatenate([RVar.func[:1]*0,RVar.func[:-1]])
+        pdf=RVar.func-previous
+    else:
+        following=np.concatenate([RVar.func[1:],RVar.func[:1]*0])
+        pdf=RVar.func-following
+    if ftype=='pdf':
+        func=pdf
+    elif ftype=='cdf':
+        func=np.cumsum(pdf)
+    else:
+        func=np.cumsum(pdf[::-1])[::-1]
+    Form=CompactRV(func,RVar.support,['discrete',ftype],RVar.exact)
+    return cache_form(RVar,Form)
+
+def compact_value(RVar,ftype,value):
+    # Not intended for use by end user
+    """
+    Procedure Name: compact_value
+    Purpose: Evaluate the pdf, cdf or sf of a compact random variable
+                at a single value
+    Arguments:  1. RVar: A CompactRV
+                2. ftype: 'pdf', 'cdf' or 'sf'
+                3. value: A number
+    Output:     1. The value of the functional form
+    """
+    Form=compact_form(RVar,ftype)
+    keys=Form.keys()
+    v=float(value)
+    n=len(keys)
+    if ftype=='pdf':
+        k=np.searchsorted(keys,v,side='left')
+        if k<n and keys[k]==v:
+            return sympify(Form.func[k])
+        return S.Zero
+    # The cdf holds its value until the next support point, and the sf
+    #   takes the value of the next support point
+    if ftype=='cdf':
+        k=np.searchsorted(keys,v,side='right')-1
+        if k<0:
+            return S.Zero
+        return sympify(Form.func[k])
+    k=np.searchsorted(keys,v,side='left')
+    if k==n:
+        return S.Zero
+    return sympify(Form.func[k])
+
+def discrete_value(RVar,value):
+    # Not intended for use by end user
+    """
+    Procedure Name: discrete_value
+    Purpose: Evaluate a discrete random variable, given by a list of
+                support points, at a single value
+    Arguments:  1. RVar: A discrete random variable
+                2. value: A number
+    Output:     1. The value of the functional form
+    """
+    supp=RVar.support
+    n=len(supp)
+    ftype=RVar.ftype[1]
+    # The steps follow the same rules as the compiled evaluation of
+    #   discrete forms, so that a single value and an array of values
+    #   give the same result. The cdf holds its value until the next
+    #   support point
+    if ftype=='cdf':
+        k=bisect_right(supp,value)-1
+        if k<0:
+            return 0
+        return RVar.func[k]
+    # The idf, sf and chf take the value of the next support point
+    k=bisect_left(supp,value)
+    if ftype in ['idf','sf','chf']:
+        if k==n:
+            return 0
+        return RVar.func[k]
+    # The pdf and hf are zero away from the support points
+    if k<n and supp[k]==value:
+        return RVar.func[k]
+    return 0
+
+def compact_combine(RVar1,RVar2,op):
+    # Not intended for use by end user
+    """
+    Procedure Name: compact_combine
+    Purpose: Compute the distribution of op(X,Y) for independent
+                discrete random variables, at least one of which is
+                compact
+    Arguments:  1. RVar1: A discrete random variable
+                2. RVar2: A discrete random variable
+                3. op: np.add or np.multiply
+    Output:     1. A CompactRV in pdf form
+    """
+    X1=Compact(RVar1)
+    X2=Compact(RVar2)
+    # Exact values are combined by the list algorithms
+    if X1.exact==True or X2.exact==True:
+        procs={np.add:Convolution,np.multiply:Product}
+        result=procs[op](Uncompact(X1),Uncompact(X2))
+        return Compact(result,exact=True)
+    fx=PDF(X1)
+    fy=PDF(X2)
+    # Form the pairs in blocks of rows, so that only one block of
+    #   pairs is held in memory at a time
+    rows=max(1,2**22//max(1,len(fy.support)))
+    values=[]
+    probs=[]
+    for start in range(0,len(fx.support),rows):
+        block=slice(start,start+rows)
+        v=op.outer(fx.support[block],fy.support).ravel()
+        p=np.multiply.outer(fx.func[block],fy.func).ravel()
+        v,p=compact_aggregate(v,p)
+        values.append(v)
+        probs.append(p)
+    supp,func=compact_aggregate(np.concatenate(values),
+                                np.concatenate(probs))
+    return CompactRV(func,supp,['discrete','pdf'],False)
+
+def compact_aggregate(values,probs):
+    # Not intended for use by end user
+    """
+    Procedure Name: compact_aggregate
+    Purpose: Sort an array of support values, and sum the probabilities
+                of equal values
+    Arguments:  1. values: An array of support values
+                2. probs: The probability of each value
+    Output:     1. The distinct values in ascending order
+                2. The probability of each value
+    """
+    supp,index=np.unique(values,return_inverse=True)
+    return supp,np.bincount(index,weights=probs,minlength=len(supp))
+
 
 """
 Procedures for converting functional form
@@ -302,7 +937,7 @@ Procedures:
     4. IDF(RVar,value)
     5. PDF(RVar,value)
     6. SF(RVar,value)
-    7. BootstrapRV(varlist)
+    7. BootstrapRV(varlist,compact)
     8. Convert(RVar,inc)
 """
 
@@ -314,9 +949,23 @@ def check_value(value,sup):
                 SF is in the support of the random variable
     Arguments:  1. value: The value passed to RV procedure
                 2. sup: The support of the RV in the procedure
-    Output:     1. True if the value given is within the support
+    Output:     1. True if the value given (or every value in a list
+                    or array) is within the support
                 2. False otherwise
     """
+    if is_batch(value):
+        # Compare the whole array with the end points of the support
+        #   when they are numeric
+        try:
+            vals=np.asarray(value,dtype=float)
+            lw=float(sup[0])
+            up=float(sup[len(sup)-1])
+            return not ((vals<lw).any() or (vals>up).any())
+        except (TypeError,ValueError,AttributeError):
+            for i in range(len(value)):
+                if check_value(value[i],sup)!=True:
+                    return False
+            return True
     if value==x:
         return True
     else:
@@ -326,15 +975,427 @@ def check_value(value,sup):
         else:
             return True
 
+def is_batch(value):
+    # Not intended for use by end user
+    """
+    Procedure Name: is_batch
+    Purpose: Check to see if a value passed to CDF,CHF,HF,IDF,PDF or
+                SF is a list or array of values
+    Arguments:  1. value: The value passed to RV procedure
+    Output:     1. True if the value is a list, tuple or NumPy array
+                2. False otherwise
+    """
+    if isinstance(value,(list,tuple)):
+        return True
+    if np!=None and isinstance(value,np.ndarray):
+        return True
+    return False
+
+def numeric_values(values):
+    # Not intended for use by end user
+    """
+    Procedure Name: numeric_values
+    Purpose: Check to see if every value in a list or array of values
+                has a numeric value
+    Arguments:  1. values: A list or array of values
+    Output:     1. True if the values can be converted to floats
+                2. False otherwise
+    """
+    if isinstance(values,np.ndarray) and values.dtype!=object:
+        return True
+    for value in values:
+        if len(sympify(value).free_symbols)!=0:
+            return False
+    return True
+
+def form_cache(RVar):
+    # Not intended for use by end user
+    """
+    Procedure Name: form_cache
+    Purpose: Return the dictionary of functional forms that have
+                already been derived for a random variable
+    Arguments:  1. RVar: A random variable
+    Output:     1. A dictionary mapping 'pdf','cdf','sf','hf','chf'
+                    and 'idf' to random variables
+    """
+    # The cache is created the first time it is needed, and is shared
+    #   by every form of the random variable
+    if getattr(RVar,'cache',None)==None:
+        RVar.cache={RVar.ftype[1]:RVar}
+    return RVar.cache
+
+def cache_form(RVar,Form,save=True):
+    # Not intended for use by end user
+    """
+    Procedure Name: cache_form
+    Purpose: Store a functional form derived from a random variable
+                so that later conversions can reuse it
+    Arguments:  1. RVar: A random variable
+                2. Form: A functional form derived from RVar
+                3. save: If True, also write the form to the result
+                    store
+    Output:     1. Form
+    """
+    # All of the functional forms of a random variable describe the
+    #   same distribution, so they share a single cache
+    cache=form_cache(RVar)
+    if getattr(Form,'cache',None)!=None:
+        for key in Form.cache:
+            if key not in cache:
+                cache[key]=Form.cache[key]
+    cache[Form.ftype[1]]=Form
+    Form.cache=cache
+    if save==True:
+        store_save(Form.ftype[1].upper(),[RVar],Form)
+    return Form
+
+def find_form(RVar,ftype):
+    # Not intended for use by end user
+    """
+    Procedure Name: find_form
+    Purpose: Find a functional form of a random variable that has
+                already been derived, either in this session or in
+                the result store
+    Arguments:  1. RVar: A random variable
+                2. ftype: The functional form ('pdf','cdf',...)
+    Output:     1. The functional form, or None if it has not been
+                    derived
+    """
+    cache=form_cache(RVar)
+    if ftype not in cache:
+        Form=store_lookup(ftype.upper(),[RVar])
+        if Form==None:
+            return None
+        cache_form(RVar,Form,save=False)
+    return cache[ftype]
+
+def compiled_form(RVar,ftype):
+    # Not intended for use by end user
+    """
+    Procedure Name: compiled_form
+    Purpose: Return a compiled numeric evaluator for a functional form
+                of a random variable
+    Arguments:  1. RVar: A random variable
+                2. ftype: The functional form ('pdf','cdf',...)
+    Output:     1. A CompiledForm instance
+    """
+    cache=form_cache(RVar)
+    if ('compiled',ftype) not in cache:
+        # Only the pdf of a functional discrete random variable can be
+        #   evaluated directly, so convert it to explicit form for the
+        #   other functional forms. Convert needs a finite support, so
+        #   the other forms of a random variable with an infinite
+        #   support are found by summing the pdf over the integers
+        X_dummy=RVar
+        if RVar.ftype[0]=='Discrete' and ftype!=RVar.ftype[1]:
+            if RVar.support[-1]==oo:
+                cache[('compiled',ftype)]=lattice_compiled(RVar,ftype)
+                return cache[('compiled',ftype)]
+            X_dummy=Convert(RVar)
+        procs={'pdf':PDF,'cdf':CDF,'sf':SF,'hf':HF,'chf':CHF,'idf':IDF}
+        Form=procs[ftype](X_dummy)
+        # Every parameter must have a numeric value before the form can
+        #   be compiled
+        for item in list(Form.func)+list(Form.support):
+            if len(sympify(item).free_symbols-set([x]))!=0:
+                raise RVError('Not all parameters specified')
+        cache[('compiled',ftype)]=CompiledForm(Form.func,Form.support,
+                                               Form.ftype)
+    return cache[('compiled',ftype)]
+
+def lattice_compiled(RVar,ftype):
+    # Not intended for use by end user
+    """
+    Procedure Name: lattice_compiled
+    Purpose: Return a compiled numeric evaluator for a functional form
+                of a functional discrete random variable with an
+                infinite support
+    Arguments:  1. RVar: A functional discrete random variable in pdf
+                    form
+                2. ftype: The functional form ('cdf','sf',...)
+    Output:     1. A CompiledForm instance
+    """
+    if RVar.ftype[1]!='pdf':
+        raise RVError('The %s of a functional discrete random variable '
+                      'with infinite support requires its pdf'%ftype)
+    # Tabulate the cdf over the integers until more points no longer
+    #   add any probability; the forms hold their last tabulated value
+    #   beyond the table
+    cumprob,points=discrete_lattice(RVar,1)
+    pdf=np.diff(np.concatenate(([0.0],cumprob)))
+    # The sf of a discrete random variable is P(X>=x)
+    sf=1-np.concatenate(([0.0],cumprob[:-1]))
+    if ftype=='cdf':
+        return CompiledForm(cumprob,points,['discrete','cdf'])
+    if ftype=='sf':
+        return CompiledForm(sf,points,['discrete','sf'])
+    if ftype=='idf':
+        return CompiledForm(points,cumprob,['discrete','idf'])
+    with np.errstate(all='ignore'):
+        if ftype=='hf':
+            return CompiledForm(pdf/sf,points,['discrete','hf'])
+        return CompiledForm(0.0-np.log(sf),points,['discrete','chf'])
+
+def evaluate_batch(RVar,ftype,values):
+    # Not intended for use by end user
+    """
+    Procedure Name: evaluate_batch
+    Purpose: Evaluate a functional form of a random variable at a list
+                or array of values, deriving the form only once
+    Arguments:  1. RVar: A random variable
+                2. ftype: The functional form ('pdf','cdf',...)
+                3. values: A list or array of values
+    Output:     1. An array of the values of the functional form
+    """
+    # Use the compiled form when every parameter and value is numeric
+    if np!=None and numeric_values(values):
+        try:
+            return compiled_form(RVar,ftype)(np.asarray(values,
+                                                        dtype=float))
+        except RVError as err:
+            if err.value!='Not all parameters specified':
+                raise
+    # Otherwise, derive the symbolic form once and evaluate it exactly
+    #   at each value
+    procs={'pdf':PDF,'cdf':CDF,'sf':SF,'hf':HF,'chf':CHF,'idf':IDF}
+    Form=procs[ftype](RVar)
+    if Form==None:
+        raise RVError('The %s of this random variable can only be '
+                      'evaluated when all parameters are numeric'%ftype)
+    results=[]
+    for i in range(len(values)):
+        results.append(procs[ftype](Form,values[i]))
+    if np==None:
+        return results
+    return np.array(results,dtype=object)
+
+def sampling_method(RVar,method,source=None):
+    # Not intended for use by end user
+    """
+    Procedure Name: sampling_method
+    Purpose: Choose the method used to sample from a random variable
+    Arguments:  1. RVar: A random variable
+                2. method: The method requested by the user, or None
+                3. source: The UniformSource to be used (optional)
+    Output:     1. 'native' for named distributions with a NumPy
+                    generator, or a method for inverse_transform
+    """
+    if method!=None:
+        return method
+    # Quasi-random, Latin hypercube, caller-supplied and antithetic
+    #   uniforms only keep their structure under a monotone
+    #   transformation, so they always invert the cdf
+    if source!=None and (source.kind!='pseudo' or
+                         source.antithetic==True):
+        return 'newton'
+    if getattr(RVar,'native_sample',None)!=None:
+        return 'native'
+    if RVar.ftype[0]=='continuous' or \
+       getattr(RVar,'native_idf',None)!=None:
+        return 'newton'
+    return 'alias'
+
+def draw_variates(RVar,source,n,method):
+    # Not intended for use by end user
+    """
+    Procedure Name: draw_variates
+    Purpose: Draw an array of random variates from a random variable
+    Arguments:  1. RVar: A random variable
+                2. source: A UniformSource
+                3. n: The number of variates
+                4. method: A method returned by sampling_method
+    Output:     1. An array of n variates
+    """
+    # Named distributions with a NumPy generator use it directly, and
+    #   others invert the (closed form or compiled) cdf
+    if method=='native':
+        return RVar.native_sample(source.rng,n)
+    return inverse_transform(RVar,source.draw(n),method)
+
+def stream_variates(RVar,source,method,chunk,n):
+    # Not intended for use by end user
+    """
+    Procedure Name: stream_variates
+    Purpose: Generate chunks of random variates from a random variable
+    Arguments:  1. RVar: A random variable
+                2. source: A UniformSource
+                3. method: A method returned by sampling_method
+                4. chunk: The largest number of variates in a chunk
+                5. n: The total number of variates, or None
+    Output:     1. A generator of arrays of variates
+    """
+    drawn=0
+    while n==None or drawn<n:
+        if n==None:
+            size=chunk
+        else:
+            size=min(chunk,n-drawn)
+        yield draw_variates(RVar,source,size,method)
+        drawn+=size
+
+def sampler_spec(RVar,method):
+    # Not intended for use by end user
+    """
+    Procedure Name: sampler_spec
+    Purpose: Describe the sampler of a random variable in a picklable
+                form that worker processes can compile
+    Arguments:  1. RVar: A random variable
+                2. method: A method returned by sampling_method
+    Output:     1. A sampler description for sampling.build_sampler
+    """
+    if np==None:
+        raise ImportError('Vectorized sampling requires numpy')
+    # Named distributions are sent as their class and parameters
+    if method=='native' or (method=='newton' and
+                            getattr(RVar,'native_idf',None)!=None):
+        for param in RVar.parameter:
+            if len(sympify(param).free_symbols)!=0:
+                raise RVError('Not all parameters specified')
+        if method=='native':
+            return ('native',RVar.__class__,list(RVar.parameter))
+        return ('idf',RVar.__class__,list(RVar.parameter))
+    if method=='alias':
+        return ('alias',RVar.alias_table())
+    # Functional forms are sent as srepr strings, so that each worker
+    #   compiles them for itself
+    def form_spec(ftype):
+        compiled_form(RVar,ftype)
+        Form=find_form(RVar,ftype)
+        return ([srepr(func) for func in Form.func],
+                [float(value) for value in Form.support],
+                list(Form.ftype))
+    if RVar.ftype[0]=='continuous':
+        if RVar.ftype[1]=='idf':
+            return ('compiled',form_spec('idf'))
+        spec=('newton',form_spec('cdf'),form_spec('pdf'),
+              sampler_grid(RVar))
+        if method=='table':
+            spec=('table',)+spec[1:]+(RVar.quantile_table(),)
+        return spec
+    if RVar.ftype[0]=='discrete':
+        cdf=compiled_form(RVar,'cdf')
+        return ('discrete',cdf.values,cdf.support)
+    cumprob,points=discrete_lattice(RVar,1)
+    return ('discrete',cumprob,points)
+
+def sampler_grid(RVar):
+    # Not intended for use by end user
+    """
+    Procedure Name: sampler_grid
+    Purpose: Return the tabulated cdf of a continuous random variable
+                used to start the inversion of its cdf
+    Arguments:  1. RVar: A continuous random variable
+    Output:     1. A grid produced by cdf_grid
+    """
+    cache=form_cache(RVar)
+    if ('sampler','grid') not in cache:
+        cdf=compiled_form(RVar,'cdf')
+        cache[('sampler','grid')]=cdf_grid(cdf,cdf.support[0],
+                                           cdf.support[-1])
+    return cache[('sampler','grid')]
+
+def inverse_transform(RVar,u,method='newton'):
+    # Not intended for use by end user
+    """
+    Procedure Name: inverse_transform
+    Purpose: Apply the inverse transformation to an array of uniform
+                random numbers, using the compiled forms of a random
+                variable
+    Arguments:  1. RVar: A random variable
+                2. u: An array of values in [0,1]
+                3. method: 'newton' to solve cdf(x)=u, 'table' to
+                    interpolate a quantile table (continuous only),
+                    or 'alias' to use an alias table (discrete only)
+    Output:     1. An array of variates
+    """
+    if method not in ['newton','table','alias']:
+        raise RVError('The method must be newton, table or alias')
+    if np==None:
+        raise ImportError('Vectorized sampling requires numpy')
+    u=np.asarray(u,dtype=float)
+    # Named distributions with a closed form idf evaluate it directly
+    if method=='newton' and getattr(RVar,'native_idf',None)!=None:
+        return np.asarray(RVar.native_idf(u),dtype=float)
+    # Alias tables are built for discrete random variables, and draw
+    #   from them without inverting the cdf
+    if method=='alias':
+        return RVar.alias_table()(u)
+    # If the random variable is given by its idf, evaluate it directly
+    if RVar.ftype[0]=='continuous' and RVar.ftype[1]=='idf':
+        return compiled_form(RVar,'idf')(u)
+    # For continuous random variables, solve cdf(x)=u with Newton's
+    #   method, starting from a tabulated cdf that is computed once
+    if RVar.ftype[0]=='continuous':
+        cdf=compiled_form(RVar,'cdf')
+        pdf=compiled_form(RVar,'pdf')
+        if method=='newton':
+            return invert_cdf(cdf,pdf,sampler_grid(RVar),u)
+        # Interpolate the quantile table, and solve for the few values
+        #   of u that fall in the tails beyond the table
+        table=RVar.quantile_table()
+        result=table(u)
+        tails=np.nonzero(~table.covers(u))[0]
+        if len(tails)>0:
+            result[tails]=invert_cdf(cdf,pdf,sampler_grid(RVar),u[tails])
+        return result
+    # For explicit discrete random variables, search the cdf values
+    if RVar.ftype[0]=='discrete':
+        cdf=compiled_form(RVar,'cdf')
+        return invert_discrete(cdf.values,cdf.support,u)
+    # For functional discrete random variables, search the cumulative
+    #   probabilities of the integers in the support
+    umax=u.max() if len(u)>0 else 0
+    cumprob,points=discrete_lattice(RVar,umax)
+    return invert_discrete(cumprob,points,u)
+
+def discrete_lattice(RVar,umax):
+    # Not intended for use by end user
+    """
+    Procedure Name: discrete_lattice
+    Purpose: Tabulate the cumulative probabilities of a functional
+                discrete random variable over the integers in its
+                support
+    Arguments:  1. RVar: A functional discrete random variable
+                2. umax: The cumulative probability that the table
+                    must reach
+    Output:     1. A tuple (cumprob,points)
+    """
+    cache=form_cache(RVar)
+    pdf=compiled_form(RVar,'pdf')
+    lw=pdf.support[0]
+    up=pdf.support[-1]
+    if not np.isfinite(lw):
+        raise RVError('The support must have a finite lower bound')
+    # Accumulate the pdf until it reaches umax, or until more points
+    #   no longer add any probability
+    table=cache.get(('sampler','lattice'))
+    if table==None or (table[0][-1]<umax and table[1][-1]<up):
+        size=1024
+        total=-1
+        while True:
+            points=np.arange(lw,min(lw+size,up+1))
+            cumprob=np.cumsum(np.nan_to_num(pdf(points)))
+            if cumprob[-1]>=umax or cumprob[-1]<=total or \
+               points[-1]>=up:
+                break
+            total=cumprob[-1]
+            size*=2
+        table=(cumprob,points)
+        cache[('sampler','lattice')]=table
+    return table
+
 def CDF(RVar,value=x):
     """
     Procedure Name: CDF
     Purpose: Compute the cdf of a random variable
     Arguments:  1. RVar: A random variable
-                2. value: An integer or floating point number
+                2. value: An integer or floating point number, or a
+                    list or array of numbers (optional)
     Output:     1. CDF of a random variable (if value not specified)
                 2. Value of the CDF at a given point
                     (if value is specified)
+                3. An array of values of the CDF
+                    (if a list or array of values is specified)
     """
 
     # Check to make sure the value given is within the random
@@ -343,6 +1404,28 @@ def CDF(RVar,value=x):
         string='Value is not within the support of the random variable'        
         raise RVError(string)
 
+    # If a list or array of values is specified, derive the cdf once and
+    #   evaluate it at every value
+    if is_batch(value):
+        return evaluate_batch(RVar,'cdf',value)
+
+    # Compact random variables convert between forms with array
+    #   operations
+    if is_compact(RVar):
+        if value==x:
+            return compact_form(RVar,'cdf')
+        return compact_value(RVar,'cdf',value)
+
+    # If the cdf has already been derived, return the stored form
+    if value==x:
+        Form=find_form(RVar,'cdf')
+        if Form!=None:
+            return Form
+    # If a value is specified, evaluate the (stored) cdf at that value
+    if value!=x and RVar.ftype[1]!='cdf':
+        if RVar.ftype[0] in ['continuous','discrete']:
+            return CDF(CDF(RVar),value)
+
     # If the distribution is continous, find and return the distribution
     #   of the random variable
     if RVar.ftype[0]=='continuous':
@@ -358,21 +1441,14 @@ def CDF(RVar,value=x):
                         return simplify(cdfvalue)
         # If the random variable is a sf, find and return the cdf of the
         #   random variable
-        if RVar.ftype[0]=='sf':
+        if RVar.ftype[1]=='sf':
             X_dummy=SF(RVar)
             # Compute the sf for each segment
             cdflist=[]
             for i in range(len(X_dummy.func)):
                 cdflist.append(1-X_dummy.func[i])
-            # If no value is specified, return the sf function
-            if value==x:
-                return RV(cdflist,X_dummy.support,['continuous','cdf'])
-            # If not, return the value of the cdf at the specified value
-            else:
-                for i in range(len(X_dummy.support)):
-                    if value>=X_dummy.support[i] and value<=X_dummy.support[i+1]:
-                        cdfvalue=cdflist[i].subs(x,value)
-                        return simplify(cdfvalue)
+            return cache_form(RVar,RV(cdflist,X_dummy.support,
+                                      ['continuous','cdf']))
         # If the random variable is not a cdf or sf, compute the pdf of
         #   the random variable, and then compute the cdf by integrating
         #   over each segment of the random variable
@@ -396,15 +1472,9 @@ def CDF(RVar,value=x):
                     const=0-cdffunc.subs(x,X_dummy.support[i])
                     cdffunc=cdffunc+const
                 cdflist.append(cdffunc)
-            # If no value is specified, return the cdf
-            if value==x:
-                return RV(cdflist,X_dummy.support,['continuous','cdf'])
-            # If a value is specified, return the value of the cdf
-            if value!=x:
-                for i in range(len(RVar.support)):
-                    if value>=RVar.support[i] and value<=RVar.support[i+1]:
-                        cdfvalue=cdflist[i].subs(x,value)
-                        return simplify(cdfvalue)
+            # Return the cdf
+            return cache_form(RVar,RV(cdflist,X_dummy.support,
+                                      ['continuous','cdf']))
                     
     # If the distribution is discrete, find and return the cdf of
     #   the random variable
@@ -415,12 +1485,7 @@ def CDF(RVar,value=x):
             if value==x:
                 return RVar
             if value!=x:
-                for i in range(len(RVar)):
-                    if RVar.support[i]==value:
-                        return RVar.func[i]
-                    if RVar.support[i]<value:
-                        if RVar.support[i+1]>value:
-                            return RVar.func[i]
+                return discrete_value(RVar,value)
         # If the distribution is a sf, find the cdf by reversing the
         #   function list
         if RVar.ftype[1] in ['sf','chf','hf']:
@@ -429,16 +1494,7 @@ def CDF(RVar,value=x):
             for i in reversed(range(len(X_dummy.func))):
                 newfunc.append(X_dummy.func[i])
             Xsf=RV(newfunc,X_dummy.support,['discrete','cdf'])
-            if value==x:
-                return Xsf
-            if value!=x:
-                X_dummy=CDF(X_dummy)
-                for i in range(len(X_dummy.support)):
-                    if X_dummy.support[i]==value:
-                        return X_dummy.func[i]
-                    if X_dummy.support[i]<value:
-                        if X_dummy.support[i+1]>value:
-                            return X_dummy.func[i]
+            return cache_form(RVar,Xsf)
         # If the distribution is not a cdf or sf, find the pdf and
         #   then compute the cdf by summation
         else:
@@ -448,16 +1504,8 @@ def CDF(RVar,value=x):
             for i in range(len(X_dummy.support)):
                 area+=X_dummy.func[i]
                 cdffunc.append(area)
-            if value==x:
-                return RV(cdffunc,X_dummy.support,['discrete','cdf'])
-            if value!=x:
-                X_dummy=CDF(X_dummy)
-                for i in range(len(X_dummy.support)):
-                    if X_dummy.support[i]==value:
-                        return X_dummy.func[i]
-                    if X_dummy.support[i]<value:
-                        if X_dummy.support[i+1]>value:
-                            return X_dummy.func[i]
+            return cache_form(RVar,RV(cdffunc,X_dummy.support,
+                                      ['discrete','cdf']))
                 
 
 def CHF(RVar,value=x):
@@ -465,11 +1513,13 @@ def CHF(RVar,value=x):
     Procedure Name: CHF
     Purpose: Compute the chf of a random variable
     Arguments:  1. RVar: A random variable
-                2. value: An integer or floating point number
-                    (optional)
+                2. value: An integer or floating point number, or a
+                    list or array of numbers (optional)
     Output:     1. CHF of a random variable (if value not specified)
                 2. Value of the CHF at a given point
                     (if value is specified)
+                3. An array of values of the CHF
+                    (if a list or array of values is specified)
     """
     
     # Check to make sure the value given is within the random variable's support
@@ -477,6 +1527,21 @@ def CHF(RVar,value=x):
         string='Value is not within the support of the random variable'        
         raise RVError(string)
 
+    # If a list or array of values is specified, derive the chf once and
+    #   evaluate it at every value
+    if is_batch(value):
+        return evaluate_batch(RVar,'chf',value)
+
+    # If the chf has already been derived, return the stored form
+    if value==x:
+        Form=find_form(RVar,'chf')
+        if Form!=None:
+            return Form
+    # If a value is specified, evaluate the (stored) chf at that value
+    if value!=x and RVar.ftype[1]!='chf':
+        if RVar.ftype[0] in ['continuous','discrete']:
+            return CHF(CHF(RVar),value)
+
     # If the distribution is continuous, find and return the chf of
     #   the random variable
     if RVar.ftype[0]=='continuous':
@@ -503,16 +1568,9 @@ def CHF(RVar,value=x):
             for i in range(len(sflist)):
                 newfunc=-ln(sflist[i])
                 chffunc.append(simplify(newfunc))
-            # If a value is not specified, return the chf of the
-            #   random variable
-            if value==x:
-                return RV(chffunc,X_dummy.support,['continuous','chf'])
-            if value!=x:
-                for i in range(len(RVar.support)):
-                    if value>=RVar.func[i]:
-                        if value<=RVar.support[i+1]:
-                            chfvalue=chffunc[i].subs(x,value)
-                            return simplify(chfvalue)
+            # Return the chf of the random variable
+            return cache_form(RVar,RV(chffunc,X_dummy.support,
+                                      ['continuous','chf']))
                     
     # If the random variable is discrete, find and return the chf
     if RVar.ftype[0]=='discrete':
@@ -522,23 +1580,15 @@ def CHF(RVar,value=x):
             if value==x:
                 return RVar
             if value!=x:
-                if value not in RVar.support:
-                    return 0
-                else:
-                    return RVar.func[RVar.support.index(value)]
+                return discrete_value(RVar,value)
         # Otherwise, use the survivor function to find the chf
         else:
             X_sf=SF(RVar)
             chffunc=[]
             for i in range(len(X_sf.func)):
                 chffunc.append(-log(X_sf.func[i]))
-            if value==x:
-                return RV(chffunc,X_sf.support,['discrete','chf'])
-            if value!=x:
-                if value not in RVar.support:
-                    return 0
-                else:
-                    return chffunc[RVar.support.index(value)]
+            return cache_form(RVar,RV(chffunc,X_sf.support,
+                                      ['discrete','chf']))
                     
 
 def HF(RVar,value=x):
@@ -546,11 +1596,13 @@ def HF(RVar,value=x):
     Procedure Name: HF
     Purpose: Compute the hf of a random variable
     Arguments:  1. RVar: A random variable
-                2. value: An integer or floating point number
-                    (optional)
+                2. value: An integer or floating point number, or a
+                    list or array of numbers (optional)
     Output:     1. HF of a random variable (if value not specified)
                 2. Value of the HF at a given point
                     (if value is specified)
+                3. An array of values of the HF
+                    (if a list or array of values is specified)
     """
     
     # Check to make sure the value given is within the random
@@ -559,6 +1611,21 @@ def HF(RVar,value=x):
         string='Value is not within the support of the random variable'
         raise RVError(string)
 
+    # If a list or array of values is specified, derive the hf once and
+    #   evaluate it at every value
+    if is_batch(value):
+        return evaluate_batch(RVar,'hf',value)
+
+    # If the hf has already been derived, return the stored form
+    if value==x:
+        Form=find_form(RVar,'hf')
+        if Form!=None:
+            return Form
+    # If a value is specified, evaluate the (stored) hf at that value
+    if value!=x and RVar.ftype[1]!='hf':
+        if RVar.ftype[0] in ['continuous','discrete']:
+            return HF(HF(RVar),value)
+
     # If the distribution is continuous, find and return the hf of
     #   the random variable
     if RVar.ftype[0]=='continuous':
@@ -582,14 +1649,8 @@ def HF(RVar,value=x):
             for i in range(len(X_dummy.func)):
                 newfunc=diff(X_dummy.func[i],x)
                 hflist.append(newfunc)
-            if value==x:
-                return RV(hflist,X_dummy.support,['continuous','hf'])
-            if value!=x:
-                for i in range(len(RVar.support)):
-                    if value>=RVar.support[i]:
-                        if value<=RVar.support[i+1]:
-                            hfvalue=hflist[i].subs(x,value)
-                            return simplify(hfvalue)
+            return cache_form(RVar,RV(hflist,X_dummy.support,
+                                      ['continuous','hf']))
         # In all other cases, use the pdf and the sf to find the hf
         else:
             X_pdf=PDF(RVar).func
@@ -599,14 +1660,8 @@ def HF(RVar,value=x):
             for i in range(len(RVar.func)):
                 hfunc=(X_pdf[i])/(X_sf[i])
                 hflist.append(simplify(hfunc))
-            if value==x:
-                return RV(hflist,RVar.support,['continuous','hf'])
-            if value!=x:
-                for i in range(len(RVar.support)):
-                    if value>=RVar.support[i]:
-                        if value<=RVar.support[i+1]:
-                            hfvalue=hflist[i].subs(x,value)
-                            return simplify(hfvalue)
+            return cache_form(RVar,RV(hflist,RVar.support,
+                                      ['continuous','hf']))
 
     # If the random variable is discrete, find and return the hf
     if RVar.ftype[0]=='discrete':
@@ -616,10 +1671,7 @@ def HF(RVar,value=x):
             if value==x:
                 return RVar
             if value!=x:
-                if value not in RVar.support:
-                    return 0
-                else:
-                    return RVar.func[RVar.support.index(value)]
+                return discrete_value(RVar,value)
         # Otherwise, use the pdf and sf to find the hf
         else:
             X_pdf=PDF(RVar)
@@ -627,13 +1679,8 @@ def HF(RVar,value=x):
             hffunc=[]
             for i in range(len(X_pdf.func)):
                 hffunc.append(X_pdf.func[i]/X_sf.func[i])
-            if value==x:
-                return RV(hffunc,X_pdf.support,['discrete','hf'])
-            if value!=x:
-                if value not in X_pdf.support:
-                    return 0
-                else:
-                    return hffunc[X_pdf.support.index(value)]
+            return cache_form(RVar,RV(hffunc,X_pdf.support,
+                                      ['discrete','hf']))
 
 
 def IDF(RVar,value=x):
@@ -641,23 +1688,41 @@ def IDF(RVar,value=x):
     Procedure Name: IDF
     Purpose: Compute the idf of a random variable
     Arguments:  1. RVar: A random variable
-                2. value: An integer or floating point number
-                    (optional)
+                2. value: An integer or floating point number, or a
+                    list or array of numbers (optional)
     Output:     1. IDF of a random variable (if value not specified)
                 2. Value of the IDF at a given point
                     (if value is specified)
+                3. An array of values of the IDF
+                    (if a list or array of values is specified)
     """
     
     # Check to make sure the percentile given is between 0 and 1
     if check_value(value,[0,1])!=True:
         string='Value is not within the support of the random variable'
         return RVError(string)
+
+    # If a list or array of values is specified, derive the idf once and
+    #   evaluate it at every value
+    if is_batch(value):
+        return evaluate_batch(RVar,'idf',value)
+
+    # If the idf has already been derived, return the stored form
+    if value==x:
+        Form=find_form(RVar,'idf')
+        if Form!=None:
+            return Form
+    # If a value is specified, evaluate the (stored) idf at that value
+    if value!=x and RVar.ftype[1]!='idf':
+        if RVar.ftype[0] in ['continuous','discrete']:
+            return IDF(IDF(RVar),value)
+
     # If the distribution is continuous, find and return the idf
     #   of the random variable
     if RVar.ftype[0]=='continuous':
         if value==x:
             if RVar.ftype[1]=='idf':
-                return self
+                return RVar
             # Convert the random variable to its CDF form
             X_dummy=CDF(RVar)
             # Create values used to check for correct inverse
@@ -701,15 +1766,14 @@ def IDF(RVar,value=x):
                 func=idffunc[i].subs(t,x)
                 idffunc2.append(simplify(func))
             # Return the IDF
-            return RV(idffunc2,idfsup,['continuous','idf'])
+            return cache_form(RVar,RV(idffunc2,idfsup,['continuous','idf']))
                     
             
-        # If a value is specified, use the newton-raphson method to generate a random variate
+        # If a value is specified, evaluate the idf at that value
         if value!=x:
-            X_dummy=IDF(RVar)
-            for i in range(len(X_dummy.support)):
-                if value>=X_dummy.support[i] and value<=X_dummy.support[i+1]:
-                    idfvalue=X_dummy.func[i].subs(t,value)
+            for i in range(len(RVar.support)):
+                if value>=RVar.support[i] and value<=RVar.support[i+1]:
+                    idfvalue=RVar.func[i].subs(x,value)
                     return simplify(idfvalue)
             #varlist=RVar.variate(s=value)
             #return varlist[0]
@@ -722,10 +1786,7 @@ def IDF(RVar,value=x):
             if value==x:
                 return RVar
             if value!=x:
-                if value not in RVar.support:
-                    return 0
-                else:
-                    return RVar.func[RVar.support.index(value)]
+                return discrete_value(RVar,value)
         # Otherwise, find the cdf, and then invert it
         else:
             # If the distribution is a chf or hf, convert to an sf first
@@ -734,13 +1795,8 @@ def IDF(RVar,value=x):
                 X_dummy=CDF(X_dummy0)
             else:
                X_dummy=CDF(RVar)
-            if value==x:
-                return RV(X_dummy.support,X_dummy.func,['discrete','idf'])
-            if value!=x:
-                if value not in RVar.func:
-                    return 0
-                else:
-                    return RVar.support[RVar.func.index(value)]
+            return cache_form(RVar,RV(X_dummy.support,X_dummy.func,
+                                      ['discrete','idf']))
             
 
 
@@ -749,14 +1805,39 @@ def PDF(RVar,value=x):
     Procedure Name: PDF
     Purpose: Compute the pdf of a random variable
     Arguments:  1. RVar: A random variable
-                2. value: An integer or floating point number (optional)
+                2. value: An integer or floating point number, or a
+                    list or array of numbers (optional)
     Output:     1. PDF of a random variable (if value not specified)
                 2. Value of the PDF at a given point (if value is specified)
+                3. An array of values of the PDF
+                    (if a list or array of values is specified)
     """
     
     # Check to make sure the value given is within the random variable's support
     if check_value(value,RVar.support)!=True:
         raise RVError('Value is not within the support of the random variable')
+
+    # If a list or array of values is specified, derive the pdf once and
+    #   evaluate it at every value
+    if is_batch(value):
+        return evaluate_batch(RVar,'pdf',value)
+
+    # Compact random variables convert between forms with array
+    #   operations
+    if is_compact(RVar):
+        if value==x:
+            return compact_form(RVar,'pdf')
+        return compact_value(RVar,'pdf',value)
+
+    # If the pdf has already been derived, return the stored form
+    if value==x:
+        Form=find_form(RVar,'pdf')
+        if Form!=None:
+            return Form
+    # If a value is specified, evaluate the (stored) pdf at that value
+    if value!=x and RVar.ftype[1]!='pdf':
+        if RVar.ftype[0] in ['continuous','discrete']:
+            return PDF(PDF(RVar),value)
     
     # If the distribution is continuous, find and return the pdf of the random variable
     if RVar.ftype[0]=='continuous':
@@ -794,28 +1875,16 @@ def PDF(RVar,value=x):
             for i in range(len(intlist)):
                 newfunc=X_dummy.func[i]*exp(-intlist[i])
                 pdffunc.append(simplify(newfunc))
-            if value==x:
-                return RV(pdffunc,RVar.support,['continuous','pdf'])
-            if value!=x:
-                for i in range(len(X_dummy.support)):
-                    if value>=X_dummy.support[i] and value<=X_dummy.support[i+1]:
-                        pdfvalue=pdffunc[i].subs(x,value)
-                        return simplify(pdfvalue)
+            return cache_form(RVar,RV(pdffunc,RVar.support,
+                                      ['continuous','pdf']))
         # In all other cases, find the pdf by differentiating the cdf
         else:
             X_dummy=CDF(RVar)
-            if value==x:
-                pdflist=[]
-                for i in range(len(X_dummy.func)):
-                    pdflist.append(diff(X_dummy.func[i],x))
-                return RV(pdflist,RVar.support,['continuous','pdf'])
-            if value!=x:
-                for i in range(len(X_dummy.support)):
-                    for i in range(len(X_dummy.support)):
-                        if value>=X_dummy.support[i] and value<=X_dummy.support[i+1]:
-                            pdffunc=diff(X_dummy.func[i],x)
-                            pdfvalue=pdffunc.subs(x,value)
-                            return simplify(pdfvalue)
+            pdflist=[]
+            for i in range(len(X_dummy.func)):
+                pdflist.append(diff(X_dummy.func[i],x))
+            return cache_form(RVar,RV(pdflist,RVar.support,
+                                      ['continuous','pdf']))
                         
     # If the distribution is discrete, find and return the pdf of the random variable
     if RVar.ftype[0]=='discrete':
@@ -824,10 +1893,7 @@ def PDF(RVar,value=x):
             if value==x:
                 return RVar
             if value!=x:
-                if value not in RVar.support:
-                    return 0
-                else:
-                    return RVar.func[RVar.support.index(value)]  
+                return discrete_value(RVar,value)
         # Otherwise, find the cdf of the random variable, and compute the pdf
         #   by finding differences
         else:
@@ -838,28 +1904,48 @@ def PDF(RVar,value=x):
                     pdffunc.append(X_dummy.func[i])
                 else:
                     pdffunc.append(X_dummy.func[i]-X_dummy.func[i-1])
-            if value==x:
-                return RV(pdffunc,X_dummy.support,['discrete','pdf'])
-            if value!=x:
-                if value not in X_dummy.support:
-                    return 0
-                else:
-                    return pdffunc.func[X_dummy.support.index(value)]
+            return cache_form(RVar,RV(pdffunc,X_dummy.support,
+                                      ['discrete','pdf']))
 
 def SF(RVar,value=x):
     """
     Procedure Name: SF
     Purpose: Compute the SF of a random variable
     Arguments:  1. RVar: A random variable
-                2. value: An integer or floating point number (optional)
+                2. value: An integer or floating point number, or a
+                    list or array of numbers (optional)
     Output:     1. SF of a random variable (if value not specified)
                 2. Value of the SF at a given point (if value is specified)
+                3. An array of values of the SF
+                    (if a list or array of values is specified)
     """
     
     # Check to make sure the value given is within the random variable's support
     if check_value(value,RVar.support)!=True:
         raise RVError('Value is not within the support of the random variable')
 
+    # If a list or array of values is specified, derive the sf once and
+    #   evaluate it at every value
+    if is_batch(value):
+        return evaluate_batch(RVar,'sf',value)
+
+    # Compact random variables convert between forms with array
+    #   operations
+    if is_compact(RVar):
+        if value==x:
+            return compact_form(RVar,'sf')
+        return compact_value(RVar,'sf',value)
+
+    # If the sf has already been derived, return the stored form
+    if value==x:
+        Form=find_form(RVar,'sf')
+        if Form!=None:
+            return Form
+    # If a value is specified, evaluate the (stored) sf at that value
+    if value!=x and RVar.ftype[1]!='sf':
+        if RVar.ftype[0] in ['continuous','discrete']:
+            return SF(SF(RVar),value)
+
     # If the distribution is continuous, find and return the sf of the random variable
     if RVar.ftype[0]=='continuous':
         # If the distribution is already a sf, nothing needs to be done
@@ -879,14 +1965,8 @@ def SF(RVar,value=x):
             sflist=[]
             for i in range(len(X_dummy.func)):
                 sflist.append(1-X_dummy.func[i])
-            if value==x:
-                return RV(sflist,RVar.support,['continuous','sf'])
-            if value!=x:
-                return 1-CDF(RVar,value)
-                #for i in range(len(X_dummy.support)):
-                #    if value>=X_dummy.support[i] and value<=X_dummy.support[i+1]:
-                #        sfvalue=sflist[i].subs(x,value)
-                #        return simplify(sfvalue)
+            return cache_form(RVar,RV(sflist,RVar.support,
+                                      ['continuous','sf']))
 
     # If the distribution is discrete, find and return the sf of the random variable
     if RVar.ftype[0]=='discrete':
@@ -895,23 +1975,15 @@ def SF(RVar,value=x):
             if value==x:
                 return RVar
             if value!=x:
-                if value not in RVar.support:
-                    return 0
-                else:
-                    return RVar.func[RVar.support.index(value)]
+                return discrete_value(RVar,value)
         # If the distribution is a chf use exp(-chf) to find sf
         if RVar.ftype[1]=='chf':
             X_dummy=CHF(RVar)
             sffunc=[]
             for i in range(len(X_dummy.func)):
                 sffunc.append(exp(-(X_dummy.func[i])))
-            if value==x:
-                return RV(sffunc,X_dummy.support,['discrete','sf'])
-            if value!=x:
-                if value not in RVar.support:
-                    return 0
-                else:
-                    return sffunc[RVar.support.index(value)]
+            return cache_form(RVar,RV(sffunc,X_dummy.support,
+                                      ['discrete','sf']))
         # If the distribution is a hf, use bootstrap rv to find sf:
         if RVar.ftype[1]=='hf':
             X_pdf=BootstrapRV(RVar.support)
@@ -919,13 +1991,8 @@ def SF(RVar,value=x):
             sffunc=[]
             for i in range(len(RVar.func)):
                 sffunc.append(X_pdf.func[i]/X_hf.func[i])
-            if value==x:
-                return RV(sffunc,RVar.support,['discrete','sf'])
-            if value!=x:
-                if value not in RVar.support:
-                    return 0
-                else:
-                    return sffunc[RVar.support.index(value)]
+            return cache_form(RVar,RV(sffunc,RVar.support,
+                                      ['discrete','sf']))
         # Otherwise, find the cdf of the random variable, and reverse the function
         #   argument
         else:
@@ -933,42 +2000,47 @@ def SF(RVar,value=x):
             newfunc=[]
             for i in range(len(X_dummy.func)):
                 if i==0:
-                    newfunc.append(0)
+                    newfunc.append(1)
                 else:
                     newfunc.append(1-X_dummy.func[i-1])
             Xsf=RV(newfunc,X_dummy.support,['discrete','sf'])
-            if value==x:
-                return Xsf
-            if value!=x:
-                if value not in Xsf.support:
-                    return 0
-                else:
-                    return Xsf.func[Xsf.support.index(value)]
+            return cache_form(RVar,Xsf)
         
 
-def BootstrapRV(varlist):
+def BootstrapRV(varlist,compact=False):
     """
     Procedure Name: Bootstrap RV
     Purpose: Generate a discrete random variable from a list of variates
-    Arguments: 1. varlist: A list of variates
+    Arguments: 1. varlist: A list or array of variates (not modified)
+               2. compact: If True, return the array-backed CompactRV
+                    form (optional)
     Output:    1. A discrete random variable, where each element in the given variate
                     list is equally probable
     """
-    # Sort the list of variables
-    varlist.sort()
     # Find the number of elements in the list of variates
     numel=len(varlist)
-    # Use varlist to generate the function and support for the random variable
-    #   Count number of times element appears in varlist, divide by number
-    #   of elements
+    # Numeric variates are sorted and counted by NumPy
+    if np!=None:
+        data=np.asarray(varlist)
+        if data.ndim==1 and data.dtype.kind in 'iuf':
+            values,counts=np.unique(data,return_counts=True)
+            if compact==True:
+                return CompactRV(counts/numel,values,['discrete','pdf'],
+                                 exact=False)
+            return RV((counts/numel).tolist(),values.tolist(),
+                      ['discrete','pdf'])
+    # Otherwise, sort a copy of the variates and count the length of
+    #   each run of equal values
     funclist=[]
     supplist=[]
-    for i in range(len(varlist)):
-        if varlist[i] not in funclist:
-            supplist.append(varlist[i])
-            funclist.append(varlist.count(varlist[i])/numel)
+    for value,run in groupby(sorted(varlist)):
+        supplist.append(value)
+        funclist.append(sum(1 for item in run)/numel)
     # Return the result as a discrete random variable
-    return RV(funclist,supplist,['discrete','pdf'])
+    X_dummy=RV(funclist,supplist,['discrete','pdf'])
+    if compact==True:
+        return Compact(X_dummy)
+    return X_dummy
 
 def Convert(RVar,inc=1):
     """
@@ -1004,7 +2076,7 @@ def Convert(RVar,inc=1):
 Procedures on One Random Variable
 
 Procedures:
-    1. ConvolutionIID(RVar,n)
+    1. ConvolutionIID(RVar,n,tol)
     2. CoefOfVar(RVar)
     3. ExpectedValue(RVar,gX)
     4. Kurtosis(RVar)
@@ -1020,24 +2092,83 @@ Procedures:
     14. Variance(RVar)
 """
 
-def ConvolutionIID(RVar,n):
+@stored
+def ConvolutionIID(RVar,n,tol=0):
     """
     Procedure Name: ConvolutionIID
     Purpose: Compute the convolution of n iid random variables
     Arguments:  1. RVar: A random variable
                 2. n: an integer
+                3. tol: Probabilities below tol, or below the
+                    round-off of the FFT, are removed when the FFT is
+                    used for discrete random variables (optional)
     Output:     1. The convolution of n iid random variables
     """
     # Check to make sure n is an integer
     if type(n)!=int:
         raise RVError('The second argument must be an integer')
 
+    # A random variable on the integer lattice with floating point
+    #   probabilities is convolved with itself in one step, by raising
+    #   its FFT to the n-th power
+    if RVar.ftype[0]=='discrete' and n>1 and \
+       len(RVar.support)**2*(n-1)>=fft_size:
+        lattice=lattice_form(PDF(RVar),2**24//n)
+        if lattice!=None:
+            low,probs,mask=lattice
+            size=n*(len(probs)-1)+1
+            nfft=1<<(size-1).bit_length()
+            probs=np.fft.irfft(np.fft.rfft(probs,nfft)**n,nfft)[:size]
+            # The support of the sum is found by repeated squaring,
+            #   keeping only whether each point can be reached
+            total=None
+            k=n
+            while k>0:
+                if k%2==1:
+                    if total is None:
+                        total=mask
+                    else:
+                        total=fft_convolve(total,mask)>0.5
+                k//=2
+                if k>0:
+                    mask=fft_convolve(mask,mask)>0.5
+            return lattice_rv(n*low,probs,total,tol)
+
     # Compute the iid convolution
-    X_dummy=PDF(RVar)
-    for i in range(n-1):
-        X_dummy+=X_dummy
-    return X_dummy
+    return iid_power(RVar,n,lambda X,Y: Convolution(X,Y,tol),
+                     ('convolution',tol))
+
+def iid_power(RVar,n,op,name):
+    # Not intended for use by end user
+    """
+    Procedure Name: iid_power
+    Purpose: Combine n iid copies of a random variable with a binary
+                procedure, using O(log n) applications of the procedure
+    Arguments:  1. RVar: A random variable
+                2. n: A positive integer
+                3. op: A procedure of two independent random variables,
+                    such as Convolution or Product
+                4. name: A name for the results of op in the cache
+    Output:     1. The result of combining n iid copies of RVar
+    """
+    if n<1:
+        raise RVError('The second argument must be a positive integer')
+    # The result for k copies combines the results for k//2 and
+    #   k-k//2 copies, so only about 2*log2(n) results are needed.
+    #   Every result is kept with the random variable, so that later
+    #   calls for other n reuse them.
+    cache=form_cache(RVar)
+    def power(k):
+        key=('iid',name,k)
+        if key not in cache:
+            if k==1:
+                cache[key]=PDF(RVar)
+            else:
+                cache[key]=op(power(k//2),power(k-k//2))
+        return cache[key]
+    return power(n)
 
+@stored
 def CoefOfVar(RVar):
     """
     Procedure Name: CoefOfVar
@@ -1051,6 +2182,7 @@ def CoefOfVar(RVar):
     cov=(sqrt(sig))/expect
     return cov
 
+@stored
 def ExpectedValue(RVar,gX=x):
     """
     Procedure Name: ExpectedValue
@@ -1080,6 +2212,7 @@ def ExpectedValue(RVar,gX=x):
         Expect=Mean(fx_trans)
         return Expect
 
+@stored
 def Kurtosis(RVar):
     """
     Procedure Name: Kurtosis
@@ -1097,6 +2230,7 @@ def Kurtosis(RVar):
     kurt=(Term1-Term2+Term3-Term4)/(sig**4)
     return kurt
 
+@stored
 def MaximumIID(RVar,n):
     """
     Procedure Name: MaximumIID
@@ -1109,12 +2243,20 @@ def MaximumIID(RVar,n):
     if type(n)!=int:
         raise RVError('The second argument must be an integer')
 
-    # Compute the iid maximum
-    X_dummy=RVar
-    for i in range(n-2):
-        X_dummy=Maximum(X_dummy,X_dummy)
-    return X_dummy
+    if n<1:
+        raise RVError('The second argument must be a positive integer')
+
+    # The maximum of n iid random variables has cdf F(x)**n, which is
+    #   computed segment by segment from the cdf of the random variable
+    #   and returned in pdf form
+    Fx=CDF(RVar)
+    maxfunc=[sympify(f)**n for f in Fx.func]
+    if RVar.ftype[0]=='continuous':
+        return PDF(RV(maxfunc,Fx.support,['continuous','cdf']))
+    return RV(cumulative_differences(maxfunc,False),Fx.support,
+              ['discrete','pdf'])
 
+@stored
 def Mean(RVar):
     """
     Procedure Name: Mean
@@ -1137,6 +2279,10 @@ def Mean(RVar):
             meanval+=val
         return meanval
 
+    # Compact random variables sum with array operations
+    if is_compact(X_dummy):
+        return sympify(np.sum(X_dummy.func*X_dummy.support))
+
     # If the random variable is discrete, find and return the variance
     if RVar.ftype[0]=='discrete':
         # Create a list of x*f(x)
@@ -1149,6 +2295,7 @@ def Mean(RVar):
             meanval+=meanlist[i]
         return meanval
 
+@stored
 def MGF(RVar):
     """
     Procedure Name: MGF
@@ -1160,6 +2307,7 @@ def MGF(RVar):
     simplify(mgf)
     return mgf
 
+@stored
 def MinimumIID(RVar,n):
     """
     Procedure Name: MinimumIID
@@ -1172,11 +2320,34 @@ def MinimumIID(RVar,n):
     if type(n)!=int:
         raise RVError('The second argument must be an integer')
 
-    # Compute the iid minimum
-    X_dummy=RVar
-    for i in range(n-2):
-        X_dummy=Minimum(X_dummy,X_dummy)
-    return X_dummy
+    if n<1:
+        raise RVError('The second argument must be a positive integer')
+
+    # The minimum of n iid random variables has sf S(x)**n, where the
+    #   sf of a discrete random variable is P(X>=x), and is returned in
+    #   pdf form
+    Sx=SF(RVar)
+    minfunc=[sympify(f)**n for f in Sx.func]
+    if RVar.ftype[0]=='continuous':
+        return PDF(RV(minfunc,Sx.support,['continuous','sf']))
+    return RV(cumulative_differences(minfunc,True),Sx.support,
+              ['discrete','pdf'])
+
+def cumulative_differences(values,reverse):
+    # Not intended for use by end user
+    """
+    Procedure Name: cumulative_differences
+    Purpose: Convert the values of a discrete cdf (or of a discrete sf
+                in P(X>=x) form) at each support point to probabilities
+    Arguments:  1. values: The cdf or sf values
+                2. reverse: True for sf values, False for cdf values
+    Output:     1. The probability of each support point
+    """
+    if reverse==True:
+        following=values[1:]+[0]
+        return [values[i]-following[i] for i in range(len(values))]
+    previous=[0]+values[:-1]
+    return [values[i]-previous[i] for i in range(len(values))]
 
 def NextCombination(Previous,N):
     """
@@ -1257,6 +2428,7 @@ def NextPermutation(Previous):
                 Next[m]=Temp2[n+indx-m]
     return(Next)
             
+@stored
 def OrderStat(RVar,n,r,replace='w'):
     """
     Procedure Name: OrderStat
@@ -1315,37 +2487,17 @@ def OrderStat(RVar,n,r,replace='w'):
                 # If N is one, return the order stat
                 if N==1:
                     return RV(1,RVar.support,['discrete','pdf'])
-                # Add the first term
-                else:
-                    OSproblist=[]
-                    os_sum=0
-                    for w in range(n-r+1):
-                        val=(binomial(n,w)*
-                             (fx.func[0]**(n-w))*
-                             (Sx.func[1]**(w)))
-                        os_sum+=val
-                    OSproblist.append(os_sum)
-                # Add term 2 through N-1
-                for k in range(2,N):
+                # The rth order statistic is at most x when at least r
+                #   of the n draws are at most x, so its cdf at each
+                #   support point is a binomial tail of the cdf there
+                OScdflist=[]
+                for k in range(N):
+                    Fk=Fx.func[k]
                     os_sum=0
-                    for w in range(n-r+1):
-                        for u in range(r):
-                            val=(factorial(n)/
-                                 (factorial(u)*factorial(n-u-w)
-                                  *factorial(w))*
-                                 (Fx.func[k-2]**u)*
-                                 (fx.func[k-1]**(n-u-w))*
-                                 (Sx.func[k]**(w)))
-                            os_sum+=val
-                    OSproblist.append(os_sum)
-                # Add term N
-                os_sum=0
-                for u in range(r):
-                    val=(binomial(n,u)*
-                         (Fx.func[N-2]**u)*
-                         (fx.func[N-1]**(n-u)))
-                    os_sum+=val
-                OSproblist.append(os_sum)
+                    for j in range(r,n+1):
+                        os_sum+=binomial(n,j)*(Fk**j)*((1-Fk)**(n-j))
+                    OScdflist.append(simplify(os_sum))
+                OSproblist=cumulative_differences(OScdflist,False)
                 return RV(OSproblist,RVar.support,['discrete','pdf'])
 
         if replace=='wo':
@@ -1430,6 +2582,7 @@ def OrderStat(RVar,n,r,replace='w'):
                         # Find the next lexicographical combination
                         combo=NextCombination(combo,N)
 
+@stored
 def ProductIID(RVar,n):
     """
     Procedure Name: ProductIID
@@ -1442,12 +2595,10 @@ def ProductIID(RVar,n):
     if type(n)!=int:
         raise RVError('The second argument must be an integer')
 
-    # Compute the iid convolution
-    X_dummy=PDF(RVar)
-    for i in range(n-1):
-        X_dummy*=X_dummy
-    return X_dummy
+    # Compute the iid product
+    return iid_power(RVar,n,Product,'product')
 
+@stored
 def Skewness(RVar):
     """
     Procedure Name: Skewness
@@ -1465,6 +2616,7 @@ def Skewness(RVar):
     return skew
                             
 
+@stored
 def Transform(RVar,gXt):
     """
     Procedure Name: Transform
@@ -1603,34 +2755,24 @@ def Transform(RVar,gXt):
     if RVar.ftype[0]=='discrete':
         gX=gXt
         trans_sup=[]
+        trans_func=[]
         # Find the portion of the transformation each element
         #   in the random variable applies to, and then transform it
+        #   (a point on the boundary of two segments uses the first)
         for i in range(len(X_dummy.support)):
             for j in range(len(gX[1])-1):
                 if X_dummy.support[i]>=gX[1][j]:
                     if X_dummy.support[i]<=gX[1][j+1]:
                         trans_sup.append(gX[0][j].subs(x,X_dummy.support[i]))
-        # Sort the function and support lists for the convolution
-        sortlist=zip(trans_sup,X_dummy.func)
-        sortlist.sort()
-        translist=[]
-        funclist=[]
-        for i in range(len(sortlist)):
-            translist.append(sortlist[i][0])
-            funclist.append(sortlist[i][1])
-        # Combine redundant elements in the list
-        translist2=[]
-        funclist2=[]
-        for i in range(len(translist)):
-            if translist[i] not in translist2:
-                translist2.append(translist[i])
-                funclist2.append(funclist[i])
-            elif translist[i] in translist2:
-                idx=translist2.index(translist[i])
-                funclist2[idx]+=funclist[i]
+                        trans_func.append(X_dummy.func[i])
+                        break
+        # Sort the transformed values, and combine the probabilities
+        #   of equal values
+        translist,funclist=aggregate(trans_sup,trans_func)
         # Return the transformed random variable
-        return RV(funclist2,translist2,['discrete','pdf'])
+        return RV(funclist,translist,['discrete','pdf'])
 
+@stored
 def Truncate(RVar,supp):
     """
     Procedure Name: Truncate
@@ -1697,6 +2839,7 @@ def Truncate(RVar,supp):
         return RV(truncfunc,truncsupp,['discrete','pdf'])     
 
 
+@stored
 def Variance(RVar):
     """
     Procedure Name: Variance
@@ -1724,6 +2867,12 @@ def Variance(RVar):
         var=exxval-(EX**2)
         return var
 
+    # Compact random variables sum with array operations
+    if is_compact(X_dummy):
+        EX=np.sum(X_dummy.func*X_dummy.support)
+        EXX=np.sum(X_dummy.func*X_dummy.support*X_dummy.support)
+        return sympify(EXX-EX**2)
+
     # If the random variable is discrete, find and return the variance
     if RVar.ftype[0]=='discrete':
         # Find the mean of the random variable
@@ -1752,13 +2901,17 @@ Procedures:
     5. Product(RVar1,RVar2)
 """
                     
-def Convolution(RVar1,RVar2):
+@stored
+def Convolution(RVar1,RVar2,tol=0):
     """
     Procedure Name: Convolution
     Purpose: Compute the convolution of two independent
                 random variables
     Arguments:  1. RVar1: A random variable
                 2. RVar2: A random variable
+                3. tol: Probabilities below tol, or below the
+                    round-off of the FFT, are removed when the FFT is
+                    used for discrete random variables (optional)
     Output:     1. The convolution of RVar1 and RVar2        
     """
     # If the two random variables are not both continuous or
@@ -1775,7 +2928,7 @@ def Convolution(RVar1,RVar2):
     if RVar1.ftype[0]=='continuous':
         # If the two distributions are both lifetime distributions, treat
         #   as a special case
-        if RVar1.support==[0,oo] and RVar2.support==[0,oo]:
+        if list(RVar1.support)==[0,oo] and list(RVar2.support)==[0,oo]:
             func1=X1_dummy.func[0]
             func2=X2_dummy.func[0].subs(x,z-x)
             conv=integrate(func1*func2,(x,0,z))
@@ -1797,37 +2950,251 @@ def Convolution(RVar1,RVar2):
     # If the distributions are discrete, find and return the convolution
     #   of the two random variables.
     if RVar1.ftype[0]=='discrete':
+        # Compact random variables are combined with array operations
+        if is_compact(RVar1) or is_compact(RVar2):
+            return compact_combine(RVar1,RVar2,np.add)
         # Convert each random variable to its pdf form
         X1_dummy=PDF(RVar1)
         X2_dummy=PDF(RVar2)
-        # Create function and support lists for the convolution of the
-        #   two random variables
-        convlist=[]
-        funclist=[]
-        for i in range(len(X1_dummy.support)):
-            for j in range(len(X2_dummy.support)):
-                convlist.append(X1_dummy.support[i]+X2_dummy.support[j])
-                funclist.append(X1_dummy.func[i]*X2_dummy.func[j])
-        # Sort the function and support lists for the convolution
-        sortlist=zip(convlist,funclist)
-        sortlist.sort()
-        convlist2=[]
-        funclist2=[]
-        for i in range(len(sortlist)):
-            convlist2.append(sortlist[i][0])
-            funclist2.append(sortlist[i][1])
-        # Remove redundant elements in the support list
-        convlist3=[]
-        funclist3=[]
-        for i in range(len(convlist2)):
-            if convlist2[i] not in convlist3:
-                convlist3.append(convlist2[i])
-                funclist3.append(funclist2[i])
-            else:
-                funclist3[convlist3.index(convlist2[i])]+=funclist2[i]
+        # Random variables on the integer lattice with floating point
+        #   probabilities are convolved with the FFT
+        pairs=len(X1_dummy.support)*len(X2_dummy.support)
+        if pairs>=fft_size:
+            lattice1=lattice_form(X1_dummy,16*pairs)
+            lattice2=lattice_form(X2_dummy,16*pairs)
+            if lattice1!=None and lattice2!=None:
+                low=lattice1[0]+lattice2[0]
+                probs=fft_convolve(lattice1[1],lattice2[1])
+                mask=fft_convolve(lattice1[2],lattice2[2])>0.5
+                return lattice_rv(low,probs,mask,tol)
+        # Generate the sums of the support values in ascending order
+        #   with the moving heap method, combining the probabilities
+        #   of equal sums as they are generated
+        convlist,funclist=heap_merge(X1_dummy.support,X1_dummy.func,
+                                     X2_dummy.support,X2_dummy.func,
+                                     operator.add)
         # Create and return the new random variable
-        return RV(funclist3,convlist3,['discrete','pdf'])
+        return RV(funclist,convlist,['discrete','pdf'])
 
+def heap_merge(supp1,func1,supp2,func2,op):
+    # Not intended for use by end user
+    """
+    Procedure Name: heap_merge
+    Purpose: Generate the values op(supp1[i],supp2[j]) in ascending
+                order, and sum the probabilities func1[i]*func2[j] of
+                equal values, using a heap that holds one active item
+                for each support value of the shorter list (the moving
+                heap method of APPL)
+    Arguments:  1. supp1: A list of support values
+                2. func1: The probabilities of supp1
+                3. supp2: A list of support values
+                4. func2: The probabilities of supp2
+                5. op: A commutative operation that is nondecreasing in
+                    each argument over the supports
+    Output:     1. The distinct values in ascending order
+                2. The probability of each value
+    """
+    # Sort both supports, and keep the active items in the rows of the
+    #   shorter one
+    if len(supp1)>len(supp2):
+        supp1,func1,supp2,func2=supp2,func2,supp1,func1
+    # Carry out the arithmetic with Python numbers where possible, and
+    #   convert only the distinct results back to SymPy
+    keys1,keys2,supp_back=python_supports(supp1,supp2)
+    prob1,prob2,prob_back=python_probabilities(func1,func2)
+    rows=sorted(zip(keys1,range(len(supp1))))
+    cols=sorted(zip(keys2,range(len(supp2))))
+    n=len(cols)
+    # The heap is ordered by the key of each item. Exact keys are
+    #   equal exactly when the values are, so the values are only
+    #   computed once for each distinct key.
+    heap=[(op(rows[i][0],cols[0][0]),i,0) for i in range(len(rows))]
+    heapq.heapify(heap)
+    supp=[]
+    func=[]
+    keys=[]
+    last=None
+    start=0
+    while len(heap)>0:
+        key,i,j=heap[0]
+        a=rows[i][1]
+        b=cols[j][1]
+        prob=prob1[a]*prob2[b]
+        if supp_back!=None:
+            if key==last:
+                func[-1]+=prob
+            else:
+                supp.append(key)
+                func.append(prob)
+                last=key
+        else:
+            # Floating point keys of equal values may differ by
+            #   round-off, so the exact value is compared with the
+            #   values whose keys are within round-off of this one
+            value=op(supp1[a],supp2[b])
+            while start<len(keys) and \
+                  key-keys[start]>1e-12*max(abs(key),1):
+                start+=1
+            for k in range(start,len(supp)):
+                if supp[k]==value:
+                    func[k]+=prob
+                    break
+            else:
+                supp.append(value)
+                func.append(prob)
+                keys.append(key)
+        # Move the active item of the row one column to the right
+        if j+1<n:
+            heapq.heapreplace(heap,(op(rows[i][0],cols[j+1][0]),i,j+1))
+        else:
+            heapq.heappop(heap)
+    if supp_back!=None:
+        supp=[supp_back(s) for s in supp]
+    if prob_back!=None:
+        func=[prob_back(f) for f in func]
+    return supp,func
+
+def python_supports(supp1,supp2):
+    # Not intended for use by end user
+    """
+    Procedure Name: python_supports
+    Purpose: Convert two lists of support values to Python numbers
+    Arguments:  1. supp1: A list of support values
+                2. supp2: A list of support values
+    Output:     1. Python integers, fractions or floats for supp1
+                2. Python integers, fractions or floats for supp2
+                3. A procedure that converts a result back to SymPy,
+                    or None if the results must be computed from the
+                    original values (the first two outputs are then
+                    floats used only for ordering)
+    """
+    values=[sympify(s) for s in list(supp1)+list(supp2)]
+    if all([s.is_Integer for s in values]):
+        return [int(s) for s in supp1],[int(s) for s in supp2],Integer
+    # Rational values are kept exact, since the floating point sums of
+    #   equal values can differ
+    if all([s.is_Rational for s in values]):
+        keys=[Fraction(int(s.p),int(s.q)) for s in values]
+        back=lambda f: Rational(f.numerator,f.denominator)
+        return keys[:len(supp1)],keys[len(supp1):],back
+    return [float(s) for s in supp1],[float(s) for s in supp2],None
+
+def python_probabilities(func1,func2):
+    # Not intended for use by end user
+    """
+    Procedure Name: python_probabilities
+    Purpose: Convert two lists of probabilities to Python numbers whose
+                products and sums are exact
+    Arguments:  1. func1: A list of probabilities
+                2. func2: A list of probabilities
+    Output:     1. The converted probabilities of func1
+                2. The converted probabilities of func2
+                3. A procedure that converts a sum of products back to
+                    SymPy, or None if no conversion was made
+    """
+    values1=[sympify(f) for f in func1]
+    values2=[sympify(f) for f in func2]
+    values=values1+values2
+    # Rational probabilities become integers over a common denominator
+    if all([f.is_Rational for f in values]):
+        scale1=reduce(ilcm,[f.q for f in values1],1)
+        scale2=reduce(ilcm,[f.q for f in values2],1)
+        prob1=[f.p*(scale1//f.q) for f in values1]
+        prob2=[f.p*(scale2//f.q) for f in values2]
+        return prob1,prob2,lambda v: Rational(v,scale1*scale2)
+    if all([f.is_Number for f in values]):
+        return [float(f) for f in values1],[float(f) for f in values2],\
+               Float
+    return values1,values2,None
+
+# Discrete convolutions that combine at least this many pairs of
+#   support points use the FFT when they can
+fft_size=1024
+
+# The FFT leaves round-off errors, some of them negative, of about this
+#   fraction of the largest probability at every lattice point
+fft_roundoff=1e-13
+
+def lattice_form(RVar,maxspan):
+    # Not intended for use by end user
+    """
+    Procedure Name: lattice_form
+    Purpose: Find the integer lattice form of a discrete random
+                variable with floating point probabilities
+    Arguments:  1. RVar: A discrete random variable in pdf form
+                2. maxspan: The largest number of lattice points
+    Output:     1. The smallest support point
+                2. An array of the probabilities of the integers from
+                    the smallest to the largest support point
+                3. An array that is 1 at the support points, and 0
+                    elsewhere
+                    (or None if the random variable does not qualify)
+    """
+    if np==None:
+        return None
+    supp=[sympify(s) for s in RVar.support]
+    func=[sympify(f) for f in RVar.func]
+    if not all([s.is_Integer for s in supp]):
+        return None
+    # Exact arithmetic is kept unless its result would be floating
+    #   point in any case
+    if not all([f.is_Number for f in func]) or \
+       not any([f.is_Float for f in func]):
+        return None
+    low=int(supp[0])
+    if int(supp[-1])-low+1>maxspan:
+        return None
+    index=np.array([int(s)-low for s in supp])
+    probs=np.zeros(index[-1]+1)
+    np.add.at(probs,index,[float(f) for f in func])
+    mask=np.zeros(index[-1]+1)
+    mask[index]=1
+    return low,probs,mask
+
+def fft_convolve(a,b):
+    # Not intended for use by end user
+    """
+    Procedure Name: fft_convolve
+    Purpose: Convolve two arrays with the FFT
+    Arguments:  1. a: An array
+                2. b: An array
+    Output:     1. The array of length len(a)+len(b)-1 whose k-th
+                    entry is the sum of a[i]*b[k-i]
+    """
+    size=len(a)+len(b)-1
+    nfft=1<<(size-1).bit_length()
+    result=np.fft.irfft(np.fft.rfft(a,nfft)*np.fft.rfft(b,nfft),nfft)
+    return result[:size]
+
+def lattice_rv(low,probs,mask,tol):
+    # Not intended for use by end user
+    """
+    Procedure Name: lattice_rv
+    Purpose: Create a discrete random variable from its integer lattice
+                form
+    Arguments:  1. low: The smallest lattice point
+                2. probs: The probabilities of the lattice points
+                3. mask: An array that is true (or 1) at the support
+                    points
+                4. tol: Probabilities below tol are removed
+    Output:     1. A discrete random variable in pdf form
+    """
+    # Only the probabilities above the round-off of the FFT, judged
+    #   relative to the largest probability, can be told apart from
+    #   zero
+    support=mask>0.5
+    floor=max(tol,fft_roundoff*probs[support].max())
+    index=np.nonzero(support&(probs>floor))[0]
+    if len(index)==0:
+        raise RVError('The tolerance removes every point of the support')
+    # The points that are removed hold no more than the round-off, so
+    #   the rest are rescaled to keep the total probability
+    kept=probs[index]*(probs[support].sum()/probs[index].sum())
+    supp=[Integer(low+int(k)) for k in index]
+    func=[Float(float(p)) for p in kept]
+    return RV(func,supp,['discrete','pdf'])
+
+@stored
 def Maximum(RVar1,RVar2):
     """
     Procedure Name: Maximum
@@ -1845,7 +3212,7 @@ def Maximum(RVar1,RVar2):
     # If the distributions are continuous, find and return the max
     if RVar1.ftype[0]=='continuous':
         # Special case for lifetime distributions
-        if RVar1.support==[0,oo] and RVar2.support==[0,oo]:
+        if list(RVar1.support)==[0,oo] and list(RVar2.support)==[0,oo]:
             cdf_dummy1=CDF(RVar1)
             cdf_dummy2=CDF(RVar2)
             cdf1=cdf_dummy1.func[0]
@@ -1896,41 +3263,20 @@ def Maximum(RVar1,RVar2):
         # Convert X and Y to their PDF representations
         fx=PDF(RVar1)
         fy=PDF(RVar2)
-        # Make a list of possible combinations of X and Y
-        combo_list=[]
-        for i in range(len(fx.support)):
-            for j in range(len(fy.support)):
-                combo_list.append([fx.support[i],fy.support[j]])
-        # Find the probability of obtaining each combination
-        prob_list=[]
-        for i in range(len(combo_list)):
-            val=PDF(fx,combo_list[i][0])*PDF(fy,combo_list[j][0])
-            prob_list.append(val)
-        # Find the min value for each combo
-        max_list=[]
-        for i in range(len(combo_list)):
-            max_list.append(max(combo_list[i][0],combo_list[i][1]))
-        # Compute the probability for each possible min
-        max_supp=[]
-        max_func=[]
-        for i in range(len(max_list)):
-            if max_list[i] not in max_supp:
-                max_supp.append(max_list[i])
-                max_func.append(prob_list[i])
-            else:
-                indx=max_supp.index(max_list[i])
-                max_func[indx]+=prob_list[i]
-        # Sort the elements of the rv
-        zip_list=zip(max_supp,max_func)
-        zip_list.sort()
-        max_supp=[]
-        max_func=[]
-        for i in range(len(zip_list)):
-            max_supp.append(zip_list[i][0])
-            max_func.append(zip_list[i][1])
-        # Return the minimum random variable
-        return RV(max_func,max_supp,['discrete','pdf'])
+        # P(max(X,Y)<=v)=Fx(v)*Fy(v) at each point of the merged
+        #   support, which starts at the larger of the two smallest
+        #   support points
+        probx,proby,prob_back=python_probabilities(fx.func,fy.func)
+        points,Fx,Fy,first,last=merged_cdfs(fx.support,probx,
+                                            fy.support,proby)
+        max_cdf=[Fx[k]*Fy[k] for k in range(first,len(points))]
+        max_func=cumulative_differences(max_cdf,False)
+        if prob_back!=None:
+            max_func=[prob_back(f) for f in max_func]
+        # Return the maximum random variable
+        return RV(max_func,points[first:],['discrete','pdf'])
 
+@stored
 def Minimum(RVar1,RVar2):
     """
     Procedure Name: Minimum
@@ -1948,7 +3294,7 @@ def Minimum(RVar1,RVar2):
     # If the distributions are continuous, find and return the min
     if RVar1.ftype[0]=='continuous':
         # Special case for lifetime distributions
-        if RVar1.support==[0,oo] and RVar2.support==[0,oo]:
+        if list(RVar1.support)==[0,oo] and list(RVar2.support)==[0,oo]:
             sf_dummy1=SF(RVar1)
             sf_dummy2=SF(RVar2)
             sf1=sf_dummy1.func[0]
@@ -1999,41 +3345,93 @@ def Minimum(RVar1,RVar2):
         # Convert X and Y to their PDF representations
         fx=PDF(RVar1)
         fy=PDF(RVar2)
-        # Make a list of possible combinations of X and Y
-        combo_list=[]
-        for i in range(len(fx.support)):
-            for j in range(len(fy.support)):
-                combo_list.append([fx.support[i],fy.support[j]])
-        # Find the probability of obtaining each combination
-        prob_list=[]
-        for i in range(len(combo_list)):
-            val=PDF(fx,combo_list[i][0])*PDF(fy,combo_list[j][0])
-            prob_list.append(val)
-        # Find the min value for each combo
-        min_list=[]
-        for i in range(len(combo_list)):
-            min_list.append(min(combo_list[i][0],combo_list[i][1]))
-        # Compute the probability for each possible min
-        min_supp=[]
-        min_func=[]
-        for i in range(len(min_list)):
-            if min_list[i] not in min_supp:
-                min_supp.append(min_list[i])
-                min_func.append(prob_list[i])
-            else:
-                indx=min_supp.index(min_list[i])
-                min_func[indx]+=prob_list[i]
-        # Sort the elements of the rv
-        zip_list=zip(min_supp,min_func)
-        zip_list.sort()
-        min_supp=[]
-        min_func=[]
-        for i in range(len(zip_list)):
-            min_supp.append(zip_list[i][0])
-            min_func.append(zip_list[i][1])
+        # P(min(X,Y)>v)=(1-Fx(v))*(1-Fy(v)) at each point of the
+        #   merged support, which ends at the smaller of the two
+        #   largest support points
+        probx,proby,prob_back=python_probabilities(fx.func,fy.func)
+        points,Fx,Fy,first,last=merged_cdfs(fx.support,probx,
+                                            fy.support,proby)
+        totalx=Fx[-1]
+        totaly=Fy[-1]
+        min_sf=[(totalx-Fx[k])*(totaly-Fy[k]) for k in range(last+1)]
+        previous=[totalx*totaly]+min_sf[:-1]
+        min_func=[previous[k]-min_sf[k] for k in range(last+1)]
+        if prob_back!=None:
+            min_func=[prob_back(f) for f in min_func]
         # Return the minimum random variable
-        return RV(min_func,min_supp,['discrete','pdf'])
+        return RV(min_func,points[:last+1],['discrete','pdf'])
+
+def merged_cdfs(suppx,funcx,suppy,funcy):
+    # Not intended for use by end user
+    """
+    Procedure Name: merged_cdfs
+    Purpose: Evaluate the cdfs of two discrete random variables at
+                every point of their merged support
+    Arguments:  1. suppx: The support of the first random variable
+                2. funcx: Its probabilities
+                3. suppy: The support of the second random variable
+                4. funcy: Its probabilities
+    Output:     1. The merged support in ascending order
+                2. The cdf of the first random variable at each point
+                3. The cdf of the second random variable at each point
+                4. The index of the first point that is not below
+                    either support
+                5. The index of the last point that is not above
+                    either support
+    """
+    keysx=[float(s) for s in suppx]
+    keysy=[float(s) for s in suppy]
+    n=len(keysx)
+    m=len(keysy)
+    points=[]
+    Fx=[]
+    Fy=[]
+    cumx=0
+    cumy=0
+    i=0
+    j=0
+    first=None
+    last=None
+    while i<n or j<m:
+        # The last point below the end of both supports
+        if i<n and j<m:
+            last=len(points)
+        # Distinct exact values may round to the same float, so equal
+        #   keys are compared exactly
+        if j==m:
+            side=-1
+        elif i==n:
+            side=1
+        elif keysx[i]!=keysy[j]:
+            side=cmp(keysx[i],keysy[j])
+        elif suppx[i]==suppy[j]:
+            side=0
+        elif suppx[i]<suppy[j]:
+            side=-1
+        else:
+            side=1
+        if side<0:
+            points.append(suppx[i])
+            cumx+=funcx[i]
+            i+=1
+        elif side>0:
+            points.append(suppy[j])
+            cumy+=funcy[j]
+            j+=1
+        else:
+            points.append(suppx[i])
+            cumx+=funcx[i]
+            cumy+=funcy[j]
+            i+=1
+            j+=1
+        Fx.append(cumx)
+        Fy.append(cumy)
+        # The first point at or above the start of both supports
+        if first==None and i>0 and j>0:
+            first=len(points)-1
+    return points,Fx,Fy,first,last
 
+@stored
 def Mixture(MixParameters,MixRVs):
     """
     Procedure Name: Mixture
@@ -2098,30 +3496,31 @@ def Mixture(MixParameters,MixRVs):
     # If the distributions are discrete, find and return the
     #   mixture pdf
     if Mixfx[0].ftype[0]=='discrete':
-        # Compute the mixture rv by summing over the weights
-        MixSupp=[]
-        fxnew=[]
+        # Compact random variables are mixed with array operations,
+        #   unless some of them hold exact values
+        if any([is_compact(X) for X in Mixfx]):
+            Mixcompact=[Compact(X) for X in Mixfx]
+            if any([X.exact for X in Mixcompact]):
+                Mixlist=[Uncompact(X) for X in Mixcompact]
+                return Compact(Mixture(MixParameters,Mixlist),exact=True)
+            values=np.concatenate([X.support for X in Mixcompact])
+            probs=np.concatenate([float(MixParameters[i])*
+                                  Mixcompact[i].func
+                                  for i in range(len(Mixcompact))])
+            supp,func=compact_aggregate(values,probs)
+            return CompactRV(func,supp,['discrete','pdf'],False)
+        # Compute the mixture rv by weighting each pdf, and merging the
+        #   (sorted) supports of the mix rvs
+        parts=[]
         for i in range(len(Mixfx)):
-            for j in range(len(Mixfx[i].support)):
-                if Mixfx[i].support[j] not in MixSupp:
-                    MixSupp.append(Mixfx[i].support[j])
-                    fxnew.append(Mixfx[i].func[j]*MixParameters[i])
-                else:
-                    indx=MixSupp.index(Mixfx[i].support[j])
-                    val=Mixfx[i].func[j]*MixParameters[i]
-                    fxnew[indx]+=val
-        # Sort the values
-        zip_list=zip(MixSupp,fxnew)
-        zip_list.sort()
-        fxnew=[]
-        MixSupp=[]
-        for i in range(len(zip_list)):
-            fxnew.append(zip_list[i][1])
-            MixSupp.append(zip_list[i][0])
+            weighted=[f*MixParameters[i] for f in Mixfx[i].func]
+            parts.append((Mixfx[i].support,weighted))
+        MixSupp,fxnew=merge_sorted(parts)
         return RV(fxnew,MixSupp,['discrete','pdf'])
         
 
 
+@stored
 def Product(RVar1,RVar2):
     """
     Procedure Name: Product
@@ -2438,36 +3837,129 @@ def Product(RVar1,RVar2):
     # If the distributions are discrete, find and return the product
     #   of the two random variables.
     if RVar1.ftype[0]=='discrete':
+        # Compact random variables are combined with array operations
+        if is_compact(RVar1) or is_compact(RVar2):
+            return compact_combine(RVar1,RVar2,np.multiply)
         # Convert each random variable to its pdf form
         X1_dummy=PDF(RVar1)
         X2_dummy=PDF(RVar2)
-        # Create function and support lists for the product of the
-        #   two random variables
-        prodlist=[]
-        funclist=[]
-        for i in range(len(X1_dummy.support)):
-            for j in range(len(X2_dummy.support)):
-                prodlist.append(X1_dummy.support[i]*X2_dummy.support[j])
-                funclist.append(X1_dummy.func[i]*X2_dummy.func[j])
-        # Sort the function and support lists for the convolution
-        sortlist=zip(prodlist,funclist)
-        sortlist.sort()
-        prodlist2=[]
-        funclist2=[]
-        for i in range(len(sortlist)):
-            prodlist2.append(sortlist[i][0])
-            funclist2.append(sortlist[i][1])
-        # Remove redundant elements in the support list
-        prodlist3=[]
-        funclist3=[]
-        for i in range(len(prodlist2)):
-            if prodlist2[i] not in prodlist3:
-                prodlist3.append(prodlist2[i])
-                funclist3.append(funclist2[i])
+        # Split each support into the magnitudes of its negative
+        #   points, the probability of zero, and its positive points
+        neg1,zero1,pos1=sign_split(X1_dummy)
+        neg2,zero2,pos2=sign_split(X2_dummy)
+        # Within each sign quadrant the magnitude of a product grows
+        #   with the magnitudes of its factors, so the moving heap
+        #   method generates the products of each quadrant in order
+        parts=[]
+        parts.append(heap_merge(neg1[0],neg1[1],neg2[0],neg2[1],
+                                operator.mul))
+        parts.append(heap_merge(pos1[0],pos1[1],pos2[0],pos2[1],
+                                operator.mul))
+        # Products of points with opposite signs are negative, so the
+        #   order of their magnitudes is reversed
+        for (sa,fa),(sb,fb) in [(neg1,pos2),(pos1,neg2)]:
+            supp,func=heap_merge(sa,fa,sb,fb,operator.mul)
+            supp.reverse()
+            func.reverse()
+            parts.append(([-s for s in supp],func))
+        # Every product with a zero factor is zero
+        if zero1!=None or zero2!=None:
+            prob1=sum(X1_dummy.func)
+            prob2=sum(X2_dummy.func)
+            if zero1==None:
+                pzero=prob1*zero2
+            elif zero2==None:
+                pzero=zero1*prob2
             else:
-                funclist3[prodlist3.index(prodlist2[i])]+=funclist2[i]
+                pzero=zero1*prob2+prob1*zero2-zero1*zero2
+            parts.append(([S.Zero],[pzero]))
+        prodlist,funclist=merge_sorted(parts)
         # Create and return the new random variable
-        return RV(funclist3,prodlist3,['discrete','pdf'])
+        return RV(funclist,prodlist,['discrete','pdf'])
+
+def sign_split(RVar):
+    # Not intended for use by end user
+    """
+    Procedure Name: sign_split
+    Purpose: Split a discrete random variable by the sign of its
+                support points
+    Arguments:  1. RVar: A discrete random variable in pdf form
+    Output:     1. The magnitudes of the negative support points and
+                    their probabilities
+                2. The probability of zero, or None if zero is not a
+                    support point
+                3. The positive support points and their probabilities
+    """
+    neg=([],[])
+    pos=([],[])
+    zero=None
+    for i in range(len(RVar.support)):
+        value=RVar.support[i]
+        if value<0:
+            neg[0].append(-value)
+            neg[1].append(RVar.func[i])
+        elif value>0:
+            pos[0].append(value)
+            pos[1].append(RVar.func[i])
+        elif zero==None:
+            zero=RVar.func[i]
+        else:
+            zero+=RVar.func[i]
+    return neg,zero,pos
+
+def aggregate(supp,func):
+    # Not intended for use by end user
+    """
+    Procedure Name: aggregate
+    Purpose: Sort a list of support values, and sum the probabilities
+                of equal values
+    Arguments:  1. supp: A list of support values in any order
+                2. func: The probability of each value
+    Output:     1. The distinct values in ascending order
+                2. The probability of each value
+    """
+    keys=[float(s) for s in supp]
+    order=sorted(range(len(supp)),key=keys.__getitem__)
+    return merge_sorted([([supp[i] for i in order],
+                          [func[i] for i in order])])
+
+def merge_sorted(parts):
+    # Not intended for use by end user
+    """
+    Procedure Name: merge_sorted
+    Purpose: Merge lists of support values in ascending order, and sum
+                the probabilities of equal values
+    Arguments:  1. parts: A list of (support,probabilities) pairs,
+                    each with its support in ascending order
+    Output:     1. The distinct values in ascending order
+                2. The probability of each value
+    """
+    # The part and position of each value break ties between equal
+    #   keys, so that the heap never compares the exact values
+    streams=[]
+    for p in range(len(parts)):
+        supp,func=parts[p]
+        streams.append([(float(supp[i]),p,i,supp[i],func[i])
+                        for i in range(len(supp))])
+    supp=[]
+    func=[]
+    last=None
+    start=0
+    for key,p,i,value,prob in heapq.merge(*streams):
+        if key!=last:
+            start=len(supp)
+            last=key
+        # Distinct exact values may round to the same float, so the
+        #   values with equal keys are merged and ordered exactly
+        for j in range(start,len(supp)+1):
+            if j==len(supp) or supp[j]>value:
+                supp.insert(j,value)
+                func.insert(j,prob)
+                break
+            if supp[j]==value:
+                func[j]+=prob
+                break
+    return supp,func
 
 """
 Utilities
@@ -2475,6 +3967,7 @@ Utilities
 Procedures:
     1. PlotDist(RVar,suplist)
     2. PlotDisplay(plot_list,suplist)
+    3. PairedComparison(RVlist,n,seed,uniforms,scramble,antithetic)
 """
 
 def PlotDist(RVar,suplist=None,opt=None):
@@ -2570,3 +4063,47 @@ def PlotDisplay(plot_list,suplist=None):
         PlotDist(plot_list[i],suplist,'display')
         
     
+
+def PairedComparison(RVlist,n,seed=None,uniforms='pseudo',scramble=False,
+                     antithetic=False):
+    """
+    Procedure Name: PairedComparison
+    Purpose: Compare the means of several random variables by
+                simulation with common random numbers, so that every
+                random variable is driven by the same uniforms
+    Arguments:  1. RVlist: A list of random variables
+                2. n: The number of variates from each random variable
+                3. seed: A seed, as accepted by RV.sample (optional)
+                4. uniforms: The uniforms, as accepted by RV.sample
+                    (optional)
+                5. scramble: Scramble quasi-random uniforms (optional)
+                6. antithetic: Use antithetic pairs of uniforms
+                    (optional)
+    Output:     1. A dictionary whose key (i,j) gives the estimated
+                    mean of RVlist[i]-RVlist[j] and its standard error
+    """
+    if np==None:
+        raise ImportError('Paired comparisons require numpy')
+    if len(RVlist)<2:
+        raise RVError('At least two random variables must be compared')
+    if antithetic==True and n%2!=0:
+        raise RVError('Antithetic comparisons require an even n')
+    # Draw the uniforms once, and invert them for every random
+    #   variable. The cdf is always inverted (and never sampled with
+    #   a NumPy generator or an alias table), since only a monotone
+    #   transformation of common uniforms correlates the variates.
+    source=UniformSource(uniforms,make_rng(seed),1,scramble,antithetic)
+    u=source.draw(n)
+    samples=[]
+    for RVar in RVlist:
+        samples.append(inverse_transform(RVar,u,'newton'))
+    results={}
+    for i in range(len(RVlist)):
+        for j in range(i+1,len(RVlist)):
+            diff=samples[i]-samples[j]
+            # An antithetic pair is one observation of its average
+            if antithetic==True:
+                diff=(diff[0::2]+diff[1::2])/2
+            stderr=diff.std(ddof=1)/np.sqrt(len(diff))
+            results[(i,j)]=(float(diff.mean()),float(stderr))
+    return results
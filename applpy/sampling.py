@@ -0,0 +1,994 @@
+######################################################################
+# ApplPy Software 2012 Matthew Robinson, Matthew Jackiewicz          #
+# Version 0.5, last updated 18 October 2026                          #
+######################################################################
+
+"""
+Sampling Module
+
+Defines the numeric routines used to generate random variates from
+    compiled functional forms. Every routine works on whole NumPy
+    arrays of uniform random numbers at once.
+
+"""
+
+from __future__ import division
+import hashlib
+import math
+import os
+try:
+    import numpy as np
+except ImportError:
+    np=None
+
+"""
+Random Number Streams
+
+Procedures:
+    1. SpawnStreams(n,seed)
+"""
+
+def SpawnStreams(n,seed=None):
+    """
+    Procedure Name: SpawnStreams
+    Purpose: Create independent random number streams, one for each
+                worker in a parallel simulation
+    Arguments:  1. n: The number of streams
+                2. seed: An integer seed (optional, fresh entropy from
+                    the operating system if omitted)
+    Output:     1. A list of n NumPy generators; the same seed always
+                    gives the same streams
+    """
+    return [make_rng(child) for child in spawn_seeds(n,seed)]
+
+def spawn_seeds(n,seed=None):
+    # Not intended for use by end user
+    """
+    Procedure Name: spawn_seeds
+    Purpose: Derive the seeds of n independent random number streams
+                from a single seed
+    Arguments:  1. n: The number of streams
+                2. seed: An integer seed (optional)
+    Output:     1. A list of n picklable seeds, to be passed to
+                    make_rng in each worker process
+    """
+    if np==None:
+        raise ImportError('Random number streams require numpy')
+    # Use numpy's own seed sequences when they are available
+    if hasattr(np.random,'SeedSequence'):
+        return np.random.SeedSequence(seed).spawn(n)
+    # Otherwise, hash the seed together with the index of each stream,
+    #   which (like a seed sequence) gives well separated states for
+    #   neighbouring seeds and indices
+    if seed==None:
+        seed=int(os.urandom(16).encode('hex'),16)
+    seeds=[]
+    for i in range(n):
+        digest=hashlib.sha256('%d|%d'%(seed,i)).digest()
+        seeds.append(np.frombuffer(digest,dtype=np.uint32).copy())
+    return seeds
+
+def make_rng(seed=None):
+    # Not intended for use by end user
+    """
+    Procedure Name: make_rng
+    Purpose: Create the random number generator used by a sampler
+    Arguments:  1. seed: None (the global NumPy state), an integer
+                    seed, a seed from spawn_seeds, or an existing
+                    RandomState or Generator
+    Output:     1. An object with the NumPy random distribution methods
+    """
+    if np==None:
+        raise ImportError('Vectorized sampling requires numpy')
+    # (seed may be an array, so it cannot be compared with ==)
+    if seed is None:
+        return np.random
+    if hasattr(seed,'random_sample') or hasattr(seed,'bit_generator'):
+        return seed
+    if hasattr(np.random,'default_rng'):
+        return np.random.default_rng(seed)
+    return np.random.RandomState(seed)
+
+def draw_uniforms(rng,n):
+    # Not intended for use by end user
+    """
+    Procedure Name: draw_uniforms
+    Purpose: Draw n uniform random numbers on [0,1) from a generator
+    Arguments:  1. rng: A generator returned by make_rng
+                2. n: The number of random numbers
+    Output:     1. An array of n random numbers
+    """
+    # RandomState calls the method random_sample, and Generator calls
+    #   it random
+    if hasattr(rng,'random_sample'):
+        return rng.random_sample(n)
+    return rng.random(n)
+
+def draw_indices(rng,n,shape):
+    # Not intended for use by end user
+    """
+    Procedure Name: draw_indices
+    Purpose: Draw uniform random indices 0,...,n-1 from a generator
+    Arguments:  1. rng: A generator returned by make_rng
+                2. n: The number of items to choose from
+                3. shape: The shape of the array of indices
+    Output:     1. An integer array of indices
+    """
+    # RandomState calls the method randint, and Generator calls it
+    #   integers
+    if hasattr(rng,'randint'):
+        return rng.randint(0,n,size=shape)
+    return rng.integers(0,n,size=shape)
+
+"""
+Inversion Procedures
+
+Procedures:
+    1. cdf_window(cdf,lower,upper)
+    2. cdf_grid(cdf,lower,upper,size)
+    3. invert_cdf(cdf,pdf,grid,u,tol,maxiter)
+    4. invert_discrete(cumprob,points,u)
+"""
+
+def cdf_window(cdf,lower,upper,eps=1e-14):
+    # Not intended for use by end user
+    """
+    Procedure Name: cdf_window
+    Purpose: Find a finite interval that holds all but eps of the
+                probability of a continuous distribution
+    Arguments:  1. cdf: A compiled cdf
+                2. lower: The lower end of the support (may be -inf)
+                3. upper: The upper end of the support (may be inf)
+                4. eps: The probability allowed outside of each end
+    Output:     1. The finite interval [a,b]
+    """
+    # Start from a finite end point of the support, if there is one
+    if np.isfinite(lower):
+        ref=lower
+    elif np.isfinite(upper):
+        ref=upper
+    else:
+        ref=0.0
+    # Double the distance from the reference point until the tail
+    #   probability beyond it is negligible
+    a=lower
+    if not np.isfinite(a):
+        step=1.0
+        a=min(ref,upper)-step
+        while cdf(a)>eps and step<1e300:
+            step*=2
+            a=min(ref,upper)-step
+    b=upper
+    if not np.isfinite(b):
+        step=1.0
+        b=max(ref,lower)+step
+        while cdf(b)<1-eps and step<1e300:
+            step*=2
+            b=max(ref,lower)+step
+    # A cdf that never approaches 0 or 1 cannot be inverted
+    if (not np.isfinite(lower) and not cdf(a)<=eps) or \
+       (not np.isfinite(upper) and not cdf(b)>=1-eps):
+        raise ValueError('The cdf does not approach 0 and 1 in the tails')
+    return a,b
+
+def cdf_grid(cdf,lower,upper,size=1025):
+    # Not intended for use by end user
+    """
+    Procedure Name: cdf_grid
+    Purpose: Tabulate a compiled cdf on a grid of points, used to
+                bracket and start the inversion of the cdf
+    Arguments:  1. cdf: A compiled cdf
+                2. lower: The lower end of the support
+                3. upper: The upper end of the support
+                4. size: The number of grid points
+    Output:     1. A tuple (xs,Fs,lower,upper) of grid points, cdf
+                    values and support end points
+    """
+    a,b=cdf_window(cdf,lower,upper)
+    xs=np.linspace(a,b,size)
+    Fs=np.maximum.accumulate(np.nan_to_num(cdf(xs)))
+    return (xs,Fs,lower,upper)
+
+def invert_cdf(cdf,pdf,grid,u,tol=1e-9,maxiter=50):
+    # Not intended for use by end user
+    """
+    Procedure Name: invert_cdf
+    Purpose: Solve cdf(x)=u for an array of u values using Newton's
+                method, safeguarded by bisection
+    Arguments:  1. cdf: A compiled cdf
+                2. pdf: A compiled pdf
+                3. grid: A grid produced by cdf_grid
+                4. u: An array of values in [0,1]
+                5. tol: The relative size of the last Newton step (the
+                    error after that step is roughly its square)
+                6. maxiter: The maximum number of iterations
+    Output:     1. An array of variates
+    """
+    xs,Fs,lower,upper=grid
+    u=np.asarray(u,dtype=float).reshape(-1)
+    # Bracket each root between two grid points, using the support end
+    #   points for values of u that fall outside of the grid
+    k=np.searchsorted(Fs,u,side='left')
+    ends=np.concatenate([[lower],xs,[upper]])
+    lo=ends[k]
+    hi=ends[k+1]
+    # Start from linear interpolation of the tabulated cdf
+    xa=np.interp(u,Fs,xs)
+    ua=u
+    result=np.empty(len(u))
+    active=np.arange(len(u))
+    for it in range(maxiter):
+        with np.errstate(all='ignore'):
+            F=cdf(xa)-ua
+            xn=xa-F/pdf(xa)
+        # Shrink the bracket around the root
+        below=F<0
+        lo=np.where(below,xa,lo)
+        hi=np.where(below,hi,xa)
+        # Bisect whenever the Newton step leaves the bracket (or the pdf
+        #   vanishes), expanding outward when the bracket is unbounded
+        bad=np.nonzero(~((xn>lo)&(xn<hi)))[0]
+        if len(bad)>0:
+            lb=lo[bad]
+            hb=hi[bad]
+            with np.errstate(all='ignore'):
+                xn[bad]=np.where(np.isinf(lb),hb-2*np.abs(hb)-1,
+                                 np.where(np.isinf(hb),lb+2*np.abs(lb)+1,
+                                          (lb+hb)/2))
+        # A value of u that the cdf takes exactly is already solved,
+        #   even where it lies on the end of its bracket
+        xn=np.where(F==0,xa,xn)
+        done=(np.abs(xn-xa)<=tol*(1+np.abs(xa)))|(F==0)|(lo==hi)
+        if it==maxiter-1 or done.all():
+            result[active]=xn
+            break
+        if done.any():
+            result[active[done]]=xn[done]
+            keep=~done
+            active=active[keep]
+            xn=xn[keep]
+            ua=ua[keep]
+            lo=lo[keep]
+            hi=hi[keep]
+        xa=xn
+    return result
+
+def invert_discrete(cumprob,points,u):
+    # Not intended for use by end user
+    """
+    Procedure Name: invert_discrete
+    Purpose: Apply the inverse transformation to an array of uniform
+                random numbers for a discrete distribution
+    Arguments:  1. cumprob: The cumulative probabilities at each point
+                2. points: The support points
+                3. u: An array of values in [0,1]
+    Output:     1. An array of variates
+    """
+    idx=np.searchsorted(cumprob,u,side='left')
+    return points[np.clip(idx,0,len(points)-1)]
+
+"""
+Distribution Functions
+
+Procedures:
+    1. normal_cdf(z)
+    2. normal_idf(u)
+    3. normal_erfc(z)
+    4. incomplete_beta(a,b,z,w)
+    5. incomplete_gamma(a,z,upper)
+"""
+
+def normal_cdf(z):
+    # Not intended for use by end user
+    """
+    Procedure Name: normal_cdf
+    Purpose: Evaluate the standard normal cdf
+    Arguments:  1. z: A number or array of numbers
+    Output:     1. P(Z<=z)
+    """
+    # erfc keeps its relative accuracy in the lower tail
+    p=normal_erfc(-np.asarray(z,dtype=float)/math.sqrt(2))/2
+    if p.ndim==0:
+        return float(p)
+    return p
+
+# The coefficients of the rational approximations to the standard
+#   normal idf in the centre (a/b) and in the tails (c/d) of Acklam's
+#   algorithm, highest power first, and the probability that
+#   separates the tails from the centre
+normal_coefs={'a':[-3.969683028665376e+01,2.209460984245205e+02,
+                   -2.759285104469687e+02,1.383577518672690e+02,
+                   -3.066479806614716e+01,2.506628277459239e+00],
+              'b':[-5.447609879822406e+01,1.615858368580409e+02,
+                   -1.556989798598866e+02,6.680131188771972e+01,
+                   -1.328068155288572e+01,1.0],
+              'c':[-7.784894002430293e-03,-3.223964580411365e-01,
+                   -2.400758277161838e+00,-2.549732539343734e+00,
+                   4.374664141464968e+00,2.938163982698783e+00],
+              'd':[7.784695709041462e-03,3.224671290700398e-01,
+                   2.445134137142996e+00,3.754408661907416e+00,1.0]}
+normal_tail=0.02425
+
+def normal_idf(u):
+    # Not intended for use by end user
+    """
+    Procedure Name: normal_idf
+    Purpose: Evaluate the standard normal idf
+    Arguments:  1. u: A number or array of numbers between 0 and 1
+    Output:     1. The value z with P(Z<=z)=u
+    """
+    p=np.asarray(u,dtype=float)
+    c=normal_coefs
+    # The upper half is found from the lower half by symmetry, which
+    #   avoids the cancellation in 1-p near 1
+    sign=np.where(p>0.5,-1.0,1.0)
+    low=np.minimum(p,1-p)
+    # The rational approximations have a relative error below 1.2e-9
+    with np.errstate(all='ignore'):
+        q=low-0.5
+        r=q*q
+        z=q*np.polyval(c['a'],r)/np.polyval(c['b'],r)
+        t=np.sqrt(-2*np.log(low))
+        z=np.where(low<normal_tail,
+                   np.polyval(c['c'],t)/np.polyval(c['d'],t),z)
+        # One step of Halley's method brings the error down to the
+        #   accuracy of erfc
+        err=normal_erfc(-z/math.sqrt(2))/2-low
+        step=err*math.sqrt(2*math.pi)*np.exp(z*z/2)
+        z=z-step/(1+z*step/2)
+    z=sign*np.where(low==0,-np.inf,z)
+    if z.ndim==0:
+        return float(z)
+    return z
+
+def normal_erfc(z):
+    # Not intended for use by end user
+    """
+    Procedure Name: normal_erfc
+    Purpose: Evaluate the complementary error function
+    Arguments:  1. z: An array of numbers
+    Output:     1. An array of erfc(z)
+    """
+    return np.vectorize(math.erfc,otypes=[float])(z)
+
+def incomplete_beta(a,b,z,w=None,eps=1e-15,maxiter=300):
+    # Not intended for use by end user
+    """
+    Procedure Name: incomplete_beta
+    Purpose: Evaluate the regularized incomplete beta function with a
+                continued fraction
+    Arguments:  1. a: A positive number
+                2. b: A positive number
+                3. z: An array of numbers in [0,1]
+                4. w: The array 1-z, if it is known more accurately
+                    than by subtraction (optional)
+                5. eps: The relative accuracy of the continued fraction
+                6. maxiter: The maximum number of terms
+    Output:     1. An array of I_z(a,b)
+    """
+    z=np.asarray(z,dtype=float)
+    if w is None:
+        w=1-z
+    w=np.asarray(w,dtype=float)
+    # The continued fraction converges quickly for z<(a+1)/(a+b+2),
+    #   and I_z(a,b)=1-I_(1-z)(b,a) gives the rest
+    swap=z>(a+1)/(a+b+2)
+    p=np.where(swap,b,a)
+    q=np.where(swap,a,b)
+    s=np.where(swap,w,z)
+    r=np.where(swap,z,w)
+    lbeta=math.lgamma(a)+math.lgamma(b)-math.lgamma(a+b)
+    tiny=1e-300
+    # Modified Lentz's method, for every value at once
+    with np.errstate(all='ignore'):
+        c=np.ones(s.shape)
+        d=1-(p+q)*s/(p+1)
+        d=1/np.where(np.abs(d)<tiny,tiny,d)
+        h=d
+        for m in range(1,maxiter+1):
+            for coef in [m*(q-m)*s/((p+2*m-1)*(p+2*m)),
+                         -(p+m)*(p+q+m)*s/((p+2*m)*(p+2*m+1))]:
+                d=1+coef*d
+                d=1/np.where(np.abs(d)<tiny,tiny,d)
+                c=1+coef/c
+                c=np.where(np.abs(c)<tiny,tiny,c)
+                h=h*d*c
+            if (np.abs(d*c-1)<=eps).all():
+                break
+        front=np.exp(p*np.log(s)+q*np.log(r)-lbeta)/p
+        value=np.where(s>0,front*h,0.0)
+    value=np.where(swap,1-value,value)
+    if value.ndim==0:
+        return float(value)
+    return value
+
+def incomplete_gamma(a,z,upper=False,eps=1e-15,maxiter=500):
+    # Not intended for use by end user
+    """
+    Procedure Name: incomplete_gamma
+    Purpose: Evaluate the regularized incomplete gamma functions with a
+                series and a continued fraction
+    Arguments:  1. a: A positive number
+                2. z: An array of nonnegative numbers
+                3. upper: If True, return the upper function Q(a,z)
+                    rather than the lower function P(a,z) (optional)
+                4. eps: The relative accuracy of the series and of the
+                    continued fraction
+                5. maxiter: The maximum number of terms
+    Output:     1. An array of P(a,z), or of Q(a,z)=1-P(a,z)
+    """
+    z=np.asarray(z,dtype=float)
+    tiny=1e-300
+    with np.errstate(all='ignore'):
+        front=np.exp(a*np.log(z)-z-math.lgamma(a))
+        # The series for P converges quickly for z<a+1
+        term=np.ones(z.shape)/a
+        total=term
+        for n in range(1,maxiter+1):
+            term=term*z/(a+n)
+            total=total+term
+            if (np.abs(term)<=eps*np.abs(total)).all():
+                break
+        lower=front*total
+        # The continued fraction for Q (by the modified Lentz's method)
+        #   converges quickly for z>=a+1
+        b=z+1-a
+        c=np.ones(z.shape)/tiny
+        d=1/np.where(np.abs(b)<tiny,tiny,b)
+        h=d
+        for n in range(1,maxiter+1):
+            coef=-n*(n-a)
+            b=b+2
+            d=coef*d+b
+            d=1/np.where(np.abs(d)<tiny,tiny,d)
+            c=b+coef/c
+            c=np.where(np.abs(c)<tiny,tiny,c)
+            h=h*d*c
+            if (np.abs(d*c-1)<=eps).all():
+                break
+        upper_value=front*h
+    series=z<a+1
+    if upper==True:
+        value=np.where(series,1-lower,upper_value)
+        value=np.where(z>0,np.where(np.isinf(z),0.0,value),1.0)
+    else:
+        value=np.where(series,lower,1-upper_value)
+        value=np.where(z>0,np.where(np.isinf(z),1.0,value),0.0)
+    if value.ndim==0:
+        return float(value)
+    return value
+
+"""
+Quantile Tables
+
+Classes:
+    1. QuantileTable(cdf,pdf,grid,tol,maxnodes)
+"""
+
+class QuantileTable:
+    """
+    QuantileTable Class
+    Defines a tabulated idf of a continuous distribution, interpolated
+        with monotone cubic Hermite polynomials. The table is refined
+        until |cdf(idf(u))-u|<=tol between its nodes, and holds only
+        NumPy arrays, so that it can be pickled and stored.
+    """
+
+    def __init__(self,cdf,pdf,grid,tol=1e-10,maxnodes=2**20):
+        """
+        Builds the table from a compiled cdf and pdf
+            grid is produced by cdf_grid
+        """
+        xs,Fs,lower,upper=grid
+        self.tol=tol
+        self.lower=lower
+        self.upper=upper
+        # Infinite tails are cut off where they hold less than tol of
+        #   the probability
+        a,b=cdf_window(cdf,lower,upper,eps=tol/2)
+        xs=np.linspace(a,b,len(xs))
+        for it in range(64):
+            Fs=np.nan_to_num(cdf(xs))
+            self.fit(xs,Fs,pdf(xs))
+            # Check the interpolation error at three points inside each
+            #   interval, and halve the intervals that are too coarse
+            err=0
+            for frac in [0.25,0.5,0.75]:
+                uchk=self.u[:-1]+frac*np.diff(self.u)
+                with np.errstate(all='ignore'):
+                    err=np.maximum(err,np.abs(cdf(self(uchk))-uchk))
+            bad=np.nonzero(~(err<=tol))[0]
+            if len(bad)==0 or len(xs)+len(bad)>maxnodes:
+                break
+            xnew=(self.x[bad]+self.x[bad+1])/2
+            xs=np.union1d(xs,xnew)
+
+    def fit(self,xs,Fs,fs):
+        """
+        Fits the interpolating polynomials to tabulated values of the
+            cdf (Fs) and pdf (fs) at the points xs
+        """
+        # Where the cdf is flat, keep only the two ends of the flat
+        #   stretch; the idf jumps between them
+        rises=np.diff(Fs)>0
+        keep=np.concatenate([[True],rises])|np.concatenate([rises,[True]])
+        u=Fs[keep]
+        x=xs[keep]
+        # The slope of the idf is 1/pdf, limited to three times the
+        #   smaller adjacent secant slope so the interpolant is monotone.
+        #   Where the pdf vanishes, the smaller secant slope is used.
+        with np.errstate(all='ignore'):
+            secant=np.diff(x)/np.diff(u)
+            slope=1/np.asarray(fs,dtype=float)[keep]
+        least=np.concatenate([[secant[0]],np.minimum(secant[:-1],
+                                                      secant[1:]),
+                              [secant[-1]]])
+        slope=np.where(np.isfinite(slope)&(slope>=0),slope,least)
+        self.u=u
+        self.x=x
+        self.m=np.minimum(slope,3*least)
+
+    def covers(self,u):
+        """
+        Returns a mask of the u values within the range of the table
+        """
+        return (u>=self.u[0])&(u<=self.u[-1])
+
+    def __call__(self,u):
+        """
+        Evaluates the tabulated idf at an array of u values
+        """
+        u=np.asarray(u,dtype=float)
+        k=np.clip(np.searchsorted(self.u,u,side='right')-1,0,
+                  len(self.u)-2)
+        u0=self.u[k]
+        h=self.u[k+1]-u0
+        with np.errstate(all='ignore'):
+            s=np.where(h>0,np.clip((u-u0)/h,0,1),0)
+        s2=s*s
+        s3=s2*s
+        # Cubic Hermite basis functions
+        return ((2*s3-3*s2+1)*self.x[k]+(s3-2*s2+s)*h*self.m[k]+
+                (-2*s3+3*s2)*self.x[k+1]+(s3-s2)*h*self.m[k+1])
+
+"""
+Alias Tables
+
+Classes:
+    1. AliasTable(points,probs)
+"""
+
+class AliasTable:
+    """
+    AliasTable Class
+    Defines a Walker alias table for a discrete distribution, built
+        with Vose's method. Each variate needs a single table lookup.
+    """
+
+    def __init__(self,points,probs):
+        """
+        Builds the table for the given support points and
+            probabilities
+        """
+        probs=np.asarray(probs,dtype=float)
+        n=len(probs)
+        scaled=(probs*n/probs.sum()).tolist()
+        prob=[1.0]*n
+        alias=range(n)
+        small=[i for i in range(n) if scaled[i]<1]
+        large=[i for i in range(n) if scaled[i]>=1]
+        # Pair each column that is less than full with a column that
+        #   has probability to spare
+        while len(small)>0 and len(large)>0:
+            s=small.pop()
+            l=large[-1]
+            prob[s]=scaled[s]
+            alias[s]=l
+            scaled[l]=scaled[l]+scaled[s]-1
+            if scaled[l]<1:
+                small.append(large.pop())
+        # Any columns that remain are full, up to rounding error
+        self.points=np.asarray(points)
+        self.prob=np.array(prob)
+        self.alias=np.array(alias)
+
+    def __call__(self,u):
+        """
+        Draws one variate for each value in an array of uniform random
+            numbers, using the integer part of u*n to pick a column and
+            the fractional part to choose between the column and its
+            alias
+        """
+        n=len(self.prob)
+        u=np.asarray(u,dtype=float)
+        shape=u.shape
+        u=u.reshape(-1)
+        result=np.empty(u.shape,dtype=self.points.dtype)
+        # Work through the array in blocks that stay in the processor
+        #   cache
+        for i in range(0,len(u),65536):
+            v=u[i:i+65536]*n
+            col=np.minimum(v.astype(np.intp),n-1)
+            v-=col
+            pick=np.where(v<self.prob.take(col),col,self.alias.take(col))
+            result[i:i+65536]=self.points.take(pick)
+        return result.reshape(shape)
+
+"""
+Parallel Sampling
+
+Procedures:
+    1. build_sampler(spec)
+    2. parallel_sample(spec,n,processes,seed)
+"""
+
+# The number of variates drawn from each random number stream. It is
+#   fixed, so the variates depend only on the seed, and not on the
+#   number of processes.
+chunk_size=2**20
+
+# The sampler and output array of a worker process
+worker_state={}
+
+def compile_spec(spec):
+    # Not intended for use by end user
+    """
+    Procedure Name: compile_spec
+    Purpose: Compile a functional form sent to a worker process
+    Arguments:  1. spec: A tuple (funclist,support,ftype), with each
+                    function given by its srepr string
+    Output:     1. A CompiledForm instance
+    """
+    from compiled import CompiledForm
+    from sympy import sympify
+    return CompiledForm([sympify(func) for func in spec[0]],spec[1],
+                        spec[2])
+
+def build_sampler(spec):
+    # Not intended for use by end user
+    """
+    Procedure Name: build_sampler
+    Purpose: Build a sampling function from a picklable description
+                of a sampler
+    Arguments:  1. spec: A tuple whose first item names the sampler
+                    ('native','idf','compiled','newton','table',
+                    'alias' or 'discrete')
+    Output:     1. A function of a generator and a number n, that
+                    returns an array of n variates
+    """
+    kind=spec[0]
+    # Named distributions are rebuilt from their class and parameters
+    if kind=='native':
+        X=spec[1](*spec[2])
+        return lambda rng,n: X.native_sample(rng,n)
+    if kind=='idf':
+        X=spec[1](*spec[2])
+        return lambda rng,n: X.native_idf(draw_uniforms(rng,n))
+    # Other random variables are rebuilt from their functional forms
+    #   or from their tables
+    if kind=='compiled':
+        idf=compile_spec(spec[1])
+        return lambda rng,n: idf(draw_uniforms(rng,n))
+    if kind in ['newton','table']:
+        cdf=compile_spec(spec[1])
+        pdf=compile_spec(spec[2])
+        grid=spec[3]
+        if kind=='newton':
+            return lambda rng,n: invert_cdf(cdf,pdf,grid,
+                                            draw_uniforms(rng,n))
+        table=spec[4]
+        def draw(rng,n):
+            u=draw_uniforms(rng,n)
+            result=table(u)
+            tails=np.nonzero(~table.covers(u))[0]
+            if len(tails)>0:
+                result[tails]=invert_cdf(cdf,pdf,grid,u[tails])
+            return result
+        return draw
+    if kind=='alias':
+        return lambda rng,n: spec[1](draw_uniforms(rng,n))
+    if kind=='discrete':
+        return lambda rng,n: invert_discrete(spec[1],spec[2],
+                                             draw_uniforms(rng,n))
+    raise ValueError('Unknown sampler %s'%(kind))
+
+def init_worker(spec,shared):
+    # Not intended for use by end user
+    """
+    Procedure Name: init_worker
+    Purpose: Prepare a worker process, compiling its sampler once
+    Arguments:  1. spec: A sampler description for build_sampler
+                2. shared: The shared array that receives the variates
+    Output:     None
+    """
+    worker_state['sampler']=build_sampler(spec)
+    worker_state['output']=np.frombuffer(shared,dtype=float)
+
+def sample_chunk(task):
+    # Not intended for use by end user
+    """
+    Procedure Name: sample_chunk
+    Purpose: Draw one chunk of variates in a worker process, writing
+                them into the shared array
+    Arguments:  1. task: A tuple (seed,start,count)
+    Output:     1. The number of variates drawn
+    """
+    seed,start,count=task
+    rng=make_rng(seed)
+    worker_state['output'][start:start+count]=\
+        worker_state['sampler'](rng,count)
+    return count
+
+def parallel_sample(spec,n,processes=None,seed=None):
+    # Not intended for use by end user
+    """
+    Procedure Name: parallel_sample
+    Purpose: Draw n variates with a pool of worker processes
+    Arguments:  1. spec: A sampler description for build_sampler
+                2. n: The number of variates
+                3. processes: The number of worker processes (optional,
+                    defaults to the number of processors)
+                4. seed: An integer seed (optional)
+    Output:     1. An array of n variates, held in shared memory
+    """
+    from multiprocessing import Pool,RawArray,cpu_count
+    if processes==None:
+        processes=cpu_count()
+    nchunks=max(-(-n//chunk_size),1)
+    seeds=spawn_seeds(nchunks,seed)
+    tasks=[(seeds[i],i*chunk_size,min(chunk_size,n-i*chunk_size))
+           for i in range(nchunks)]
+    shared=RawArray('d',max(n,1))
+    # Small requests are drawn in this process, from the same streams
+    if processes<=1 or nchunks==1:
+        init_worker(spec,shared)
+        for task in tasks:
+            sample_chunk(task)
+        worker_state.clear()
+    else:
+        pool=Pool(min(processes,nchunks),initializer=init_worker,
+                  initargs=(spec,shared))
+        try:
+            for count in pool.imap_unordered(sample_chunk,tasks):
+                pass
+        finally:
+            pool.close()
+            pool.join()
+    return np.frombuffer(shared,dtype=float)[:n]
+
+"""
+Uniform Sources
+
+Procedures:
+    1. UniformPoints(n,dim,kind,scramble,seed)
+"""
+
+# Primitive polynomials (degree s, interior coefficients a) and initial
+#   direction numbers m for dimensions 2,3,... of the Sobol sequence,
+#   from the tables of S. Joe and F. Y. Kuo
+sobol_table=[(1,0,[1]),(2,1,[1,3]),(3,1,[1,3,1]),(3,2,[1,1,1]),
+             (4,1,[1,1,3,3]),(4,4,[1,3,5,13]),(5,2,[1,1,5,5,17]),
+             (5,4,[1,1,5,5,5]),(5,7,[1,1,7,11,19]),
+             (5,11,[1,1,5,1,1]),(5,13,[1,1,1,3,11]),
+             (5,14,[1,3,5,5,31]),(6,1,[1,3,3,9,7,49]),
+             (6,13,[1,1,1,15,21,21]),(6,16,[1,3,1,13,27,49]),
+             (6,19,[1,1,1,15,7,5]),(6,22,[1,3,1,15,13,25]),
+             (6,25,[1,1,5,5,19,61]),(7,1,[1,3,7,11,23,15,103]),
+             (7,4,[1,3,7,13,13,15,69])]
+
+# The first primes, used as the bases of the Halton sequence
+halton_bases=[2,3,5,7,11,13,17,19,23,29,31,37,41,43,47,53,59,61,67,71,
+              73]
+
+def UniformPoints(n,dim=1,kind='sobol',scramble=False,seed=None):
+    """
+    Procedure Name: UniformPoints
+    Purpose: Generate points that are uniformly distributed on the unit
+                hypercube, for use as caller-supplied uniforms
+    Arguments:  1. n: The number of points
+                2. dim: The dimension of each point (optional)
+                3. kind: 'pseudo', 'sobol', 'halton' or 'lhs' (Latin
+                    hypercube) (optional, defaults to 'sobol')
+                4. scramble: If True, randomly scramble the sobol or
+                    halton points (optional)
+                5. seed: A seed, as accepted by RV.sample (optional)
+    Output:     1. An array of n points (n by dim if dim>1)
+    """
+    return UniformSource(kind,make_rng(seed),dim,scramble).draw(n)
+
+def sobol_directions(dim):
+    # Not intended for use by end user
+    """
+    Procedure Name: sobol_directions
+    Purpose: Compute the 32 direction numbers of one dimension of the
+                Sobol sequence
+    Arguments:  1. dim: The dimension (0 for the first)
+    Output:     1. A list of 32 integers
+    """
+    if dim==0:
+        return [1<<(31-k) for k in range(32)]
+    s,a,m=sobol_table[dim-1]
+    V=[m[k]<<(31-k) for k in range(s)]
+    for k in range(s,32):
+        v=V[k-s]^(V[k-s]>>s)
+        for i in range(1,s):
+            if (a>>(s-1-i))&1:
+                v^=V[k-i]
+        V.append(v)
+    return V
+
+def scramble_directions(V,rng):
+    # Not intended for use by end user
+    """
+    Procedure Name: scramble_directions
+    Purpose: Apply a random lower triangular binary matrix (with a unit
+                diagonal) to the direction numbers of the Sobol
+                sequence, as in Matousek's linear scrambling
+    Arguments:  1. V: A list of 32 direction numbers
+                2. rng: A generator returned by make_rng
+    Output:     1. The scrambled direction numbers
+    """
+    bits=draw_uniforms(rng,32*32).reshape(32,32)<0.5
+    # Row r of the matrix gives bit r (counted from the most
+    #   significant) of each scrambled number
+    rows=[]
+    for r in range(32):
+        row=1<<(31-r)
+        for c in range(r):
+            if bits[r,c]:
+                row|=1<<(31-c)
+        rows.append(row)
+    scrambled=[]
+    for v in V:
+        w=0
+        for r in range(32):
+            if bin(rows[r]&v).count('1')%2==1:
+                w|=1<<(31-r)
+        scrambled.append(w)
+    return scrambled
+
+class UniformSource:
+    """
+    UniformSource Class
+    Defines a source of uniform random numbers for inverse transform
+        sampling: pseudo-random numbers, the Sobol or Halton sequences
+        (optionally scrambled), Latin hypercube samples, or an array
+        supplied by the caller. Successive draws continue the same
+        sequence.
+    """
+
+    def __init__(self,kind,rng,dim=1,scramble=False,antithetic=False):
+        """
+        Creates a source of dim-dimensional uniform points
+            If antithetic=True, every point u is followed by 1-u
+        """
+        # The caller may supply the uniforms themselves
+        if not isinstance(kind,str):
+            self.points=np.asarray(kind,dtype=float).reshape(-1,dim)
+            if not ((self.points>0)&(self.points<1)).all():
+                raise ValueError('The uniforms must lie strictly '+
+                                 'between 0 and 1')
+            kind='array'
+        elif kind not in ['pseudo','sobol','halton','lhs']:
+            raise ValueError('The uniforms must be pseudo, sobol, '+
+                             'halton, lhs or an array')
+        if kind=='sobol' and dim>len(sobol_table)+1:
+            raise ValueError('The Sobol sequence is available in at '+
+                             'most %d dimensions'%(len(sobol_table)+1))
+        if kind=='halton' and dim>len(halton_bases):
+            raise ValueError('The Halton sequence is available in at '+
+                             'most %d dimensions'%(len(halton_bases)))
+        self.kind=kind
+        self.rng=rng
+        self.dim=dim
+        self.index=0
+        self.scramble=scramble
+        self.antithetic=antithetic
+        if kind=='sobol':
+            self.directions=[]
+            self.shifts=[]
+            for d in range(dim):
+                V=sobol_directions(d)
+                shift=0
+                # Scrambling combines a random linear scramble with a
+                #   random digital shift
+                if scramble==True:
+                    V=scramble_directions(V,rng)
+                    shift=int(draw_uniforms(rng,1)[0]*2**32)
+                self.directions.append(np.array(V,dtype=np.uint64))
+                self.shifts.append(shift)
+        if kind=='halton':
+            self.perms=[]
+            for d in range(dim):
+                b=halton_bases[d]
+                ndigits=int(np.ceil(53*np.log(2)/np.log(b)))
+                # Scrambling permutes the digits at each position
+                if scramble==True:
+                    perms=[np.argsort(draw_uniforms(rng,b))
+                           for k in range(ndigits)]
+                else:
+                    perms=[np.arange(b) for k in range(ndigits)]
+                self.perms.append(perms)
+
+    def draw(self,n):
+        """
+        Returns the next n points of the source
+        """
+        if self.antithetic!=True:
+            points=self.draw_points(n)
+        else:
+            # Pair each point with its reflection, so that the pairs of
+            #   variates from a monotone transformation are negatively
+            #   correlated
+            base=self.draw_points((n+1)//2)
+            points=np.empty((2*len(base),self.dim))
+            points[0::2]=base
+            points[1::2]=1-base
+            points=points[:n]
+        if self.dim==1:
+            return points[:,0]
+        return points
+
+    def draw_points(self,n):
+        """
+        Returns the next n points of the underlying sequence, as an n
+            by dim array
+        """
+        if self.kind=='array':
+            if self.index+n>len(self.points):
+                raise ValueError('Not enough uniforms were supplied')
+            points=self.points[self.index:self.index+n]
+            self.index+=n
+        elif self.kind=='pseudo':
+            points=draw_uniforms(self.rng,n*self.dim).reshape(n,self.dim)
+        elif self.kind=='lhs':
+            # Each column places one point in each of n equal strata,
+            #   in random order
+            points=np.empty((n,self.dim))
+            for d in range(self.dim):
+                order=np.argsort(draw_uniforms(self.rng,n))
+                points[:,d]=(order+draw_uniforms(self.rng,n))/n
+        else:
+            index=np.arange(self.index,self.index+n,dtype=np.uint64)
+            points=np.empty((n,self.dim))
+            for d in range(self.dim):
+                if self.kind=='sobol':
+                    points[:,d]=self.sobol(index,d)
+                else:
+                    points[:,d]=self.halton(index+np.uint64(1),d)
+            self.index+=n
+        return points
+
+    def sobol(self,index,d):
+        """
+        Returns dimension d of the Sobol points with the given indices
+        """
+        # The point with index i is the exclusive or of the direction
+        #   numbers selected by the bits of the Gray code of i
+        gray=index^(index>>np.uint64(1))
+        value=np.zeros(len(index),dtype=np.uint64)+\
+            np.uint64(self.shifts[d])
+        V=self.directions[d]
+        for k in range(32):
+            bit=(gray>>np.uint64(k))&np.uint64(1)
+            value^=bit*V[k]
+        # Use the centre of each cell, so that no point is 0 or 1
+        return (value.astype(float)+0.5)/2**32
+
+    def halton(self,index,d):
+        """
+        Returns dimension d of the Halton points with the given indices
+        """
+        b=halton_bases[d]
+        perms=self.perms[d]
+        value=np.zeros(len(index))
+        rest=index.astype(np.int64)
+        scale=1.0/b
+        for k in range(len(perms)):
+            value+=perms[k][rest%b]*scale
+            rest//=b
+            scale/=b
+            # Unscrambled digits past the last nonzero digit are zero
+            if self.scramble!=True and not rest.any():
+                break
+        return value
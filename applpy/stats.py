@@ -7,10 +7,17 @@
 Statistics Module
 
 Defines procedures for parameter estimation
+Defines bootstrap resampling procedures
 
 """
 
 from rv import *
+from sampling import spawn_seeds,make_rng,draw_uniforms,draw_indices
+from sampling import normal_cdf,normal_idf
+try:
+    import numpy as np
+except ImportError:
+    np=None
 
 """
 Parameter Estimation Procedures
@@ -113,22 +120,326 @@ def MLE(RVar,data,parameters,censor=None):
         # Solve for each parameter
         soln=solve(DiffLogLike,set(parameters))
         return soln
-        
-        
-            
 
+"""
+Bootstrap Procedures
+
+Procedures:
+    1. BootstrapReplicates(data,stat,B,seed,processes)
+    2. BootstrapCI(data,stat,B,level,method,seed,processes)
+"""
+
+# The statistics computed from sums of powers of the data, with the
+#   highest power that each one needs
+moment_statistics={'mean':1,'variance':2,'skewness':3,'kurtosis':4,
+                   'coefofvar':2}
 
+# The number of resampled values held in memory at once. The
+#   replicates are drawn in blocks of about this many values, each
+#   from its own random number stream, so the replicates depend only
+#   on the seed, and not on the number of processes. Blocks of this
+#   size resample faster than larger ones, since the indices and
+#   values of a block stay in the processor cache.
+bootstrap_block=2**20
 
+# Statistics without a vectorized form are jackknifed in at most this
+#   many groups when computing BCa intervals
+jackknife_groups=1000
 
+# The data and statistic of a worker process
+bootstrap_state={}
 
+def BootstrapReplicates(data,stat='mean',B=10000,seed=None,processes=1):
+    """
+    Procedure Name: BootstrapReplicates
+    Purpose: Compute a statistic on B bootstrap resamples of a data set
+    Arguments:  1. data: A list or array of numeric observations
+                2. stat: 'mean', 'variance', 'skewness', 'kurtosis',
+                    'coefofvar', one of the procedures Mean, Variance,
+                    Skewness, Kurtosis and CoefOfVar, or a function
+                    (optional, defaults to the mean)
+                3. B: The number of bootstrap replicates (optional)
+                4. seed: An integer seed, or a NumPy generator
+                    (optional)
+                5. processes: The number of worker processes (optional,
+                    None uses every processor)
+    Output:     1. An array of the B replicates of the statistic
+    """
+    # The resamples are drawn as arrays of indices, one resample per
+    #   row. A function is called with a 2-D array of resamples and
+    #   should return one value for each row; otherwise it is applied
+    #   to each row in turn. The moment statistics are those of the
+    #   resample, as given by the procedures on BootstrapRV(resample).
+    if type(B)!=int or B<1:
+        raise RVError('The number of replicates must be a positive integer')
+    values,evaluate=bootstrap_setup(data,stat)
+    n=len(values)
+    # The streams of the blocks are spawned from an integer seed,
+    #   which is drawn from the generator if one is given
+    if not isinstance(seed,(int,long)):
+        seed=int(draw_uniforms(make_rng(seed),1)[0]*2**53)
+    rows=max(1,min(B,bootstrap_block//n))
+    nblocks=-(-B//rows)
+    seeds=spawn_seeds(nblocks,seed)
+    tasks=[(seeds[i],i*rows,min(rows,B-i*rows)) for i in range(nblocks)]
+    from multiprocessing import Pool,RawArray,cpu_count
+    if processes==None:
+        processes=cpu_count()
+    shared=RawArray('d',B)
+    # Small requests are computed in this process, from the same
+    #   streams
+    if processes<=1 or nblocks==1:
+        init_bootstrap(values,evaluate,shared)
+        for task in tasks:
+            bootstrap_chunk(task)
+        bootstrap_state.clear()
+    else:
+        pool=Pool(min(processes,nblocks),initializer=init_bootstrap,
+                  initargs=(values,evaluate,shared))
+        try:
+            for count in pool.imap_unordered(bootstrap_chunk,tasks):
+                pass
+        finally:
+            pool.close()
+            pool.join()
+    return np.frombuffer(shared,dtype=float)[:B]
 
+def BootstrapCI(data,stat='mean',B=10000,level=0.95,method='percentile',
+                seed=None,processes=1):
+    """
+    Procedure Name: BootstrapCI
+    Purpose: Compute a bootstrap confidence interval for a statistic
+    Arguments:  1. data: A list or array of numeric observations
+                2. stat: The statistic, as in BootstrapReplicates
+                    (optional, defaults to the mean)
+                3. B: The number of bootstrap replicates (optional)
+                4. level: The confidence level (optional)
+                5. method: 'percentile' or 'bca' (bias corrected and
+                    accelerated) (optional)
+                6. seed: An integer seed, or a NumPy generator
+                    (optional)
+                7. processes: The number of worker processes (optional,
+                    None uses every processor)
+    Output:     1. A dictionary with the estimate, the bootstrap bias
+                    and standard error, the interval, and the array
+                    of replicates
+    """
+    if method not in ['percentile','bca']:
+        raise RVError('The method must be percentile or bca')
+    if level<=0 or level>=1:
+        raise RVError('The confidence level must be between 0 and 1')
+    values,evaluate=bootstrap_setup(data,stat)
+    estimate=float(evaluate(values[np.newaxis,:])[0])
+    replicates=BootstrapReplicates(data,stat,B,seed,processes)
+    alpha=(1-level)/2
+    probs=[alpha,1-alpha]
+    # The BCa interval moves the percentiles to correct for the
+    #   median bias of the replicates (z0) and for the change in
+    #   their spread with the parameter (the acceleration, estimated
+    #   from the jackknife)
+    if method=='bca':
+        below=np.mean(replicates<estimate)+np.mean(replicates==estimate)/2
+        if below<=0 or below>=1:
+            raise RVError('The replicates do not cover the estimate')
+        z0=normal_idf(below)
+        jack=jackknife(data,stat)
+        diff=np.mean(jack)-jack
+        denom=6*np.sum(diff**2)**1.5
+        if denom>0:
+            accel=np.sum(diff**3)/denom
+        else:
+            accel=0
+        for i in range(2):
+            z=z0+normal_idf(probs[i])
+            probs[i]=normal_cdf(z0+z/(1-accel*z))
+    interval=np.percentile(replicates,[100*probs[0],100*probs[1]])
+    return {'estimate':estimate,
+            'bias':float(np.mean(replicates))-estimate,
+            'stderr':float(np.std(replicates,ddof=1)) if B>1 else 0.0,
+            'interval':(float(interval[0]),float(interval[1])),
+            'replicates':replicates}
+
+def bootstrap_setup(data,stat):
+    # Not intended for use by end user
+    """
+    Procedure Name: bootstrap_setup
+    Purpose: Prepare a data set and statistic for resampling
+    Arguments:  1. data: A list or array of numeric observations
+                2. stat: The statistic, as in BootstrapReplicates
+    Output:     1. The array of values to resample
+                2. A function that evaluates the statistic on each row
+                    of a 2-D array of resampled values
+    """
+    if np==None:
+        raise ImportError('Bootstrap resampling requires numpy')
+    try:
+        values=np.asarray(data,dtype=float)
+    except (TypeError,ValueError):
+        raise RVError('Bootstrap resampling requires numeric data')
+    if values.ndim!=1 or len(values)<2:
+        raise RVError('The data must be a list of at least two values')
+    stat=bootstrap_statistic(stat)
+    if stat in moment_statistics:
+        # Moment statistics are computed from sums of powers of the
+        #   data, centred at its mean to avoid cancellation
+        center=float(np.mean(values))
+        n=len(values)
+        order=moment_statistics[stat]
+        def evaluate(samples):
+            return moment_statistic(stat,power_sums(samples,order),n,
+                                    center)
+        return values-center,evaluate
+    return values,lambda samples: apply_statistic(stat,samples)
 
+def bootstrap_statistic(stat):
+    # Not intended for use by end user
+    """
+    Procedure Name: bootstrap_statistic
+    Purpose: Identify the statistic of a bootstrap
+    Arguments:  1. stat: The statistic, as in BootstrapReplicates
+    Output:     1. The name of a moment statistic, or the function
+    """
+    procs={Mean:'mean',Variance:'variance',Skewness:'skewness',
+           Kurtosis:'kurtosis',CoefOfVar:'coefofvar'}
+    if isinstance(stat,str):
+        if stat.lower() not in moment_statistics:
+            raise RVError('Unknown statistic %s'%(stat))
+        return stat.lower()
+    if stat in procs:
+        return procs[stat]
+    if not callable(stat):
+        raise RVError('The statistic must be a name or a function')
+    return stat
 
+def power_sums(samples,order):
+    # Not intended for use by end user
+    """
+    Procedure Name: power_sums
+    Purpose: Sum the powers of each row of a 2-D array
+    Arguments:  1. samples: A 2-D array
+                2. order: The highest power (at most 4)
+    Output:     1. A list of arrays, holding the row sums of the first,
+                    second, ... powers
+    """
+    # einsum forms the row sums of products without holding each
+    #   power of the array in memory
+    sums=[samples.sum(axis=1)]
+    if order>=2:
+        sums.append(np.einsum('ij,ij->i',samples,samples))
+    if order>=3:
+        square=samples*samples
+        sums.append(np.einsum('ij,ij->i',square,samples))
+    if order>=4:
+        sums.append(np.einsum('ij,ij->i',square,square))
+    return sums
 
+def moment_statistic(name,sums,count,center):
+    # Not intended for use by end user
+    """
+    Procedure Name: moment_statistic
+    Purpose: Compute a moment statistic from sums of powers of centred
+                values
+    Arguments:  1. name: The name of the statistic
+                2. sums: The sums of the first, second, ... powers of
+                    the values less center
+                3. count: The number of values in each sum
+                4. center: The centre of the values
+    Output:     1. The statistic for each sum
+    """
+    m=[total/count for total in sums]
+    if name=='mean':
+        return center+m[0]
+    # Convert the raw moments about center to central moments
+    var=m[1]-m[0]**2
+    if name=='variance':
+        return var
+    if name=='coefofvar':
+        return np.sqrt(var)/(center+m[0])
+    if name=='skewness':
+        third=m[2]-3*m[0]*m[1]+2*m[0]**3
+        return third/var**1.5
+    fourth=m[3]-4*m[0]*m[2]+6*m[0]**2*m[1]-3*m[0]**4
+    return fourth/var**2
 
+def apply_statistic(stat,samples):
+    # Not intended for use by end user
+    """
+    Procedure Name: apply_statistic
+    Purpose: Evaluate a user statistic on each row of a 2-D array
+    Arguments:  1. stat: A function
+                2. samples: A 2-D array with one sample in each row
+    Output:     1. An array with the statistic of each row
+    """
+    try:
+        result=np.asarray(stat(samples),dtype=float)
+        if result.shape==(samples.shape[0],):
+            return result
+    except (TypeError,ValueError):
+        pass
+    # The statistic is not vectorized, so apply it to each row
+    return np.array([float(stat(row)) for row in samples])
 
+def init_bootstrap(values,evaluate,shared):
+    # Not intended for use by end user
+    """
+    Procedure Name: init_bootstrap
+    Purpose: Prepare a worker process for resampling
+    Arguments:  1. values: The array of values to resample
+                2. evaluate: The statistic, from bootstrap_setup
+                3. shared: The shared array that receives the
+                    replicates
+    Output:     None
+    """
+    bootstrap_state['values']=values
+    bootstrap_state['evaluate']=evaluate
+    bootstrap_state['output']=np.frombuffer(shared,dtype=float)
 
-            
-            
+def bootstrap_chunk(task):
+    # Not intended for use by end user
+    """
+    Procedure Name: bootstrap_chunk
+    Purpose: Compute one block of replicates in a worker process,
+                writing them into the shared array
+    Arguments:  1. task: A tuple (seed,start,count)
+    Output:     1. The number of replicates computed
+    """
+    seed,start,count=task
+    values=bootstrap_state['values']
+    n=len(values)
+    indices=draw_indices(make_rng(seed),n,(count,n))
+    bootstrap_state['output'][start:start+count]=\
+        bootstrap_state['evaluate'](values.take(indices))
+    return count
 
-    
+def jackknife(data,stat):
+    # Not intended for use by end user
+    """
+    Procedure Name: jackknife
+    Purpose: Compute the jackknife values of a statistic
+    Arguments:  1. data: A list or array of numeric observations
+                2. stat: The statistic, as in BootstrapReplicates
+    Output:     1. An array of the statistic with each observation
+                    (or, for large data sets and user statistics, each
+                    group of observations) left out
+    """
+    values,evaluate=bootstrap_setup(data,stat)
+    stat=bootstrap_statistic(stat)
+    n=len(values)
+    # Moment statistics leave each value out of the sums of powers,
+    #   where the values are already centred by bootstrap_setup
+    if stat in moment_statistics:
+        sums=[total-values**k for k,total in
+              enumerate(power_sums(values[np.newaxis,:],
+                                   moment_statistics[stat]),1)]
+        center=float(np.mean(np.asarray(data,dtype=float)))
+        return moment_statistic(stat,sums,n-1,center)
+    # Other statistics are evaluated on the leave-one-out samples, or
+    #   with one of jackknife_groups interleaved groups left out
+    if n<=jackknife_groups:
+        cols=np.arange(n-1)
+        indices=cols[np.newaxis,:]+(cols[np.newaxis,:]>=
+                                    np.arange(n)[:,np.newaxis])
+        return evaluate(values.take(indices))
+    groups=np.arange(n)%jackknife_groups
+    return np.array([evaluate(values[groups!=g][np.newaxis,:])[0]
+                     for g in range(jackknife_groups)])
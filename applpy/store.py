@@ -0,0 +1,299 @@
+######################################################################
+# ApplPy Software 2012 Matthew Robinson, Matthew Jackiewicz          #
+# Version 0.5, last updated 18 October 2026                          #
+######################################################################
+
+"""
+Result Store Module
+
+Defines a persistent, content-addressed store for the results of
+    ApplPy procedures. Results are kept in an SQLite database, keyed
+    on a hash of the procedure name and a canonical serialization of
+    its arguments, so that separate sessions and worker processes can
+    share derivations instead of recomputing them.
+
+The store is disabled until OpenStore is called, or until the
+    APPLPY_STORE environment variable names a database file.
+
+"""
+
+from __future__ import division
+from functools import wraps
+from threading import Lock
+import hashlib
+import os
+import sqlite3
+import sympy
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+class ResultStore:
+    """
+    ResultStore Class
+    Defines the connection to the on-disk result database
+    """
+
+    def __init__(self):
+        """
+        Creates a closed result store
+        """
+        self.path=None
+        self.conn=None
+        self.pid=None
+        self.lock=Lock()
+
+    def connect(self):
+        """
+        Returns a connection to the database, reconnecting if the
+            process has been forked since the last connection
+        """
+        if self.conn==None or self.pid!=os.getpid():
+            self.conn=sqlite3.connect(self.path,timeout=60,
+                                      check_same_thread=False)
+            self.conn.execute('CREATE TABLE IF NOT EXISTS results '+
+                              '(key TEXT PRIMARY KEY, '+
+                              'procedure TEXT, value BLOB)')
+            self.conn.commit()
+            self.pid=os.getpid()
+        return self.conn
+
+    def lookup(self,key):
+        """
+        Returns (True,value) if the key is in the store, and
+            (False,None) otherwise
+        """
+        with self.lock:
+            row=self.connect().execute('SELECT value FROM results '+
+                                       'WHERE key=?',(key,)).fetchone()
+        if row==None:
+            return False,None
+        try:
+            return True,thaw(pickle.loads(str(row[0])))
+        except Exception:
+            # Entries written by an incompatible version are ignored
+            return False,None
+
+    def save(self,key,procedure,value):
+        """
+        Writes a value to the store
+        """
+        try:
+            blob=pickle.dumps(freeze(value),2)
+        except Exception:
+            return
+        with self.lock:
+            conn=self.connect()
+            conn.execute('INSERT OR REPLACE INTO results VALUES (?,?,?)',
+                         (key,procedure,sqlite3.Binary(blob)))
+            conn.commit()
+
+# The store shared by every ApplPy procedure in the process
+result_store=ResultStore()
+
+# The version of the stored results. It is part of every key, and must
+#   be increased whenever a stored procedure changes its output (its
+#   form, support or accuracy), so that results written by an earlier
+#   version are not read back
+result_version=2
+
+"""
+Store Utilities
+
+Procedures:
+    1. OpenStore(path)
+    2. CloseStore()
+    3. ClearStore()
+"""
+
+def OpenStore(path=None):
+    """
+    Procedure Name: OpenStore
+    Purpose: Enable the persistent result store
+    Arguments:  1. path: The database file (optional, defaults to
+                    ~/.applpy/store.db)
+    Output:     None
+    """
+    if path==None:
+        path=os.path.join(os.path.expanduser('~'),'.applpy','store.db')
+    directory=os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    with result_store.lock:
+        result_store.path=path
+        result_store.conn=None
+        result_store.pid=None
+
+def CloseStore():
+    """
+    Procedure Name: CloseStore
+    Purpose: Disable the persistent result store
+    Arguments:  None
+    Output:     None
+    """
+    with result_store.lock:
+        if result_store.conn!=None and result_store.pid==os.getpid():
+            result_store.conn.close()
+        result_store.path=None
+        result_store.conn=None
+        result_store.pid=None
+
+def ClearStore():
+    """
+    Procedure Name: ClearStore
+    Purpose: Remove every result from the persistent result store
+    Arguments:  None
+    Output:     None
+    """
+    if result_store.path==None:
+        return
+    with result_store.lock:
+        conn=result_store.connect()
+        conn.execute('DELETE FROM results')
+        conn.commit()
+
+def serialize(obj):
+    # Not intended for use by end user
+    """
+    Procedure Name: serialize
+    Purpose: Produce a canonical string representation of an
+                argument to an ApplPy procedure
+    Arguments:  1. obj: A random variable, list or SymPy object
+    Output:     1. A string
+    """
+    # Random variables are identified by their function list, support
+    #   and type, regardless of the subclass that created them (but
+    #   array-backed random variables are kept apart, since their
+    #   results are array-backed too)
+    if hasattr(obj,'func') and hasattr(obj,'support') and \
+       hasattr(obj,'ftype'):
+        if getattr(obj,'compact',False)==True:
+            return 'CompactRV(%s,%s,%s,%s)'%(serialize(list(obj.func)),
+                                             serialize(list(obj.support)),
+                                             serialize(list(obj.ftype)),
+                                             obj.exact)
+        return 'RV(%s,%s,%s)'%(serialize(list(obj.func)),
+                               serialize(list(obj.support)),
+                               serialize(list(obj.ftype)))
+    if isinstance(obj,(list,tuple)):
+        return '[%s]'%(','.join([serialize(item) for item in obj]))
+    return sympy.srepr(obj)
+
+def store_key(name,args,kwargs={}):
+    # Not intended for use by end user
+    """
+    Procedure Name: store_key
+    Purpose: Compute the content address of a procedure call
+    Arguments:  1. name: The name of the procedure
+                2. args: The positional arguments of the call
+                3. kwargs: The keyword arguments of the call
+    Output:     1. A hexadecimal digest, or None if the arguments
+                    cannot be serialized
+    """
+    try:
+        key=[name,str(result_version),sympy.__version__]
+        for arg in args:
+            key.append(serialize(arg))
+        for kw in sorted(kwargs):
+            key.append('%s=%s'%(kw,serialize(kwargs[kw])))
+        return hashlib.sha1('|'.join(key)).hexdigest()
+    except Exception:
+        return None
+
+def freeze(value):
+    # Not intended for use by end user
+    """
+    Procedure Name: freeze
+    Purpose: Convert a procedure result into plain data for pickling
+    Arguments:  1. value: The result of an ApplPy procedure
+    Output:     1. The result, with random variables replaced by
+                    (func,support,ftype) tuples
+    """
+    if hasattr(value,'func') and hasattr(value,'support') and \
+       hasattr(value,'ftype'):
+        if getattr(value,'compact',False)==True:
+            return ('CompactRV',value.func,value.support,
+                    list(value.ftype),value.exact)
+        return ('RV',list(value.func),list(value.support),
+                list(value.ftype))
+    return ('value',value)
+
+def thaw(data):
+    # Not intended for use by end user
+    """
+    Procedure Name: thaw
+    Purpose: Rebuild a procedure result written by freeze
+    Arguments:  1. data: A tuple produced by freeze
+    Output:     1. The procedure result
+    """
+    if data[0]=='RV':
+        from rv import RV
+        return RV(data[1],data[2],data[3])
+    if data[0]=='CompactRV':
+        from rv import CompactRV
+        return CompactRV(data[1],data[2],data[3],data[4])
+    return data[1]
+
+def store_lookup(name,args,kwargs={}):
+    # Not intended for use by end user
+    """
+    Procedure Name: store_lookup
+    Purpose: Find the stored result of a procedure call
+    Arguments:  1. name: The name of the procedure
+                2. args: The positional arguments of the call
+                3. kwargs: The keyword arguments of the call
+    Output:     1. The stored result, or None if there is none
+    """
+    if result_store.path==None:
+        return None
+    key=store_key(name,args,kwargs)
+    if key==None:
+        return None
+    found,value=result_store.lookup(key)
+    if found!=True:
+        return None
+    return value
+
+def store_save(name,args,value,kwargs={}):
+    # Not intended for use by end user
+    """
+    Procedure Name: store_save
+    Purpose: Write the result of a procedure call to the store
+    Arguments:  1. name: The name of the procedure
+                2. args: The positional arguments of the call
+                3. value: The result of the call
+                4. kwargs: The keyword arguments of the call
+    Output:     None
+    """
+    if result_store.path==None or value==None:
+        return
+    key=store_key(name,args,kwargs)
+    if key!=None:
+        result_store.save(key,name,value)
+
+def stored(proc):
+    # Not intended for use by end user
+    """
+    Procedure Name: stored
+    Purpose: Decorate an ApplPy procedure so that its results are
+                read from and written to the result store
+    Arguments:  1. proc: An ApplPy procedure
+    Output:     1. The decorated procedure
+    """
+    name=proc.__name__
+    @wraps(proc)
+    def stored_proc(*args,**kwargs):
+        if result_store.path==None:
+            return proc(*args,**kwargs)
+        value=store_lookup(name,args,kwargs)
+        if value==None:
+            value=proc(*args,**kwargs)
+            store_save(name,args,value,kwargs)
+        return value
+    return stored_proc
+
+# Open the store named in the environment, so that batch jobs and
+#   worker processes can share it without any changes to their code
+if os.environ.get('APPLPY_STORE'):
+    OpenStore(os.environ['APPLPY_STORE'])
@@ -0,0 +1,47 @@
+"""
+Tests of the merged supports of the discrete Transform, Mixture,
+    Maximum and Minimum procedures
+"""
+
+import unittest
+from applpy import *
+from test_convolution import enumerate_pairs,as_pairs
+
+
+class TestNearEqualSupports(unittest.TestCase):
+
+    def setUp(self):
+        # a and b are distinct, but round to the same float
+        self.a=Rational(1,3)
+        self.b=self.a+Rational(1,10**20)
+        self.X=RV([Rational(1,2),Rational(1,2)],[self.a,self.b],
+                  ['discrete','pdf'])
+        self.Y=RV([Rational(1,4),Rational(3,4)],[self.b,1],
+                  ['discrete','pdf'])
+
+    def test_transform(self):
+        X=RV([Rational(1,4)]*4,[-self.b,-self.a,self.a,self.b],
+             ['discrete','pdf'])
+        Z=Transform(X,[[x**2],[-oo,oo]])
+        self.assertEqual(as_pairs(Z),[(self.a**2,Rational(1,2)),
+                                      (self.b**2,Rational(1,2))])
+
+    def test_mixture(self):
+        Z=Mixture([Rational(1,2),Rational(1,2)],[self.X,self.Y])
+        self.assertEqual(as_pairs(Z),[(self.a,Rational(1,4)),
+                                      (self.b,Rational(3,8)),
+                                      (1,Rational(3,8))])
+
+    def test_extremes(self):
+        X,Y=self.X,self.Y
+        for Z,op in [(Maximum(X,Y),max),(Maximum(Y,X),max),
+                     (Minimum(X,Y),min),(Minimum(Y,X),min)]:
+            self.assertEqual(as_pairs(Z),enumerate_pairs(X,Y,op))
+        B=RV([1],[self.b],['discrete','pdf'])
+        self.assertEqual(as_pairs(Maximum(X,B)),[(self.b,1)])
+        self.assertEqual(as_pairs(Minimum(B,X)),[(self.a,Rational(1,2)),
+                                                 (self.b,Rational(1,2))])
+
+
+if __name__=='__main__':
+    unittest.main()
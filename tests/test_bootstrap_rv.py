@@ -0,0 +1,59 @@
+"""
+Tests of BootstrapRV against a direct count of each distinct value
+"""
+
+import unittest
+import numpy as np
+from applpy import *
+
+
+def counted_rv(varlist):
+    """
+    Returns the bootstrap distribution of a list of variates, counting
+        the occurrences of each distinct value with list.count
+    """
+    varlist=sorted(varlist)
+    supplist=[]
+    funclist=[]
+    for value in varlist:
+        if value not in supplist:
+            supplist.append(value)
+            funclist.append(varlist.count(value)/float(len(varlist)))
+    return supplist,funclist
+
+
+class TestBootstrapRV(unittest.TestCase):
+
+    def setUp(self):
+        rng=np.random.RandomState(12)
+        self.samples=[rng.randint(0,20,size=2000).tolist(),
+                      np.round(rng.normal(size=3000),1).tolist(),
+                      [Rational(k%7,3) for k in range(500)],
+                      [5]*10]
+
+    def test_ties(self):
+        for varlist in self.samples:
+            original=list(varlist)
+            supp,func=counted_rv(varlist)
+            for compact in [False,True]:
+                X=BootstrapRV(varlist,compact)
+                self.assertEqual(varlist,original)
+                self.assertEqual(is_compact(X),compact)
+                self.assertEqual([float(v) for v in X.support],
+                                 [float(v) for v in supp])
+                self.assertTrue(np.allclose([float(p) for p in X.func],
+                                            func,rtol=1e-15,atol=0))
+            # An array of variates gives the same random variable
+            self.assertEqual(BootstrapRV(np.array(varlist,dtype=float)),
+                             BootstrapRV([float(v) for v in varlist]))
+
+    def test_large_sample(self):
+        varlist=np.random.RandomState(3).poisson(4,size=10**6)
+        X=BootstrapRV(varlist,compact=True)
+        counts=np.bincount(varlist)
+        self.assertTrue((X.support==np.nonzero(counts)[0]).all())
+        self.assertTrue(np.allclose(X.func,counts[counts>0]/1e6))
+
+
+if __name__=='__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Tests of the array-backed compact discrete random variable class
+"""
+
+import unittest
+import pickle
+import numpy as np
+from applpy import *
+import applpy.store as store_module
+
+
+def as_floats(X):
+    """
+    Returns the pdf of a discrete random variable as a list of
+        (value,probability) pairs of floats
+    """
+    X=PDF(X)
+    return [(float(X.support[i]),float(X.func[i]))
+            for i in range(len(X.support))]
+
+
+class TestCompactRV(unittest.TestCase):
+
+    def setUp(self):
+        self.X=RV([Rational(1,4),Rational(1,2),Rational(1,4)],[0,1,3],
+                  ['discrete','pdf'])
+        self.Y=RV([Rational(1,3),Rational(2,3)],[Rational(1,2),2],
+                  ['discrete','pdf'])
+
+    def assertSameDistribution(self,A,B):
+        first=as_floats(A)
+        second=as_floats(B)
+        self.assertEqual([v for v,p in first],[v for v,p in second])
+        self.assertTrue(np.allclose([p for v,p in first],
+                                    [p for v,p in second]))
+
+    def test_equality(self):
+        X=self.X
+        # Exact compact random variables equal the list form, and float
+        #   compact random variables equal the list form with Floats
+        C=Compact(X,exact=True)
+        self.assertEqual(C,X)
+        self.assertEqual(hash(C),hash(X))
+        self.assertEqual(Uncompact(C),X)
+        F=Compact(X,exact=False)
+        self.assertEqual(F,RV([Float(0.25),Float(0.5),Float(0.25)],
+                              [Float(0),Float(1),Float(3)],
+                              ['discrete','pdf']))
+        self.assertNotEqual(F,X)
+        self.assertEqual(Uncompact(F),F)
+
+    def test_round_trips(self):
+        X,Y=self.X,self.Y
+        cases=[(Convolution,lambda A,B: Convolution(A,B)),
+               (Maximum,lambda A,B: Maximum(A,B)),
+               (Minimum,lambda A,B: Minimum(A,B)),
+               (Mixture,lambda A,B: Mixture([Rational(1,3),
+                                             Rational(2,3)],[A,B]))]
+        for proc,op in cases:
+            expected=op(X,Y)
+            for exact in [True,False]:
+                result=op(Compact(X,exact),Compact(Y,exact))
+                self.assertSameDistribution(result,expected)
+                if exact==True:
+                    self.assertEqual(PDF(Uncompact(result)),
+                                     PDF(expected),proc.__name__)
+            # A compact random variable may be combined with the list
+            #   form
+            self.assertSameDistribution(op(Compact(X),Y),expected)
+
+    def test_store(self):
+        for exact in [True,False]:
+            C=Compact(self.Y,exact)
+            for D in [store_module.thaw(store_module.freeze(C)),
+                      store_module.thaw(pickle.loads(pickle.dumps(
+                          store_module.freeze(C),2))),
+                      pickle.loads(pickle.dumps(C,2))]:
+                self.assertTrue(is_compact(D))
+                self.assertEqual(D.exact,exact)
+                self.assertEqual(D,C)
+                self.assertFalse(D.func.flags.writeable)
+
+
+if __name__=='__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Tests of the compiled NumPy evaluators of functional forms
+"""
+
+import unittest
+import math
+import numpy as np
+from applpy import *
+from applpy.compiled import CompiledForm
+
+
+class TestCompiledForm(unittest.TestCase):
+
+    def test_piecewise(self):
+        # A triangular pdf, with a constant segment between its sides
+        funcs=[x/2,S.Half,(4-x)/2]
+        support=[0,1,3,4]
+        form=CompiledForm(funcs,support,['continuous','pdf'])
+        values=np.array([-1,0,0.5,1,2,3,3.5,4,5])
+        expected=[0]
+        for v in values[1:-1]:
+            # Points on a boundary use the segment to the right
+            i=min(np.searchsorted(support,v,side='right')-1,2)
+            expected.append(float(funcs[i].subs(x,v)))
+        expected.append(0)
+        self.assertTrue(np.allclose(form(values),expected))
+        self.assertTrue(np.isnan(form(np.array([np.nan,1]))[0]))
+        self.assertEqual(type(form(2)),float)
+        self.assertEqual(form(values.reshape(3,3)).shape,(3,3))
+
+    def test_fill_values(self):
+        form=CompiledForm([1-exp(-x)],[0,oo],['continuous','cdf'])
+        self.assertTrue(np.allclose(form([-1,0,1]),[0,0,1-math.exp(-1)]))
+        form=CompiledForm([exp(-x)],[0,oo],['continuous','sf'])
+        self.assertEqual(form(-1),1)
+
+    def test_special_functions(self):
+        # erf and gamma are evaluated with the math module, and other
+        #   functions fall back to mpmath
+        form=CompiledForm([(1+erf(x/sqrt(2)))/2],[-oo,oo],
+                          ['continuous','cdf'])
+        for v in [-3,-0.5,0,1.25]:
+            self.assertAlmostEqual(form(v),(1+math.erf(v/math.sqrt(2)))/2,
+                                   places=15)
+        form=CompiledForm([gamma(x)],[1,5],['continuous','pdf'])
+        self.assertAlmostEqual(form(4.5),math.gamma(4.5),places=10)
+        form=CompiledForm([zeta(x)],[2,oo],['continuous','pdf'])
+        self.assertAlmostEqual(form(2),math.pi**2/6,places=14)
+
+    def test_discrete(self):
+        probs=[Rational(1,4),Rational(1,2),Rational(1,4)]
+        pdf=CompiledForm(probs,[1,2,4],['discrete','pdf'])
+        cdf=CompiledForm([Rational(1,4),Rational(3,4),1],[1,2,4],
+                         ['discrete','cdf'])
+        sf=CompiledForm([1,Rational(3,4),Rational(1,4)],[1,2,4],
+                        ['discrete','sf'])
+        values=[0,1,1.5,2,3,4,5]
+        self.assertTrue(np.allclose(pdf(values),[0,.25,0,.5,0,.25,0]))
+        self.assertTrue(np.allclose(cdf(values),[0,.25,.25,.75,.75,1,1]))
+        self.assertTrue(np.allclose(sf(values),[1,1,.75,.75,.25,.25,0]))
+        idf=CompiledForm([1,2,4],[Rational(1,4),Rational(3,4),1],
+                         ['discrete','idf'])
+        self.assertTrue(np.allclose(idf([0.1,0.25,0.5,0.9]),[1,1,2,4]))
+        self.assertTrue(np.isnan(idf([1.5])).all())
+
+    def test_functional_discrete(self):
+        p=Rational(1,3)
+        form=CompiledForm([p*(1-p)**(x-1)],[1,oo],['Discrete','pdf'])
+        self.assertTrue(np.allclose(form([0,1,1.5,2,3]),
+                                    [0,1/3.,0,2/9.,4/27.]))
+
+
+if __name__=='__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Tests of the discrete Convolution procedure against direct
+    enumeration of every pair of support points
+"""
+
+import unittest
+import math
+import numpy as np
+from applpy import *
+import applpy.rv as rv_module
+
+
+def enumerate_pairs(X,Y,op):
+    """
+    Returns the exact distribution of op(X,Y) as a sorted list of
+        (value,probability) pairs
+    """
+    dist={}
+    for i in range(len(X.support)):
+        for j in range(len(Y.support)):
+            value=sympify(op(X.support[i],Y.support[j]))
+            prob=X.func[i]*Y.func[j]
+            dist[value]=dist.get(value,0)+prob
+    return sorted(dist.items(),key=lambda item: item[0])
+
+
+def as_pairs(X):
+    """
+    Returns the support and probabilities of a discrete random
+        variable as a list of pairs
+    """
+    return zip(list(X.support),list(X.func))
+
+
+class TestHeapConvolution(unittest.TestCase):
+
+    def test_rational_supports(self):
+        X=RV([Rational(1,2),Rational(1,2)],[Rational(1,10),Rational(3,10)],
+             ['discrete','pdf'])
+        Y=RV([Rational(1,2),Rational(1,2)],[0,Rational(2,10)],
+             ['discrete','pdf'])
+        Z=Convolution(X,Y)
+        self.assertEqual(list(Z.support),
+                         [Rational(1,10),Rational(3,10),Rational(1,2)])
+        self.assertEqual(as_pairs(Z),enumerate_pairs(X,Y,lambda a,b: a+b))
+
+    def test_integer_supports(self):
+        X=RV([Rational(1,6)]*6,range(1,7),['discrete','pdf'])
+        Y=RV([Rational(1,3),Rational(2,3)],[-1,4],['discrete','pdf'])
+        Z=Convolution(X,Y)
+        self.assertEqual(as_pairs(Z),enumerate_pairs(X,Y,lambda a,b: a+b))
+        self.assertEqual(sum(Z.func),1)
+
+    def test_float_supports(self):
+        X=RV([0.5,0.5],[0.1,0.3],['discrete','pdf'])
+        Y=RV([0.5,0.5],[0,0.2],['discrete','pdf'])
+        Z=Convolution(X,Y)
+        # 0.1+0.2 and 0.3 are different floating point numbers
+        self.assertEqual([float(s) for s in Z.support],
+                         [0.1,0.3,0.1+0.2,0.5])
+        self.assertEqual([float(f) for f in Z.func],[0.25]*4)
+
+    def test_irrational_supports(self):
+        X=RV([Rational(1,2),Rational(1,2)],[1,sqrt(2)],['discrete','pdf'])
+        Z=Convolution(X,X)
+        self.assertEqual(as_pairs(Z),enumerate_pairs(X,X,lambda a,b: a+b))
+
+
+def binomial_pdf(n,p):
+    """
+    Returns the floating point probabilities of a binomial random
+        variable
+    """
+    return [math.exp(math.lgamma(n+1)-math.lgamma(k+1)-
+                     math.lgamma(n-k+1)+k*math.log(p)+
+                     (n-k)*math.log(1-p)) for k in range(n+1)]
+
+
+class TestFFTConvolution(unittest.TestCase):
+
+    def setUp(self):
+        probs=binomial_pdf(63,0.3)
+        self.probs=probs
+        self.X=RV([Float(f) for f in probs],range(64),['discrete','pdf'])
+
+    def assertAgree(self,Z,exact):
+        # Every point that the FFT keeps is accurate, and the points
+        #   that it removes hold no more than the round-off
+        found=dict(zip([int(s) for s in Z.support],
+                       [float(f) for f in Z.func]))
+        for k in range(len(exact)):
+            self.assertTrue(abs(found.get(k,0)-exact[k])<1e-14)
+        # The tail points well above the round-off are kept
+        for k in range(len(exact)):
+            if exact[k]>1e-12*exact.max():
+                self.assertTrue(k in found)
+        self.assertAlmostEqual(sum(found.values()),sum(exact),places=14)
+
+    def test_fft_matches_heap(self):
+        exact=np.convolve(self.probs,self.probs)
+        fft=Convolution(self.X,self.X)
+        size=rv_module.fft_size
+        rv_module.fft_size=10**9
+        try:
+            heap=Convolution(self.X,self.X)
+        finally:
+            rv_module.fft_size=size
+        self.assertEqual(len(heap.support),len(exact))
+        self.assertAgree(fft,exact)
+        self.assertAgree(heap,exact)
+
+    def test_wide_support(self):
+        # The largest probability is small, so the tail probabilities
+        #   between 1e-16 and 1e-15 are well above the round-off
+        probs=np.exp(-np.arange(4096)/300.0)
+        probs=probs/probs.sum()
+        X=RV([Float(f) for f in probs],range(4096),['discrete','pdf'])
+        exact=np.convolve(probs,probs)
+        self.assertAgree(Convolution(X,X),exact)
+
+    def test_fft_power(self):
+        exact=self.probs
+        for i in range(3):
+            exact=np.convolve(exact,self.probs)
+        self.assertAgree(ConvolutionIID(self.X,4),exact)
+
+    def test_tolerance(self):
+        exact=np.convolve(self.probs,self.probs)
+        Z=Convolution(self.X,self.X,1e-6)
+        self.assertEqual([int(s) for s in Z.support],
+                         list(np.nonzero(exact>1e-6)[0]))
+        self.assertAlmostEqual(float(sum(Z.func)),1,places=12)
+        # A tolerance above every probability leaves no support
+        self.assertRaises(RVError,Convolution,self.X,self.X,1)
+        self.assertRaises(RVError,ConvolutionIID,self.X,4,1)
+
+
+if __name__=='__main__':
+    unittest.main()
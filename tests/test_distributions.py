@@ -0,0 +1,61 @@
+"""
+Tests of the functional forms of the named distributions
+"""
+
+import unittest
+import math
+import numpy as np
+from applpy import *
+import applpy.rv as rv_module
+
+
+def total_probability(X,lower,upper,size=400001):
+    """
+    Returns the integral of the compiled pdf over [lower,upper]
+    """
+    xs=np.linspace(lower,upper,size)
+    return np.trapz(np.nan_to_num(X.pdf(xs)),xs)
+
+
+class TestHalfParameters(unittest.TestCase):
+
+    def test_pdf_values(self):
+        # Each pdf is compared with its closed form, which involves
+        #   halves that must not be truncated to zero
+        cases=[(LogNormalRV(0,1),lambda v:math.exp(-math.log(v)**2/2)/
+                (v*math.sqrt(2*math.pi))),
+               (InverseGaussianRV(1,1),lambda v:math.exp(-(v-1)**2/(2*v))/
+                math.sqrt(2*math.pi*v**3)),
+               (TRV(5),lambda v:math.gamma(3)/(math.sqrt(5*math.pi)*
+                 math.gamma(2.5))*(1+v**2/5)**-3),
+               (ChiRV(3),lambda v:math.sqrt(2/math.pi)*v**2*
+                math.exp(-v**2/2)),
+               (ChiSquareRV(4),lambda v:v*math.exp(-v/2)/4)]
+        for X,pdf in cases:
+            self.assertNotEqual(X.func[0],0)
+            for v in [0.25,0.5,1.,2.,3.5]:
+                self.assertAlmostEqual(float(PDF(X,v)),pdf(v),places=12)
+
+    def test_total_probability(self):
+        for X,lower,upper in [(LogNormalRV(0,1),1e-9,400),
+                              (InverseGaussianRV(1,1),1e-9,100),
+                              (TRV(5),-400,400),(ChiRV(3),0,20),
+                              (ChiSquareRV(4),0,100),
+                              (UniformRV(0,2),0,2)]:
+            self.assertAlmostEqual(total_probability(X,lower,upper),1,
+                                   places=6)
+
+    def test_inversion(self):
+        # These cdfs are found symbolically and inverted numerically
+        u=np.array([0.01,0.1,0.5,0.9,0.99])
+        X=ChiSquareRV(4)
+        values=rv_module.inverse_transform(X,u,'newton')
+        self.assertTrue(np.allclose(X.cdf(values),u,atol=1e-9))
+        self.assertTrue((np.diff(values)>0).all())
+        # The uniform pdf is exact, so its cdf is found symbolically
+        self.assertEqual(UniformRV(0,2).func[0],Rational(1,2))
+        self.assertEqual(CDF(UniformRV(0,2),Rational(1,2)),Rational(1,4))
+
+
+if __name__=='__main__':
+    unittest.main()
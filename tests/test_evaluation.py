@@ -0,0 +1,76 @@
+"""
+Tests of the evaluation of functional forms at single values and at
+    lists of values
+"""
+
+import unittest
+import numpy as np
+from applpy import *
+
+
+class TestDiscreteEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        self.X=RV([Rational(1,4),Rational(1,2),Rational(1,4)],[1,2,3],
+                  ['discrete','pdf'])
+
+    def test_exact_values(self):
+        X=self.X
+        self.assertEqual(PDF(X,Rational(3,2)),0)
+        self.assertEqual(CDF(X,Rational(3,2)),Rational(1,4))
+        # The sf of a discrete random variable is P(X>=x)
+        self.assertEqual(SF(X,Rational(3,2)),Rational(3,4))
+        self.assertEqual(SF(X,2),Rational(3,4))
+        self.assertEqual(IDF(X,Rational(1,2)),2)
+        self.assertEqual(IDF(X,Rational(1,4)),1)
+        self.assertEqual(IDF(X,Rational(9,10)),3)
+
+    def test_scalar_matches_batch(self):
+        X=self.X
+        values=[1,1.25,1.5,2,2.5,2.75,3]
+        for proc in [PDF,CDF,SF,HF,CHF]:
+            batch=proc(X,values)
+            for i in range(len(values)):
+                self.assertAlmostEqual(float(proc(X,values[i])),batch[i])
+        percentiles=[0,0.1,0.25,0.5,0.75,0.9,1]
+        batch=IDF(X,percentiles)
+        for i in range(len(percentiles)):
+            self.assertAlmostEqual(float(IDF(X,percentiles[i])),batch[i])
+
+    def test_continuous_scalar_matches_batch(self):
+        X=ExponentialRV(2)
+        values=[0,0.1,0.5,1,3]
+        for proc in [PDF,CDF,SF]:
+            batch=proc(X,values)
+            for i in range(len(values)):
+                self.assertAlmostEqual(float(proc(X,values[i])),batch[i])
+
+
+class TestFunctionalDiscreteEvaluation(unittest.TestCase):
+
+    def test_infinite_support(self):
+        X=PoissonRV(3)
+        values=np.array([0,1,2,3.])
+        pdf=X.pdf(values)
+        cdf=X.cdf(values)
+        # The cdf is the running sum of the pdf, and the sf is P(X>=x)
+        self.assertTrue(np.allclose(cdf,np.cumsum(pdf)))
+        self.assertTrue(np.allclose(X.sf(values),1-cdf+pdf))
+        self.assertTrue(np.allclose(X.cdf(np.array([2.5])),cdf[2]))
+        G=GeometricRV(Rational(1,2))
+        self.assertTrue(np.allclose(CDF(G,[1,2,3]),[0.5,0.75,0.875]))
+        self.assertTrue(np.allclose(SF(G,[1,2,3]),[1,0.5,0.25]))
+        self.assertTrue(np.allclose(IDF(G,[0.3,0.5,0.8]),[1,1,3]))
+
+    def test_finite_support(self):
+        X=BinomialRV(4,Rational(1,2))
+        cdf=CDF(X,[0,1,2,3,4])
+        self.assertTrue(np.allclose(cdf,[1/16.,5/16.,11/16.,15/16.,1]))
+
+    def test_symbolic_parameters(self):
+        p=Symbol('p')
+        self.assertRaises(RVError,CDF,GeometricRV(p),[1,2])
+
+
+if __name__=='__main__':
+    unittest.main()
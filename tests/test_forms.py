@@ -0,0 +1,45 @@
+"""
+Tests of the cache of functional forms kept by each random variable
+"""
+
+import unittest
+import pickle
+from applpy import *
+
+
+class TestFormCache(unittest.TestCase):
+
+    def test_reuse(self):
+        X=ExponentialRV(2)
+        C=CDF(X)
+        self.assertTrue(CDF(X) is C)
+        # Every form of the random variable shares one cache, so each
+        #   form is derived once, whichever form it is derived from
+        self.assertTrue(PDF(C) is X)
+        self.assertTrue(SF(C) is SF(X))
+        self.assertTrue(C.cache is X.cache)
+        self.assertEqual(sorted(X.cache.keys()),['cdf','pdf','sf'])
+
+    def test_values_use_cached_form(self):
+        ClearCache()
+        X=WeibullRV(1,2)
+        CDF(X)
+        misses=CacheInfo()['integrate']['misses']
+        for value in [Rational(1,2),1,2]:
+            self.assertEqual(simplify(CDF(X,value)-1+exp(-value**2)),0)
+        self.assertEqual(CacheInfo()['integrate']['misses'],misses)
+
+    def test_not_part_of_value(self):
+        X=ExponentialRV(2)
+        Y=ExponentialRV(2)
+        CDF(X)
+        # The cache does not change equality or hashing, and is not
+        #   copied by pickle
+        self.assertEqual(X,Y)
+        self.assertEqual(hash(X),hash(Y))
+        self.assertEqual(pickle.loads(pickle.dumps(X,2)).cache,None)
+        self.assertEqual(Y.cache,None)
+
+
+if __name__=='__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Tests of the LRU cache of integrate, solve and simplify
+"""
+
+import unittest
+from applpy import *
+import applpy.memo as memo_module
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_eviction(self):
+        cache=memo_module.LRUCache(2)
+        cache.store('a',1)
+        cache.store('b',2)
+        # Looking up 'a' makes 'b' the least recently used entry
+        self.assertEqual(cache.lookup('test','a'),(True,1))
+        cache.store('c',3)
+        self.assertEqual(cache.lookup('test','b'),(False,None))
+        self.assertEqual(cache.lookup('test','c'),(True,3))
+        self.assertEqual(cache.hits['test'],2)
+        self.assertEqual(cache.misses['test'],1)
+        cache.resize(1)
+        self.assertEqual(list(cache.data.keys()),['c'])
+
+    def test_cache_info(self):
+        ClearCache()
+        t=Symbol('t')
+        expr=exp(-t)*t**3
+        memo_module.integrate(expr,(t,0,oo))
+        memo_module.integrate(expr,(t,0,oo))
+        info=CacheInfo()
+        self.assertEqual(info['integrate'],{'hits':1,'misses':1})
+        SetCacheSize(0)
+        try:
+            memo_module.integrate(expr,(t,0,oo))
+            self.assertEqual(CacheInfo()['size'],0)
+        finally:
+            SetCacheSize(1024)
+        self.assertRaises(ValueError,SetCacheSize,-1)
+
+    def test_solve_copies(self):
+        ClearCache()
+        t=Symbol('t')
+        first=memo_module.solve(t**2-4,t)
+        first.append(0)
+        # Changing a returned list does not change the cached result
+        self.assertEqual(sorted(memo_module.solve(t**2-4,t)),[-2,2])
+        self.assertEqual(CacheInfo()['solve'],{'hits':1,'misses':1})
+        # Structurally different arguments are separate entries
+        s=Symbol('s',positive=True)
+        self.assertEqual(memo_module.solve(s**2-4,s),[2])
+        self.assertEqual(CacheInfo()['solve']['misses'],2)
+
+
+if __name__=='__main__':
+    unittest.main()
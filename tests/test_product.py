@@ -0,0 +1,44 @@
+"""
+Tests of the discrete Product procedure against direct enumeration of
+    every pair of support points
+"""
+
+import unittest
+from applpy import *
+from test_convolution import enumerate_pairs,as_pairs
+
+
+class TestHeapProduct(unittest.TestCase):
+
+    def test_mixed_signs(self):
+        X=RV([Rational(1,4),Rational(1,4),Rational(1,2)],[-2,0,3],
+             ['discrete','pdf'])
+        Y=RV([Rational(1,3),Rational(1,3),Rational(1,3)],
+             [-1,Rational(1,2),2],['discrete','pdf'])
+        Z=Product(X,Y)
+        self.assertEqual(as_pairs(Z),enumerate_pairs(X,Y,lambda a,b: a*b))
+
+    def test_rational_supports(self):
+        X=RV([Rational(1,2),Rational(1,2)],[Rational(1,10),Rational(3,10)],
+             ['discrete','pdf'])
+        Y=RV([Rational(1,2),Rational(1,2)],[Rational(1,9),Rational(1,3)],
+             ['discrete','pdf'])
+        Z=Product(X,Y)
+        self.assertEqual(as_pairs(Z),enumerate_pairs(X,Y,lambda a,b: a*b))
+
+    def test_near_equal_supports(self):
+        # The products of these values round to equal floats in
+        #   several ways, but are distinct
+        a=Rational(1,3)
+        b=a+Rational(1,10**20)
+        X=RV([Rational(1,2),Rational(1,2)],[a,b],['discrete','pdf'])
+        Y=RV([Rational(1,4),Rational(1,2),Rational(1,4)],[1,2,2*b/a],
+             ['discrete','pdf'])
+        for Z in [Product(X,Y),Product(Y,X)]:
+            self.assertEqual(as_pairs(Z),
+                             enumerate_pairs(X,Y,lambda a,b: a*b))
+        self.assertEqual(len(Product(X,Y).support),5)
+
+
+if __name__=='__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Tests of the hashing, immutability and slots of the random variable
+    class
+"""
+
+import unittest
+import copy
+import pickle
+import numpy as np
+from applpy import *
+
+
+class TestCanonicalHash(unittest.TestCase):
+
+    def test_hash_is_stored(self):
+        X=RV([Rational(1,4),Rational(3,4)],[1,2],['discrete','pdf'])
+        value=hash(X)
+        self.assertEqual(X.hashvalue,value)
+        self.assertEqual(hash(X),value)
+        self.assertRaises(RVError,setattr,X,'hashvalue',0)
+
+    def test_equality(self):
+        X=RV([Rational(1,4),Rational(3,4)],[1,2],['discrete','pdf'])
+        Y=RV([Rational(1,4),Rational(3,4)],[1,2],['discrete','pdf'])
+        Z=RV([0.25,0.75],[1,2],['discrete','pdf'])
+        self.assertEqual(X,Y)
+        self.assertEqual(hash(X),hash(Y))
+        # Equality is structural, so floats differ from rationals
+        self.assertNotEqual(X,Z)
+
+    def test_copies(self):
+        X=ExponentialRV(2)
+        hash(X)
+        for Y in [pickle.loads(pickle.dumps(X)),copy.copy(X)]:
+            self.assertEqual(Y,X)
+            self.assertEqual(hash(Y),hash(X))
+        self.assertFalse('hashvalue' in X.__getstate__())
+
+
+class TestSlots(unittest.TestCase):
+
+    def test_immutable(self):
+        X=ExponentialRV(2)
+        self.assertRaises(RVError,setattr,X,'func',[x])
+        self.assertRaises(RVError,delattr,X,'support')
+
+    def test_named_distributions(self):
+        for X in [NormalRV(1,2),MuthRV(Rational(1,2)),BenfordRV()]:
+            # The parameters are kept in a slot, and no other attribute
+            #   can be added
+            self.assertFalse(hasattr(X,'__dict__'))
+            self.assertRaises(RVError,setattr,X,'parameter',(0,1))
+            self.assertRaises(AttributeError,setattr,X,'other',1)
+            for Y in [pickle.loads(pickle.dumps(X)),
+                      pickle.loads(pickle.dumps(X,2)),copy.copy(X)]:
+                self.assertEqual(type(Y),type(X))
+                self.assertEqual(Y,X)
+                self.assertEqual(Y.parameter,X.parameter)
+        self.assertEqual(MuthRV(Rational(1,2)).parameter,(Rational(1,2),))
+
+    def test_muth_sampler(self):
+        X=MuthRV(Rational(1,2))
+        u=np.array([0.01,0.5,0.99])
+        self.assertTrue(np.allclose(X.cdf(X.native_idf(u)),u))
+
+
+class TestExtremes(unittest.TestCase):
+
+    def test_continuous(self):
+        X=ExponentialRV(1)
+        Y=MaximumIID(X,3)
+        self.assertEqual(list(Y.ftype),['continuous','pdf'])
+        self.assertEqual(simplify(Y.func[0]-3*(1-exp(-x))**2*exp(-x)),0)
+        Y=MinimumIID(X,3)
+        self.assertEqual(list(Y.ftype),['continuous','pdf'])
+        self.assertEqual(simplify(Y.func[0]-3*exp(-3*x)),0)
+
+    def test_discrete(self):
+        X=RV([Rational(1,3)]*3,[1,2,3],['discrete','pdf'])
+        Y=MaximumIID(X,2)
+        self.assertEqual(list(Y.ftype),['discrete','pdf'])
+        self.assertEqual(list(Y.func),[Rational(1,9),Rational(1,3),
+                                       Rational(5,9)])
+        Y=MinimumIID(X,2)
+        self.assertEqual(list(Y.ftype),['discrete','pdf'])
+        self.assertEqual(list(Y.func),[Rational(5,9),Rational(1,3),
+                                       Rational(1,9)])
+
+
+if __name__=='__main__':
+    unittest.main()
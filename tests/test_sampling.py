@@ -0,0 +1,206 @@
+"""
+Tests of the simulation procedures of the RV class
+"""
+
+import unittest
+import numpy as np
+from applpy import *
+from applpy.sampling import UniformSource,make_rng
+
+
+def named_distributions():
+    """
+    Returns an instance of every named distribution
+    """
+    return [BetaRV(2,3),CauchyRV(0,1),ChiRV(3),ChiSquareRV(4),
+            ErlangRV(2,3),ExponentialRV(2),ExponentialPowerRV(1,2),
+            ExtremeValueRV(2,1),GammaRV(2,Rational(5,2)),GompertzRV(1,2),
+            InverseGaussianRV(1,1),InverseGammaRV(3,2),LogGammaRV(2,3),
+            LogisticRV(2,1),LogLogisticRV(1,2),LogNormalRV(0,1),
+            LomaxRV(2,1),MuthRV(Rational(1,2)),NormalRV(1,2),ParetoRV(1,3),
+            Rayleigh(1),TriangularRV(0,1,3),TRV(5),UniformRV(0,2),
+            WeibullRV(1,2),BenfordRV(),BinomialRV(5,Rational(1,3)),
+            GeometricRV(Rational(1,3)),PoissonRV(2)]
+
+
+class TestSeeds(unittest.TestCase):
+
+    def setUp(self):
+        self.rvs=[RV([x/2],[0,2]),
+                  RV([Rational(1,4),Rational(3,4)],[1,5],['discrete','pdf']),
+                  NormalRV(1,2)]
+
+    def test_sample(self):
+        for X in self.rvs:
+            first=X.sample(1000,seed=4)
+            self.assertTrue((X.sample(1000,seed=4)==first).all())
+            self.assertFalse((X.sample(1000,seed=5)==first).all())
+            # A stream continues the same sequence from chunk to chunk
+            chunks=list(X.stream(300,1000,seed=4))
+            self.assertEqual([len(chunk) for chunk in chunks],
+                             [300,300,300,100])
+            self.assertTrue((np.concatenate(chunks)==first).all())
+            self.assertEqual(X.variate(3,seed=4),X.variate(3,seed=4))
+
+    def test_spawned_streams(self):
+        X=self.rvs[0]
+        first=SpawnStreams(3,seed=2)
+        second=SpawnStreams(3,seed=2)
+        values=[X.sample(5,seed=first[i]) for i in range(3)]
+        for i in range(3):
+            self.assertTrue((X.sample(5,seed=second[i])==values[i]).all())
+        self.assertFalse((values[0]==values[1]).all())
+
+    def test_parallel(self):
+        # The variates depend only on the seed, and not on the number
+        #   of processes
+        for X in self.rvs:
+            one=X.sample_parallel(5000,processes=1,seed=9)
+            two=X.sample_parallel(5000,processes=2,seed=9)
+            self.assertTrue((one==two).all())
+
+
+class TestUniformSources(unittest.TestCase):
+
+    def strata(self,points):
+        """
+        Returns the stratum of each of n points, out of n equal strata
+        """
+        return sorted(np.floor(points*len(points)).astype(int))
+
+    def test_sobol(self):
+        points=UniformPoints(16,2)
+        # The first 16 points put one point in each box of width 1/4
+        #   and height 1/4, and in each of the 16 strata of each axis
+        boxes=set(zip(*np.floor(points*4).astype(int).T))
+        self.assertEqual(len(boxes),16)
+        for d in range(2):
+            self.assertEqual(self.strata(points[:,d]),range(16))
+        self.assertTrue(((points>0)&(points<1)).all())
+
+    def test_halton(self):
+        points=UniformPoints(4,2,'halton')
+        self.assertTrue(np.allclose(points[:,0],[1/2.,1/4.,3/4.,1/8.]))
+        self.assertTrue(np.allclose(points[:,1],[1/3.,2/3.,1/9.,4/9.]))
+
+    def test_lhs(self):
+        points=UniformPoints(50,3,'lhs',seed=2)
+        for d in range(3):
+            self.assertEqual(self.strata(points[:,d]),range(50))
+        self.assertTrue((UniformPoints(50,3,'lhs',seed=2)==points).all())
+
+    def test_continuation(self):
+        # Successive draws continue the same sequence
+        for kind in ['sobol','halton']:
+            source=UniformSource(kind,make_rng(1))
+            points=np.concatenate([source.draw(5),source.draw(3)])
+            self.assertTrue((points==UniformPoints(8,1,kind)).all())
+
+    def test_scramble(self):
+        for kind in ['sobol','halton']:
+            plain=UniformPoints(64,2,kind)
+            points=UniformPoints(64,2,kind,True,seed=3)
+            self.assertTrue((UniformPoints(64,2,kind,True,seed=3)==
+                             points).all())
+            self.assertFalse((UniformPoints(64,2,kind,True,seed=4)==
+                              points).any())
+            self.assertFalse((points==plain).any())
+            self.assertTrue(((points>0)&(points<1)).all())
+        # Scrambling keeps the stratification of the Sobol points
+        points=UniformPoints(16,2,'sobol',True,seed=3)
+        self.assertEqual(len(set(zip(*np.floor(points*4).astype(int).T))),
+                         16)
+        for d in range(2):
+            self.assertEqual(self.strata(points[:,d]),range(16))
+
+    def test_supplied(self):
+        X=ExponentialRV(1)
+        u=np.array([0.1,0.5,0.9])
+        self.assertTrue(np.allclose(X.sample(3,uniforms=u),-np.log1p(-u)))
+        self.assertRaises(ValueError,X.sample,4,uniforms=u)
+        self.assertRaises(ValueError,X.sample,2,uniforms=[0,0.5])
+        self.assertRaises(ValueError,X.sample,2,uniforms='random')
+
+    def test_named_distributions(self):
+        # Every named distribution inverts its cdf for these uniforms,
+        #   and agrees with a sample from its usual generator
+        for X in named_distributions():
+            reference=X.sample(20000,seed=2)
+            median=np.median(reference)
+            spread=np.subtract(*np.percentile(reference,[75,25]))
+            for kind in ['sobol','halton','lhs']:
+                values=X.sample(1024,seed=1,uniforms=kind)
+                self.assertTrue(np.isfinite(values).all())
+                self.assertTrue((values>=float(X.support[0])).all())
+                self.assertTrue((values<=float(X.support[-1])).all())
+                self.assertTrue(abs(np.median(values)-median)<0.1*spread,
+                                (X.__class__.__name__,kind))
+
+
+class TestNativeInversion(unittest.TestCase):
+
+    def test_inverse(self):
+        u=np.array([1e-10,0.01,0.1,0.5,0.9,0.99,1-1e-10])
+        for X in named_distributions():
+            if getattr(X,'native_cdf',None)==None:
+                continue
+            values=X.native_idf(u)
+            self.assertTrue((np.diff(values)>0).all())
+            # Newton's method stops after a step below 1e-9*(1+|x|)
+            self.assertTrue(np.allclose(X.native_cdf(values),u,rtol=0,
+                                        atol=1e-8))
+        # The normal idfs are found directly
+        X=NormalRV(1,2)
+        self.assertTrue(np.allclose(X.native_idf([0.5,0.975]),
+                                    [1,1+2*1.959963984540054]))
+        self.assertTrue(np.allclose(LogNormalRV(0,1).native_idf(u),
+                                    np.exp(NormalRV(0,1).native_idf(u))))
+
+
+class TestPairedComparison(unittest.TestCase):
+
+    def test_named_distributions(self):
+        # Both distributions have mean 2
+        result=PairedComparison([GammaRV(1,2),NormalRV(2,1)],1000,seed=1)
+        mean,stderr=result[(0,1)]
+        self.assertTrue(stderr>0)
+        self.assertTrue(abs(mean)<4*stderr)
+        # Distributions without a closed form idf invert their NumPy
+        #   cdfs, and every one of these has mean 1
+        rvs=[LogNormalRV(-Rational(1,2),1),InverseGaussianRV(2,1),
+             InverseGammaRV(3,Rational(1,2)),ChiSquareRV(1),NormalRV(1,1)]
+        result=PairedComparison(rvs,2000,seed=1,uniforms='sobol')
+        for i in range(len(rvs)):
+            for j in range(i+1,len(rvs)):
+                mean,stderr=result[(i,j)]
+                self.assertTrue(abs(mean)<4*stderr,(i,j,mean,stderr))
+        mean,stderr=PairedComparison([TRV(5),NormalRV(0,1)],2000,
+                                     seed=1)[(0,1)]
+        self.assertTrue(abs(mean)<4*stderr)
+        result=PairedComparison([LogNormalRV(0,1),NormalRV(1,1)],100,seed=1)
+        self.assertEqual(len(result),1)
+
+    def test_common_random_numbers(self):
+        # Common uniforms make the difference of two shifted
+        #   distributions constant (up to the tolerance of the
+        #   inversion, which is on the cdf, in the tails)
+        result=PairedComparison([NormalRV(2,1),NormalRV(0,1)],500,seed=3)
+        self.assertAlmostEqual(result[(0,1)][0],2,places=3)
+        self.assertAlmostEqual(result[(0,1)][1],0,places=3)
+        X=RV([Rational(1,4),Rational(3,4)],[2,4],['discrete','pdf'])
+        Y=RV([Rational(1,4),Rational(3,4)],[0,2],['discrete','pdf'])
+        result=PairedComparison([X,Y,PoissonRV(3)],500,seed=3)
+        self.assertEqual(result[(0,1)],(2.0,0.0))
+
+    def test_antithetic(self):
+        result=PairedComparison([ExponentialRV(1),ExponentialRV(2)],1000,
+                                seed=5,antithetic=True)
+        mean,stderr=result[(0,1)]
+        self.assertTrue(abs(mean-0.5)<4*stderr)
+        self.assertRaises(RVError,PairedComparison,
+                          [ExponentialRV(1),ExponentialRV(2)],999,5,
+                          'pseudo',False,True)
+
+
+if __name__=='__main__':
+    unittest.main()
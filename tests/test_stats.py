@@ -0,0 +1,118 @@
+"""
+Tests of the bootstrap procedures against direct computation
+"""
+
+import unittest
+import math
+import numpy as np
+from applpy import *
+from applpy.stats import BootstrapReplicates,BootstrapCI
+from applpy.stats import jackknife,normal_idf,normal_cdf
+
+
+def leave_one_out(data,stat):
+    """
+    Returns the jackknife values of a statistic, computed directly
+    """
+    return np.array([stat(np.delete(data,i)) for i in range(len(data))])
+
+
+def skewness(values):
+    """
+    Returns the skewness of a sample
+    """
+    dev=values-np.mean(values)
+    return np.mean(dev**3)/np.mean(dev**2)**1.5
+
+
+class TestBootstrap(unittest.TestCase):
+
+    def setUp(self):
+        self.data=np.random.RandomState(7).exponential(size=200)
+
+    def test_replicates(self):
+        # Each moment statistic is that of the resample
+        data=np.array([1.,2.,4.,8.])
+        values=BootstrapReplicates(data,'variance',5,seed=3)
+        self.assertEqual(len(values),5)
+        for value in values:
+            self.assertTrue(0<=value<=np.var([1.,8.])+1e-12)
+        means=BootstrapReplicates(data,Mean,1000,seed=3)
+        self.assertTrue(set(np.round(means*4)).issubset(range(4,33)))
+
+    def test_seed(self):
+        first=BootstrapReplicates(self.data,'mean',500,seed=11)
+        second=BootstrapReplicates(self.data,'mean',500,seed=11)
+        self.assertTrue((first==second).all())
+        third=BootstrapReplicates(self.data,'mean',500,seed=12)
+        self.assertFalse((first==third).all())
+        # The replicates depend only on the seed, and not on the
+        #   number of processes
+        import applpy.stats as stats_module
+        block=stats_module.bootstrap_block
+        stats_module.bootstrap_block=2000
+        try:
+            one=BootstrapReplicates(self.data,'mean',500,seed=11)
+            two=BootstrapReplicates(self.data,'mean',500,seed=11,
+                                    processes=2)
+        finally:
+            stats_module.bootstrap_block=block
+        self.assertTrue((one==two).all())
+
+    def test_jackknife(self):
+        data=self.data
+        self.assertTrue(np.allclose(jackknife(data,'mean'),
+                                    leave_one_out(data,np.mean)))
+        self.assertTrue(np.allclose(jackknife(data,'variance'),
+                                    leave_one_out(data,np.var)))
+        self.assertTrue(np.allclose(jackknife(data,'skewness'),
+                                    leave_one_out(data,skewness)))
+        self.assertTrue(np.allclose(jackknife(data,np.median),
+                                    leave_one_out(data,np.median)))
+
+    def test_normal(self):
+        for u in [1e-12,0.001,0.02,0.025,0.3,0.5,0.8,0.975,0.999]:
+            exact=float((sqrt(2)*erfinv(2*Rational(u)-1)).evalf(30))
+            self.assertAlmostEqual(normal_idf(u),exact,places=12)
+            self.assertAlmostEqual(normal_cdf(normal_idf(u)),u,places=14)
+        self.assertEqual(normal_idf(0),-np.inf)
+        self.assertEqual(normal_idf(1),np.inf)
+
+    def test_bca(self):
+        data=self.data
+        result=BootstrapCI(data,'skewness',2000,0.9,'bca',seed=5)
+        replicates=result['replicates']
+        estimate=skewness(data)
+        self.assertAlmostEqual(result['estimate'],estimate,places=12)
+        # Compute the interval directly from the replicates and the
+        #   leave-one-out values
+        z0=normal_idf(np.mean(replicates<estimate)+
+                      np.mean(replicates==estimate)/2)
+        jack=leave_one_out(data,skewness)
+        diff=np.mean(jack)-jack
+        accel=np.sum(diff**3)/(6*np.sum(diff**2)**1.5)
+        probs=[]
+        for alpha in [0.05,0.95]:
+            z=z0+normal_idf(alpha)
+            probs.append(normal_cdf(z0+z/(1-accel*z)))
+        interval=np.percentile(replicates,[100*probs[0],100*probs[1]])
+        self.assertAlmostEqual(result['interval'][0],interval[0],places=12)
+        self.assertAlmostEqual(result['interval'][1],interval[1],places=12)
+        # The skewness of exponential data is biased low, so the BCa
+        #   interval lies above the percentile interval
+        plain=BootstrapCI(data,'skewness',2000,0.9,seed=5)
+        self.assertTrue(accel>0)
+        self.assertTrue(result['interval'][1]>plain['interval'][1])
+        self.assertTrue(result['interval'][0]<estimate<
+                        result['interval'][1])
+
+    def test_errors(self):
+        self.assertRaises(RVError,BootstrapReplicates,self.data,'mean',0)
+        self.assertRaises(RVError,BootstrapReplicates,[1.],'mean',10)
+        self.assertRaises(RVError,BootstrapReplicates,self.data,'median')
+        self.assertRaises(RVError,BootstrapCI,self.data,'mean',10,0.95,
+                          'normal')
+
+
+if __name__=='__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Tests of the persistent result store
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+from applpy import *
+import applpy.store as store_module
+
+
+class TestResultStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory=tempfile.mkdtemp()
+        OpenStore(os.path.join(self.directory,'store.db'))
+
+    def tearDown(self):
+        CloseStore()
+        shutil.rmtree(self.directory)
+
+    def count(self):
+        conn=store_module.result_store.connect()
+        return conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def test_hit_and_miss(self):
+        X=RV([Rational(1,3),Rational(2,3)],[0,1],['discrete','pdf'])
+        key=store_module.store_key('Mean',(X,))
+        self.assertEqual(store_module.result_store.lookup(key),
+                         (False,None))
+        # The first call computes and writes the result, and the second
+        #   reads it back
+        self.assertEqual(Mean(X),Rational(2,3))
+        self.assertEqual(store_module.result_store.lookup(key),
+                         (True,Rational(2,3)))
+        self.assertEqual(Mean(X),Rational(2,3))
+        self.assertEqual(self.count(),1)
+        Y=ConvolutionIID(X,3)
+        self.assertEqual(ConvolutionIID(X,3),Y)
+        self.assertEqual(list(Y.func),[Rational(1,27),Rational(2,9),
+                                       Rational(4,9),Rational(8,27)])
+        ClearStore()
+        self.assertEqual(self.count(),0)
+
+    def test_result_version(self):
+        X=RV([Rational(1,3),Rational(2,3)],[0,1],['discrete','pdf'])
+        Mean(X)
+        key=store_module.store_key('Mean',(X,))
+        version=store_module.result_version
+        store_module.result_version=version+1
+        try:
+            # Results written under an earlier version are not read
+            self.assertNotEqual(store_module.store_key('Mean',(X,)),key)
+            self.assertEqual(store_module.store_lookup('Mean',[X]),None)
+        finally:
+            store_module.result_version=version
+        self.assertEqual(store_module.store_lookup('Mean',[X]),
+                         Rational(2,3))
+
+
+if __name__=='__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Tests of the tabulated quantile and alias samplers
+"""
+
+import unittest
+import numpy as np
+from applpy import *
+
+
+class TestQuantileTable(unittest.TestCase):
+
+    def setUp(self):
+        self.u=np.sort(np.random.RandomState(0).uniform(size=100000))
+
+    def test_error_bound(self):
+        for X in [ExponentialRV(1),NormalRV(0,1),RV([x/2],[0,2])]:
+            for tol in [1e-6,1e-10]:
+                table=X.quantile_table(tol)
+                u=self.u[table.covers(self.u)]
+                values=table(u)
+                # The table holds |cdf(idf(u))-u|<=tol between its
+                #   nodes, and its idf is monotone
+                self.assertTrue(np.abs(X.cdf(values)-u).max()<=tol)
+                self.assertTrue((np.diff(values)>=0).all())
+            # Only the tails beyond the table hold less than tol
+            self.assertTrue(table.u[0]<=tol and table.u[-1]>=1-tol)
+        self.assertTrue(len(X.quantile_table(1e-6).u)<len(table.u))
+
+    def test_flat_cdf(self):
+        # The idf jumps over the interval where the pdf vanishes
+        X=RV([Rational(1,2),S.Zero,Rational(1,2)],[0,1,2,3])
+        table=X.quantile_table()
+        values=table(self.u)
+        self.assertTrue((np.diff(values)>=0).all())
+        self.assertFalse(((values>1+1e-9)&(values<2-1e-9)).any())
+        self.assertTrue(np.abs(X.cdf(values)-self.u).max()<=1e-10)
+
+    def test_sampling(self):
+        X=ExponentialRV(1)
+        values=X.sample(1000,method='table',seed=6)
+        exact=X.sample(1000,method='newton',seed=6)
+        self.assertTrue(np.abs(X.cdf(values)-X.cdf(exact)).max()<=1e-10)
+
+
+class TestAliasTable(unittest.TestCase):
+
+    def setUp(self):
+        self.rvs=[RV([Rational(k,21) for k in range(1,7)],[-2,0,1,3,4,9],
+                     ['discrete','pdf']),BinomialRV(5,Rational(1,3))]
+
+    def test_table(self):
+        # Each column gives its probability to its point and the rest
+        #   to its alias, which together make up the pmf
+        for X in self.rvs:
+            table=X.alias_table()
+            n=len(table.prob)
+            probs=(np.bincount(np.arange(n),weights=table.prob,minlength=n)+
+                   np.bincount(table.alias,weights=1-table.prob,
+                               minlength=n))/n
+            pmf=X.pdf(table.points)
+            self.assertTrue(np.allclose(probs,pmf,rtol=0,atol=1e-15))
+
+    def test_frequencies(self):
+        # Pearson's chi-square statistic, with 5 degrees of freedom,
+        #   is below its 0.999 quantile of 20.515
+        n=60000
+        for X in self.rvs:
+            values=X.sample(n,method='alias',seed=8)
+            points=X.alias_table().points
+            counts=np.array([(values==v).sum() for v in points])
+            self.assertEqual(counts.sum(),n)
+            expected=n*X.pdf(points)
+            self.assertEqual(len(points),6)
+            self.assertTrue(((counts-expected)**2/expected).sum()<20.515)
+
+
+if __name__=='__main__':
+    unittest.main()